@@ -0,0 +1 @@
+"""Benchmark scripts for the Weather API Wrapper."""
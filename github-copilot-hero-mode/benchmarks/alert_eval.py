@@ -0,0 +1,95 @@
+"""Benchmark alert rule evaluation across many cached locations.
+
+Fills a ``WeatherMirror`` with synthetic current weather for N locations
+(through a real CacheManager listener), then times ``AlertEngine.evaluate``
+for a steady state (no changes) and after a small fraction of locations
+changed, against a plain Python loop over the cache dicts.
+
+Usage:
+    python -m benchmarks.alert_eval [--locations 100000] [--rounds 20]
+"""
+
+import argparse
+import random
+import time
+
+from src.alerts import AlertEngine, WeatherMirror
+from src.cache_manager import CacheManager
+
+RULES = {
+    "heat": "temperature > 40",
+    "storm": "windspeed > 60 and weathercode in storm_codes",
+    "freeze": "temperature < -20 or (temperature < 0 and windspeed > 50)",
+}
+
+
+def weather(rng: random.Random) -> dict:
+    return {"current_weather": {
+        "time": "2025-11-08T12:00", "interval": 900,
+        "temperature": round(rng.uniform(-30, 45), 1), "windspeed": round(rng.uniform(0, 90), 1),
+        "winddirection": rng.randrange(360), "weathercode": rng.choice((0, 1, 2, 3, 61, 95, 99)),
+        "is_day": rng.randrange(2)}}
+
+
+def best_of(rounds: int, function) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def python_loop(cache: CacheManager) -> int:
+    """Baseline: evaluate the same rules by looping over cache entries."""
+    hits = 0
+    for entry in cache.cache.values():
+        current = entry['data']['current_weather']
+        temperature, windspeed = current['temperature'], current['windspeed']
+        hits += temperature > 40
+        hits += windspeed > 60 and current['weathercode'] in (95, 96, 99)
+        hits += temperature < -20 or (temperature < 0 and windspeed > 50)
+    return hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locations", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--pure", action="store_true", help="Disable NumPy columns")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    cache = CacheManager(ttl=3600)
+    mirror = WeatherMirror(use_numpy=False if args.pure else None).attach(cache)
+    started = time.perf_counter()
+    for index in range(args.locations):
+        cache.set(f"city-{index}", weather(rng))
+    print(f"Loaded {len(mirror):,} locations in {time.perf_counter() - started:.2f}s "
+          f"({'array' if args.pure else 'NumPy'} columns)")
+
+    engine = AlertEngine(mirror, RULES)
+    engine.evaluate()
+    print("Active: " + ", ".join(f"{name}={len(engine.active(name)):,}" for name in RULES))
+
+    steady = best_of(args.rounds, engine.evaluate)
+
+    def churn():
+        for index in rng.sample(range(args.locations), max(1, args.locations // 100)):
+            cache.set(f"city-{index}", weather(rng))
+
+    def changed():
+        churn()
+        return engine.evaluate()
+
+    churn_only = best_of(args.rounds, churn)
+    with_changes = best_of(args.rounds, changed) - churn_only
+    baseline = best_of(max(1, args.rounds // 4), lambda: python_loop(cache))
+
+    print(f"evaluate (no changes):   {steady * 1000:8.2f} ms")
+    print(f"evaluate (1% changed):   {with_changes * 1000:8.2f} ms")
+    print(f"Python loop over cache:  {baseline * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Memory benchmark for compact weather cache entries.
+
+Fills a ``CacheManager`` with realistic Open-Meteo responses for many
+cities, once as plain dicts and once as ``CompactWeather`` records, and
+reports the memory held by each cache as measured by tracemalloc.
+
+Usage:
+    python -m benchmarks.compact_memory [--cities 100000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from src.cache_manager import CacheManager
+from src.compact_weather import CompactWeather
+
+
+def make_response(rng: random.Random) -> dict:
+    """Build a fresh response dict the way ``response.json()`` would."""
+    payload = {
+        "latitude": round(rng.uniform(-90, 90), 4),
+        "longitude": round(rng.uniform(-180, 180), 4),
+        "generationtime_ms": rng.random(),
+        "utc_offset_seconds": 0,
+        "timezone": "GMT",
+        "timezone_abbreviation": "GMT",
+        "elevation": float(rng.randint(0, 3000)),
+        "current_weather_units": {
+            "time": "iso8601", "interval": "seconds", "temperature": "°C",
+            "windspeed": "km/h", "winddirection": "°", "is_day": "", "weathercode": "wmo code"
+        },
+        "current_weather": {
+            "time": "2025-11-08T12:00",
+            "interval": 900,
+            "temperature": round(rng.uniform(-30, 45), 1),
+            "windspeed": round(rng.uniform(0, 80), 1),
+            "winddirection": rng.randint(0, 359),
+            "is_day": 1,
+            "weathercode": rng.choice([0, 1, 2, 3, 45, 61, 95])
+        }
+    }
+    # Round-trip through JSON so keys and strings are distinct objects, as
+    # they are for real responses
+    return json.loads(json.dumps(payload))
+
+
+def measure(cities: int, compact: bool) -> int:
+    """Return bytes allocated by a cache holding ``cities`` entries."""
+    rng = random.Random(7)
+    gc.collect()
+    tracemalloc.start()
+    cache = CacheManager(ttl=600)
+    for index in range(cities):
+        data = make_response(rng)
+        if compact:
+            data = CompactWeather.from_response(data)
+        cache.set(f"city-{index}", data)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=100_000)
+    args = parser.parse_args()
+
+    full = measure(args.cities, compact=False)
+    packed = measure(args.cities, compact=True)
+
+    print(f"Cached cities: {args.cities}")
+    print(f"dict entries:    {full / 2**20:8.1f} MiB ({full / args.cities:6.0f} B/entry)")
+    print(f"compact entries: {packed / 2**20:8.1f} MiB ({packed / args.cities:6.0f} B/entry)")
+    print(f"Reduction: {(1 - packed / full) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Overhead benchmark for WeatherService metrics.
+
+Measures the cache-hit path of ``get_weather`` with and without
+``WeatherMetrics`` attached and reports the added cost per call, which
+should stay under one microsecond.
+
+Usage:
+    python -m benchmarks.metrics_overhead [--calls 200000]
+"""
+
+import argparse
+import timeit
+
+from src.metrics import WeatherMetrics
+from src.weather_service import WeatherService
+
+PAYLOAD = {"current_weather": {"time": "2025-11-08T12:00", "temperature": 20.5}}
+
+
+def hit_timer(metrics) -> timeit.Timer:
+    """Build a timer for the cache-hit path of a primed service."""
+    service = WeatherService(metrics=metrics)
+    service.api.fetch_weather = lambda city: PAYLOAD
+    service.get_weather("Berlin")
+    return timeit.Timer(lambda: service.get_weather("Berlin"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    timers = {"baseline": hit_timer(None), "instrumented": hit_timer(WeatherMetrics())}
+    best = dict.fromkeys(timers, float("inf"))
+    # Interleave runs so machine noise affects both variants alike
+    for _ in range(args.repeat):
+        for name, timer in timers.items():
+            best[name] = min(best[name], timer.timeit(args.calls) / args.calls * 1e9)
+
+    baseline, instrumented = best["baseline"], best["instrumented"]
+    overhead = instrumented - baseline
+
+    print(f"hit path without metrics: {baseline:8.0f} ns/call")
+    print(f"hit path with metrics:    {instrumented:8.0f} ns/call")
+    print(f"overhead:                 {overhead:8.0f} ns/call "
+          f"({'within' if overhead < 1000 else 'OVER'} 1 us budget)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Byte and latency benchmark for field projection.
+
+Starts a local stub of the Open-Meteo forecast endpoint that answers both
+``current_weather=true`` and ``current=...`` requests, then fetches through
+``APIClient`` with and without field projection and reports response bytes
+and latency. ``--kbps`` throttles the stub to model a slow uplink.
+
+Both modes are warmed up first and then measured in interleaved rounds
+(alternating which goes first), so connection setup, caches and drift do
+not favour whichever mode runs second. On an unthrottled loopback the
+response is a few hundred bytes either way and latency is dominated by
+per-request overhead, so the two modes are within noise; projection
+only lowers latency once bandwidth matters (e.g. ``--kbps 256``).
+
+Usage:
+    python -m benchmarks.projection_stub [--requests 200] [--warmup 20] [--kbps 0]
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.api_client import APIClient, CURRENT_FIELDS
+
+FULL_CURRENT = {
+    "time": "2025-11-08T12:00", "interval": 900, "temperature": 20.5, "windspeed": 12.3,
+    "winddirection": 29, "is_day": 1, "weathercode": 3
+}
+METADATA = {
+    "latitude": 52.52, "longitude": 13.419998, "generationtime_ms": 0.0679492950439453,
+    "utc_offset_seconds": 0, "timezone": "GMT", "timezone_abbreviation": "GMT", "elevation": 38.0
+}
+UNITS = {"time": "iso8601", "interval": "seconds", "temperature_2m": "°C", "wind_speed_10m": "km/h",
+         "wind_direction_10m": "°", "is_day": "", "weather_code": "wmo code"}
+
+
+def stub_body(query: dict) -> bytes:
+    """Build the response body the real API would send for a query."""
+    body = dict(METADATA)
+    if "current" in query:
+        variables = query["current"][0].split(",")
+        names = {variable: field for field, variable in CURRENT_FIELDS.items()}
+        body["current_units"] = {key: UNITS[key] for key in ["time", "interval"] + variables}
+        body["current"] = {"time": FULL_CURRENT["time"], "interval": 900}
+        body["current"].update({variable: FULL_CURRENT[names[variable]] for variable in variables})
+    else:
+        body["current_weather_units"] = {
+            "time": "iso8601", "interval": "seconds", "temperature": "°C", "windspeed": "km/h",
+            "winddirection": "°", "is_day": "", "weathercode": "wmo code"
+        }
+        body["current_weather"] = FULL_CURRENT
+    return json.dumps(body).encode("utf-8")
+
+
+def make_handler(kbps: float, counter: dict):
+    """Create a request handler class that records bytes sent."""
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = stub_body(parse_qs(urlparse(self.path).query))
+            if kbps:
+                time.sleep(len(body) * 8 / (kbps * 1000))
+            # Count before sending so the client never returns ahead of the count
+            counter["bytes"] += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def run(client: APIClient, counter: dict, requests_count: int, warmup: int, modes: dict) -> dict:
+    """Fetch in interleaved rounds and return byte and latency figures per mode."""
+    names = list(modes)
+    for _ in range(warmup):
+        for name in names:
+            client.fetch_weather("Berlin", fields=modes[name])
+
+    latencies = {name: [] for name in names}
+    sent = {name: 0 for name in names}
+    for round_index in range(requests_count):
+        order = names if round_index % 2 == 0 else names[::-1]
+        for name in order:
+            before = counter["bytes"]
+            started = time.perf_counter()
+            client.fetch_weather("Berlin", fields=modes[name])
+            latencies[name].append((time.perf_counter() - started) * 1000)
+            sent[name] += counter["bytes"] - before
+    return {
+        name: {
+            "bytes_per_request": sent[name] / requests_count,
+            "p50_ms": statistics.median(latencies[name]),
+            "mean_ms": statistics.fmean(latencies[name]),
+        }
+        for name in names
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per mode")
+    parser.add_argument("--kbps", type=float, default=0, help="simulated bandwidth, 0 = unlimited")
+    parser.add_argument("--fields", default="temperature", help="comma-separated projected fields")
+    args = parser.parse_args()
+
+    counter = {"bytes": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.kbps, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = APIClient()
+    client.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+
+    try:
+        results = run(client, counter, args.requests, args.warmup,
+                      {"full": None, "projected": args.fields.split(",")})
+    finally:
+        server.shutdown()
+
+    print(f"{'mode':<12}{'bytes/req':>12}{'p50 ms':>10}{'mean ms':>10}")
+    for name, result in results.items():
+        print(f"{name:<12}{result['bytes_per_request']:>12.0f}{result['p50_ms']:>10.2f}{result['mean_ms']:>10.2f}")
+    full, projected = results["full"], results["projected"]
+    saved = 1 - projected["bytes_per_request"] / full["bytes_per_request"]
+    print(f"Bytes saved per request: {saved * 100:.1f}%")
+    print(f"p50 latency change: {(projected['p50_ms'] / full['p50_ms'] - 1) * 100:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Offline upstream load test against the record/replay stand-in.
+
+Serves recorded fixtures (or a synthetic Berlin response) from a local
+``ReplayServer`` with a configurable latency distribution, error rate and
+rate limit, then drives ``APIClient.fetch_weather`` from several threads
+and reports throughput, failures and latency percentiles. A fixed seed
+makes the injected latency and errors reproducible between runs.
+
+Usage:
+    python -m benchmarks.replay_load [--fixtures fixtures.json] [--latency lognormal:40:0.5]
+        [--error-rate 0.01] [--rate-limit 200] [--threads 8] [--requests 2000] [--seed 1]
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from src.api_client import APIClient
+from src.replay import FixtureStore, LatencyModel, ReplayServer, fixture_key
+
+PAYLOAD = {
+    "latitude": 52.52, "longitude": 13.41, "utc_offset_seconds": 0, "timezone": "GMT",
+    "current_weather": {"time": "2025-11-08T12:00", "interval": 900, "temperature": 20.5,
+                        "windspeed": 12.3, "winddirection": 29, "is_day": 1, "weathercode": 3}
+}
+
+
+def synthetic_store() -> FixtureStore:
+    """Build a store holding one response for the client's default request."""
+    store = FixtureStore()
+    store.put(fixture_key("/v1/forecast", urlencode(APIClient._weather_params(None))), 200,
+              {"Content-Type": "application/json"}, json.dumps(PAYLOAD).encode())
+    return store
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="Recorded fixture file (default: synthetic)")
+    parser.add_argument("--latency", default="lognormal:40:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures) if args.fixtures else synthetic_store()
+    server = ReplayServer(store, latency=LatencyModel(args.latency, args.seed),
+                          error_rate=args.error_rate, rate_limit=args.rate_limit, seed=args.seed)
+
+    with server:
+        client = APIClient()
+        client.base_url = server.url + "/v1/forecast"
+
+        def one_request(_):
+            started = time.perf_counter()
+            try:
+                client.fetch_weather("Berlin")
+                ok = True
+            except Exception:
+                ok = False
+            return ok, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(one_request, range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(seconds for ok, seconds in results if ok)
+    failures = sum(1 for ok, _ in results if not ok)
+    print(f"Requests: {len(results)} with {args.threads} threads, latency {args.latency}")
+    print(f"Throughput: {len(results) / elapsed:,.0f} req/s  failures: {failures} "
+          f"(injected errors {server.counts['errors']}, throttled {server.counts['throttled']})")
+    if latencies:
+        print("Latency ms  " + "  ".join(
+            f"p{int(fraction * 100)}: {percentile(latencies, fraction) * 1000:.1f}"
+            for fraction in (0.5, 0.9, 0.95, 0.99)))
+
+
+if __name__ == "__main__":
+    main()
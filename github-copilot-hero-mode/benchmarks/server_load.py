@@ -0,0 +1,101 @@
+"""Load test for the asyncio HTTP front-end.
+
+Starts ``WeatherHTTPServer`` in a child process pinned to one CPU core
+(where supported) with a stubbed upstream, then drives it with many
+keep-alive connections from this process and reports requests per second
+and latency percentiles.
+
+Usage:
+    python -m benchmarks.server_load [--connections 50] [--duration 5] [--cities 100]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import time
+
+PAYLOAD = {
+    "latitude": 52.52, "longitude": 13.41, "utc_offset_seconds": 0, "timezone": "GMT",
+    "current_weather": {"time": "2025-11-08T12:00", "interval": 900, "temperature": 20.5,
+                        "windspeed": 12.3, "winddirection": 29, "is_day": 1, "weathercode": 3}
+}
+
+
+def run_server(port_queue, core: int) -> None:
+    """Child process: serve a stubbed WeatherService on one core."""
+    from src.http_server import WeatherHTTPServer
+    from src.weather_service import WeatherService
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+    service = WeatherService(cache_ttl=3600)
+    service.api.fetch_weather = lambda city: PAYLOAD
+
+    async def main():
+        server = WeatherHTTPServer(service, port=0)
+        await server.start()
+        port_queue.put(server.port)
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+async def client(port: int, paths, deadline: float, latencies: list) -> None:
+    """Send requests over one keep-alive connection until the deadline."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def drive(port: int, connections: int, duration: float, cities: int) -> list:
+    paths = [f"/weather?city=city-{i}" for i in range(cities)]
+    # Warm the cache so the measurement covers the hit path
+    await client(port, paths, time.perf_counter() + 0.5, [])
+    latencies: list = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, paths[i:] + paths[:i], deadline, latencies)
+                           for i in range(connections)))
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--core", type=int, default=0, help="CPU core for the server process")
+    args = parser.parse_args()
+
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_server, args=(ports, args.core), daemon=True)
+    server.start()
+    try:
+        port = ports.get(timeout=10)
+        latencies = asyncio.run(drive(port, args.connections, args.duration, args.cities))
+    finally:
+        server.terminate()
+        server.join()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"Requests: {len(latencies)} over {args.duration:.1f}s with {args.connections} connections")
+    print(f"Throughput: {len(latencies) / args.duration:,.0f} req/s")
+    print(f"Latency p50: {p50:.2f} ms  p99: {p99:.2f} ms  mean: {statistics.fmean(latencies) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Startup benchmark based on ``python -X importtime``.
+
+Imports a module in fresh interpreters several times, and reports the
+median cumulative import time of that module (from ``-X importtime``), the
+median wall time of the whole process against a bare interpreter, and the
+slowest nested imports. It also checks whether ``requests`` was loaded.
+
+Usage:
+    python -m benchmarks.startup_time [--module src.weather_service] [--runs 15] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code: str, importtime: bool = False):
+    """Run code in a fresh interpreter; return (wall seconds, stderr)."""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return time.perf_counter() - started, result.stderr, result.stdout
+
+
+def parse_importtime(stderr: str, module: str):
+    """Return the module's cumulative time and the imports nested under it.
+
+    ``-X importtime`` prints each module after the modules it imported,
+    indented one level deeper, so the nested imports are the deeper lines
+    directly preceding the module's own line.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, raw_name = line.split("|")
+        name = raw_name.strip()
+        rows.append((len(raw_name) - len(raw_name.lstrip()), int(cumulative_us), name))
+
+    for index, (depth, cumulative_us, name) in enumerate(rows):
+        if name == module:
+            nested = []
+            for child_depth, child_us, child in reversed(rows[:index]):
+                if child_depth <= depth:
+                    break
+                nested.append((child, child_us))
+            return cumulative_us, nested
+    raise ValueError(f"{module} not found in -X importtime output")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.weather_service")
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    code = f"import sys, {args.module}; print('requests' in sys.modules)"
+    cumulative, walls, baseline = [], [], []
+    slowest = {}
+    loaded = None
+    for _ in range(args.runs):
+        baseline.append(run("pass")[0])
+        walls.append(run(code)[0])
+        _, stderr, stdout = run(code, importtime=True)
+        loaded = stdout.strip() == "True"
+        module_us, nested = parse_importtime(stderr, args.module)
+        cumulative.append(module_us)
+        for name, cumulative_us in nested:
+            slowest.setdefault(name, []).append(cumulative_us)
+
+    print(f"{args.module}: median import {statistics.median(cumulative) / 1000:.1f} ms "
+          f"(-X importtime, {args.runs} runs)")
+    print(f"Process wall time: {statistics.median(walls) * 1000:.1f} ms "
+          f"vs bare interpreter {statistics.median(baseline) * 1000:.1f} ms")
+    print(f"requests imported at startup: {'yes' if loaded else 'no'}")
+    print(f"\nSlowest imports under {args.module} (median cumulative):")
+    ranked = sorted(((statistics.median(values), name) for name, values in slowest.items()),
+                    reverse=True)
+    for microseconds, name in ranked[:args.top]:
+        print(f"  {microseconds / 1000:8.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Replay benchmark for cache TTL policies.
+
+Replays a synthetic request trace against ``WeatherService`` with a fake
+clock and a fake upstream that publishes new data every 15 minutes, then
+compares upstream calls and stale responses for a fixed TTL against the
+upstream-aligned TTL policy.
+
+Usage:
+    python -m benchmarks.ttl_replay [--cities 50] [--hours 24] [--rate 2.0]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from src.ttl_policy import UpstreamAlignedTTL
+from src.weather_service import WeatherService
+
+UPDATE_INTERVAL = 900
+
+
+class FakeClock:
+    """Manually advanced clock shared by the cache and the fake upstream."""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_upstream(clock: FakeClock, counter: dict):
+    """Build a fake ``fetch_weather`` returning the latest published slot."""
+    def fetch_weather(city):
+        counter['calls'] += 1
+        slot = int(clock.now // UPDATE_INTERVAL) * UPDATE_INTERVAL
+        stamp = datetime.fromtimestamp(slot, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M")
+        return {
+            'utc_offset_seconds': 0,
+            'current_weather': {'temperature': 20.0, 'time': stamp, 'interval': UPDATE_INTERVAL},
+        }
+    return fetch_weather
+
+
+def build_trace(cities: int, hours: float, rate: float, seed: int):
+    """Generate (offset_seconds, city) requests with Poisson arrivals per city."""
+    rng = random.Random(seed)
+    duration = hours * 3600
+    trace = []
+    for index in range(cities):
+        offset = rng.expovariate(rate / 60)
+        while offset < duration:
+            trace.append((offset, f"city-{index}"))
+            offset += rng.expovariate(rate / 60)
+    trace.sort()
+    return trace
+
+
+def replay(trace, start: float, cache_ttl: int, ttl_policy=None) -> dict:
+    """Replay a trace and count upstream calls and stale responses."""
+    clock = FakeClock(start)
+    counter = {'calls': 0}
+    service = WeatherService(cache_ttl=cache_ttl, ttl_policy=ttl_policy)
+    service.cache.clock = clock
+    service.api.fetch_weather = make_upstream(clock, counter)
+
+    stale = 0
+    for offset, city in trace:
+        clock.now = start + offset
+        data = service.get_weather(city)
+        latest = int(clock.now // UPDATE_INTERVAL) * UPDATE_INTERVAL
+        served = datetime.strptime(data['current_weather']['time'], "%Y-%m-%dT%H:%M")
+        if served.replace(tzinfo=timezone.utc).timestamp() < latest:
+            stale += 1
+
+    return {'requests': len(trace), 'upstream_calls': counter['calls'], 'stale': stale}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=50)
+    parser.add_argument('--hours', type=float, default=24)
+    parser.add_argument('--rate', type=float, default=2.0, help="requests per city per minute")
+    parser.add_argument('--ttl', type=int, default=600, help="fixed TTL in seconds")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    trace = build_trace(args.cities, args.hours, args.rate, args.seed)
+    start = float(int(time.time() // 86400) * 86400)
+
+    fixed = replay(trace, start, args.ttl)
+    aligned = replay(trace, start, args.ttl, UpstreamAlignedTTL(interval=UPDATE_INTERVAL))
+
+    print(f"Requests replayed: {len(trace)}")
+    print(f"{'policy':<22}{'upstream calls':>16}{'stale responses':>18}")
+    print(f"{f'fixed ttl={args.ttl}s':<22}{fixed['upstream_calls']:>16}{fixed['stale']:>18}")
+    print(f"{'upstream-aligned':<22}{aligned['upstream_calls']:>16}{aligned['stale']:>18}")
+    saved = fixed['upstream_calls'] - aligned['upstream_calls']
+    print(f"Upstream calls saved: {saved} ({saved / max(fixed['upstream_calls'], 1) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
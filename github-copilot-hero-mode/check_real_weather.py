@@ -1,9 +1,28 @@
 """
 Real-time Weather Check for Ahmedabad using Open-Meteo API
+
+Multi-city mode fetches several cities concurrently through a shared
+WeatherService cache and prints per-city and aggregate timings:
+
+    python check_real_weather.py --cities Mumbai Delhi --workers 4 --repeat 2
+    python check_real_weather.py --from-file cities.txt   # lines: name,lat,lon
 """
 
+import argparse
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.compact_weather import CompactWeather
+from src.history_downloader import load_locations
+from src.weather_service import WeatherService
+
+# Cities to check
+CITIES = {
+    "Ahmedabad, India": {"lat": 23.03, "lon": 72.58},
+    "Mumbai, India": {"lat": 19.08, "lon": 72.88},
+    "Delhi, India": {"lat": 28.61, "lon": 77.21},
+}
 
 
 def fetch_real_weather(city, latitude, longitude):
@@ -85,17 +104,121 @@ def display_weather(data, city):
     print("\n" + "=" * 60)
 
 
-def main():
+def select_cities(names):
+    """Pick known cities by full name or by the part before the comma"""
+    selected = {}
+    for name in names:
+        wanted = name.strip().lower()
+        matches = [city for city in CITIES
+                   if city.lower() == wanted or city.split(",")[0].lower() == wanted]
+        if not matches:
+            raise ValueError(f"Unknown city: {name} (known: {', '.join(CITIES)})")
+        selected[matches[0]] = CITIES[matches[0]]
+    return selected
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def fetch_city(service, city):
+    """Fetch one city through the shared service, timing the call"""
+    start_time = time.perf_counter()
+    try:
+        data = service.get_cached_weather(city)
+        source = "cache"
+        if data is None:
+            # The miss is already counted; fetch without a second lookup
+            data = service.fetch_and_cache_weather(city)
+            source = "api"
+        elif isinstance(data, CompactWeather):
+            data = data.to_dict()
+        return city, data, source, None, time.perf_counter() - start_time
+    except Exception as e:
+        return city, None, "error", e, time.perf_counter() - start_time
+
+
+def run_multi_city(cities, workers=8, repeat=1, service=None):
+    """Fetch cities concurrently, streaming results as each one finishes"""
+    service = service or WeatherService(
+        locations={name: (coords["lat"], coords["lon"]) for name, coords in cities.items()})
+    timings = {city: [] for city in cities}
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for round_number in range(1, repeat + 1):
+            print(f"\n🔁 Round {round_number}/{repeat}: {len(cities)} cities, {workers} workers")
+            round_start = time.perf_counter()
+            futures = [pool.submit(fetch_city, service, city) for city in cities]
+            for future in as_completed(futures):
+                city, data, source, error, elapsed = future.result()
+                if error is not None:
+                    print(f"  ❌ {city:<24} {elapsed * 1000:9.3f} ms  {error}")
+                    continue
+                timings[city].append(elapsed)
+                current = data.get("current_weather", {})
+                print(f"  ✅ {city:<24} {elapsed * 1000:9.3f} ms  [{source:>5}]  "
+                      f"{current.get('temperature', 'N/A')}°C  {current.get('windspeed', 'N/A')} km/h")
+            print(f"  ⏱️  Round time: {(time.perf_counter() - round_start) * 1000:.1f} ms")
+    
+    print("\n" + "=" * 60)
+    print(f"{'City':<26}{'n':>3}{'min ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print("-" * 60)
+    for city, samples in timings.items():
+        if samples:
+            ordered = sorted(samples)
+            print(f"{city:<26}{len(ordered):>3}{ordered[0] * 1000:>10.3f}"
+                  f"{percentile(ordered, 0.5) * 1000:>10.3f}{percentile(ordered, 0.95) * 1000:>10.3f}")
+    
+    everything = sorted(sample for samples in timings.values() for sample in samples)
+    if everything:
+        print("-" * 60)
+        print(f"{'All':<26}{len(everything):>3}{everything[0] * 1000:>10.3f}"
+              f"{percentile(everything, 0.5) * 1000:>10.3f}{percentile(everything, 0.95) * 1000:>10.3f}")
+    stats = service.get_cache_stats()
+    print(f"\n📦 Cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses "
+          f"({stats['hit_rate_percent']}% hit rate)")
+    return timings
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Real-time weather check using the Open-Meteo API.")
+    parser.add_argument("--cities", nargs="+", metavar="CITY",
+                        help="Known cities to fetch concurrently (e.g. Mumbai Delhi), or 'all'")
+    parser.add_argument("--from-file", metavar="PATH",
+                        help="File with one 'name,latitude,longitude' per line")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetches (default: 8)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Fetch every city this many times; later rounds hit the cache")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.repeat < 1:
+        parser.error("--workers and --repeat must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     print("=" * 60)
     print("🌍 REAL-TIME WEATHER CHECK")
     print("=" * 60)
     
-    # Cities to check
-    cities = {
-        "Ahmedabad, India": {"lat": 23.03, "lon": 72.58},
-        "Mumbai, India": {"lat": 19.08, "lon": 72.88},
-        "Delhi, India": {"lat": 28.61, "lon": 77.21},
-    }
+    if args.cities or args.from_file:
+        cities = {}
+        try:
+            if args.cities:
+                cities.update(CITIES if args.cities == ["all"] else select_cities(args.cities))
+            if args.from_file:
+                cities.update({name: {"lat": lat, "lon": lon}
+                               for name, (lat, lon) in load_locations(args.from_file).items()})
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            raise SystemExit(2)
+        run_multi_city(cities, args.workers, args.repeat)
+        print("\n✨ Demo script completed!")
+        return
+    
+    cities = CITIES
     
     print("\nAvailable cities:")
     for i, city in enumerate(cities.keys(), 1):
@@ -0,0 +1,476 @@
+"""Threshold alerts evaluated across every cached location.
+
+``WeatherMirror`` keeps a column-oriented copy of the cached
+``current_weather`` fields (one float column per field, one row per
+location), updated by a ``CacheManager`` listener on every set and removal.
+``AlertRule`` compiles an expression such as
+``"windspeed > 60 and weathercode in storm_codes"`` into a predicate over
+whole columns (NumPy boolean arrays when available), and ``AlertEngine``
+evaluates its rules and reports only the locations whose alert state
+changed since the previous run.
+
+Rule syntax: comparisons (``< <= > >= == !=``, chained comparisons too),
+``in`` / ``not in`` against a literal list or a named constant, combined
+with ``and``, ``or``, ``not`` and parentheses. Fields are the mirrored
+``current_weather`` field names.
+"""
+
+import ast
+import math
+import operator
+import threading
+from array import array
+from functools import reduce
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .compact_weather import CompactWeather
+from .forecast import _numpy
+
+MIRROR_FIELDS = ('temperature', 'windspeed', 'winddirection', 'weathercode', 'is_day')
+
+# WMO weather codes usable by name in rules
+DEFAULT_CONSTANTS: Dict[str, FrozenSet[float]] = {
+    'storm_codes': frozenset({95, 96, 99}),
+    'snow_codes': frozenset({71, 73, 75, 77, 85, 86}),
+    'rain_codes': frozenset({51, 53, 55, 61, 63, 65, 80, 81, 82}),
+}
+
+_COMPARISONS = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+
+def _is_location_key(key: str) -> bool:
+    """Plain city keys; skips forecast ("forecast:...") and projected ("city|...") entries."""
+    return ':' not in key and '|' not in key
+
+
+class WeatherMirror:
+    """Column-oriented copy of cached ``current_weather`` fields."""
+
+    def __init__(self, fields: Sequence[str] = MIRROR_FIELDS,
+                 key_filter: Optional[Callable[[str], bool]] = None,
+                 use_numpy: Optional[bool] = None):
+        """Initialize an empty mirror.
+
+        Args:
+            fields: ``current_weather`` fields to mirror; missing or
+                non-numeric values are stored as NaN.
+            key_filter: Selects which cache keys are mirrored (default:
+                plain city keys).
+            use_numpy: Force (True) or disable (False) NumPy columns. By
+                default NumPy is used when it is installed.
+        """
+        np = _numpy() if use_numpy is not False else None
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+        self.fields = tuple(fields)
+        self.key_filter = key_filter or _is_location_key
+        self._np = np
+        self._rows: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._lock = threading.Lock()
+        # Bumped whenever a row is assigned to a new key, so evaluations
+        # can tell a reused row from an unchanged one
+        self._allocations = 0
+        if np is not None:
+            self._columns = {field: np.empty(0) for field in self.fields}
+            self._valid = np.zeros(0, dtype=bool)
+            self._generation = np.zeros(0, dtype=np.int64)
+        else:
+            self._columns = {field: array('d') for field in self.fields}
+            self._valid = bytearray()
+            self._generation = array('q')
+
+    def attach(self, cache) -> "WeatherMirror":
+        """Mirror a ``CacheManager``: load current entries and follow changes."""
+        cache.add_listener(self.update)
+        for key in list(cache.cache):
+            if self.key_filter(key):
+                value = cache.get(key)
+                if value is not None:
+                    self.update(key, value)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def keys(self) -> List[str]:
+        """Mirrored cache keys."""
+        with self._lock:
+            return list(self._rows)
+
+    def update(self, key: str, value: Optional[Any]) -> None:
+        """Store (or with None, drop) the fields of one cache entry."""
+        if not self.key_filter(key):
+            return
+        current = _current_weather(value)
+        with self._lock:
+            if current is None:
+                row = self._rows.pop(key, None)
+                if row is not None:
+                    self._release(row)
+                return
+            row = self._rows.get(key)
+            if row is None:
+                row = self._allocate(key)
+            for field in self.fields:
+                number = current.get(field)
+                self._columns[field][row] = (
+                    float(number) if isinstance(number, (int, float)) else math.nan)
+            self._valid[row] = True
+
+    def match(self, rule: "AlertRule") -> List[str]:
+        """Return the keys of all locations for which a rule holds."""
+        with self._lock:
+            size = len(self._keys)
+            np = self._np
+            if np is not None:
+                columns = {field: self._columns[field][:size] for field in rule.fields}
+                mask = rule.mask(columns, size, np) & self._valid[:size]
+                return [self._keys[row] for row in np.flatnonzero(mask).tolist()]
+            columns = {field: self._columns[field] for field in rule.fields}
+            mask = rule.mask(columns, size, None)
+            return [self._keys[row] for row in range(size) if mask[row] and self._valid[row]]
+
+    def changes(self, rule: "AlertRule", state: "_RuleState") -> Tuple[List[str], List[str]]:
+        """Evaluate a rule and diff it against the previous evaluation.
+
+        Only rows whose outcome flipped, or whose row was reassigned to
+        another key, are visited, so the cost is one vectorized pass plus
+        work proportional to the changes.
+
+        Args:
+            rule: Compiled rule.
+            state: The rule's state from the previous call; updated in place.
+
+        Returns:
+            tuple: (triggered keys, resolved keys).
+        """
+        triggered, resolved = [], []
+        with self._lock:
+            size = len(self._keys)
+            np = self._np
+            columns = {field: self._columns[field][:size] if np is not None else self._columns[field]
+                       for field in rule.fields}
+            if np is not None:
+                mask = rule.mask(columns, size, np) & self._valid[:size]
+                generation = self._generation[:size].copy()
+                previous = np.zeros(size, dtype=bool)
+                previous[:len(state.mask)] = state.mask
+                moved = np.ones(size, dtype=bool)
+                moved[:len(state.generation)] = state.generation != generation[:len(state.generation)]
+                rows = np.flatnonzero((mask != previous) | (moved & (mask | previous))).tolist()
+            else:
+                raw = rule.mask(columns, size, None)
+                mask = [bool(raw[row] and self._valid[row]) for row in range(size)]
+                generation = array('q', self._generation)
+                old_size = len(state.mask)
+                rows = [row for row in range(size)
+                        if mask[row] != (row < old_size and state.mask[row])
+                        or ((mask[row] or (row < old_size and state.mask[row]))
+                            and (row >= old_size or state.generation[row] != generation[row]))]
+
+            for row in rows:
+                old_key = state.active.pop(row, None)
+                if old_key is not None:
+                    resolved.append(old_key)
+                if mask[row]:
+                    key = self._keys[row]
+                    state.active[row] = key
+                    triggered.append(key)
+        state.mask = mask
+        state.generation = generation
+
+        # A key removed and re-added between evaluations did not change
+        both = set(triggered) & set(resolved)
+        if both:
+            triggered = [key for key in triggered if key not in both]
+            resolved = [key for key in resolved if key not in both]
+        return sorted(triggered), sorted(resolved)
+
+    def _allocate(self, key: str) -> int:
+        """Assign a row to a new key, reusing freed rows first."""
+        if self._free:
+            row = self._free.pop()
+            self._keys[row] = key
+        else:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._grow(row + 1)
+        self._allocations += 1
+        self._generation[row] = self._allocations
+        self._rows[key] = row
+        return row
+
+    def _release(self, row: int) -> None:
+        self._keys[row] = None
+        self._valid[row] = False
+        for column in self._columns.values():
+            column[row] = math.nan
+        self._free.append(row)
+
+    def _grow(self, size: int) -> None:
+        """Make room for ``size`` rows (amortized doubling for NumPy)."""
+        np = self._np
+        if np is None:
+            for column in self._columns.values():
+                column.append(math.nan)
+            self._valid.append(0)
+            self._generation.append(0)
+            return
+        capacity = len(self._valid)
+        if size <= capacity:
+            return
+        capacity = max(1024, capacity * 2)
+        for field, column in self._columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[:len(column)] = column
+            self._columns[field] = grown
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:len(self._valid)] = self._valid
+        self._valid = valid
+        generation = np.zeros(capacity, dtype=np.int64)
+        generation[:len(self._generation)] = self._generation
+        self._generation = generation
+
+
+class AlertRule:
+    """A named rule compiled into a predicate over whole columns."""
+
+    def __init__(self, name: str, expression: str,
+                 constants: Optional[Dict[str, Iterable[float]]] = None):
+        """Parse and compile a rule expression.
+
+        Args:
+            name: Rule name used in reports.
+            expression: Rule such as "temperature > 40".
+            constants: Named value sets usable with ``in``, in addition
+                to ``DEFAULT_CONSTANTS``.
+
+        Raises:
+            ValueError: If the expression is malformed or uses unsupported
+                syntax.
+        """
+        self.name = name
+        self.expression = expression
+        self.fields: Set[str] = set()
+        self._constants = {constant: frozenset(values)
+                           for constant, values in {**DEFAULT_CONSTANTS, **(constants or {})}.items()}
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError:
+            raise ValueError(f"Invalid alert rule {name!r}: {expression}") from None
+        self._predicate = self._compile_condition(tree.body)
+
+    def mask(self, columns: Dict[str, Any], size: int, np) -> Any:
+        """Evaluate the rule over columns of ``size`` rows.
+
+        Returns:
+            A NumPy boolean array when ``np`` is given, else a list of bools.
+        """
+        return self._predicate(columns, size, np)
+
+    def _error(self, detail: str) -> ValueError:
+        return ValueError(f"Invalid alert rule {self.name!r}: {detail}")
+
+    def _compile_condition(self, node: ast.AST):
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile_condition(value) for value in node.values]
+            return _combine(parts, isinstance(node.op, ast.And))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = self._compile_condition(node.operand)
+
+            def negate(columns, size, np):
+                mask = inner(columns, size, np)
+                return ~mask if np is not None else [not value for value in mask]
+            return negate
+
+        if isinstance(node, ast.Compare):
+            left = node.left
+            parts = []
+            for op, right in zip(node.ops, node.comparators):
+                parts.append(self._compile_comparison(left, op, right))
+                left = right
+            # a < b < c means a < b and b < c
+            return parts[0] if len(parts) == 1 else _combine(parts, True)
+
+        raise self._error(f"unsupported expression {ast.dump(node)}")
+
+    def _compile_comparison(self, left: ast.AST, op: ast.cmpop, right: ast.AST):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            field = self._field(left)
+            values = self._value_set(right)
+            negated = isinstance(op, ast.NotIn)
+            ordered = sorted(values)
+
+            def membership(columns, size, np):
+                column = columns[field]
+                if np is not None:
+                    mask = np.isin(column, ordered)
+                    return ~mask if negated else mask
+                return [(value in values) != negated for value in column]
+            return membership
+
+        compare = _COMPARISONS.get(type(op))
+        if compare is None:
+            raise self._error(f"unsupported operator {type(op).__name__}")
+        left_value, right_value = self._operand(left), self._operand(right)
+        if not isinstance(left_value, str) and not isinstance(right_value, str):
+            raise self._error("each comparison needs a weather field")
+
+        def comparison(columns, size, np):
+            lhs = columns[left_value] if isinstance(left_value, str) else left_value
+            rhs = columns[right_value] if isinstance(right_value, str) else right_value
+            if np is not None:
+                return compare(lhs, rhs)
+            if not isinstance(left_value, str):
+                return [compare(lhs, value) for value in rhs]
+            if not isinstance(right_value, str):
+                return [compare(value, rhs) for value in lhs]
+            return [compare(a, b) for a, b in zip(lhs, rhs)]
+        return comparison
+
+    def _operand(self, node: ast.AST):
+        """Return a field name (str) or a numeric constant (float)."""
+        if isinstance(node, ast.Name):
+            return self._field(node)
+        number = _number(node)
+        if number is None:
+            raise self._error(f"expected a field or number, got {ast.dump(node)}")
+        return number
+
+    def _field(self, node: ast.AST) -> str:
+        if not isinstance(node, ast.Name) or node.id in self._constants:
+            raise self._error(f"expected a weather field, got {ast.dump(node)}")
+        self.fields.add(node.id)
+        return node.id
+
+    def _value_set(self, node: ast.AST) -> FrozenSet[float]:
+        if isinstance(node, ast.Name) and node.id in self._constants:
+            return self._constants[node.id]
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            numbers = [_number(element) for element in node.elts]
+            if None not in numbers:
+                return frozenset(numbers)
+        raise self._error("'in' needs a list of numbers or a named constant")
+
+
+class _RuleState:
+    """Per-rule result of the previous evaluation."""
+
+    __slots__ = ('mask', 'generation', 'active')
+
+    def __init__(self):
+        self.mask: Any = ()
+        self.generation: Any = ()
+        # row -> key for locations where the rule held
+        self.active: Dict[int, str] = {}
+
+
+class AlertChanges(NamedTuple):
+    """Alert state changes from one evaluation, per rule name."""
+
+    triggered: Dict[str, List[str]]
+    resolved: Dict[str, List[str]]
+
+
+class AlertEngine:
+    """Evaluates alert rules over a mirror and reports state changes."""
+
+    def __init__(self, mirror: WeatherMirror, rules: Optional[Dict[str, str]] = None,
+                 constants: Optional[Dict[str, Iterable[float]]] = None):
+        """Initialize the engine.
+
+        Args:
+            mirror: Column mirror of the cache, e.g.
+                ``WeatherMirror().attach(service.cache)``.
+            rules: Optional mapping of rule name to expression.
+            constants: Named value sets available to every rule.
+        """
+        self.mirror = mirror
+        self.constants = constants
+        self.rules: Dict[str, AlertRule] = {}
+        self._states: Dict[str, _RuleState] = {}
+        for name, expression in (rules or {}).items():
+            self.add_rule(name, expression)
+
+    def add_rule(self, name: str, expression: str) -> AlertRule:
+        """Compile and register a rule, replacing any rule with that name.
+
+        Raises:
+            ValueError: If the rule is invalid or uses unmirrored fields.
+        """
+        rule = AlertRule(name, expression, self.constants)
+        unknown = sorted(rule.fields - set(self.mirror.fields))
+        if unknown:
+            raise ValueError(f"Invalid alert rule {name!r}: unknown field {', '.join(unknown)}")
+        self.rules[name] = rule
+        self._states[name] = _RuleState()
+        return rule
+
+    def remove_rule(self, name: str) -> None:
+        """Unregister a rule and forget its active locations."""
+        del self.rules[name]
+        del self._states[name]
+
+    def active(self, name: str) -> Set[str]:
+        """Locations for which a rule held at the last evaluation."""
+        return set(self._states[name].active.values())
+
+    def evaluate(self) -> AlertChanges:
+        """Evaluate every rule and return only what changed.
+
+        Locations that leave the cache count as resolved.
+
+        Returns:
+            AlertChanges: Per rule, newly triggered and newly resolved keys
+            (sorted); rules without changes are omitted.
+        """
+        triggered: Dict[str, List[str]] = {}
+        resolved: Dict[str, List[str]] = {}
+        for name, rule in self.rules.items():
+            new, gone = self.mirror.changes(rule, self._states[name])
+            if new:
+                triggered[name] = new
+            if gone:
+                resolved[name] = gone
+        return AlertChanges(triggered, resolved)
+
+
+def _combine(parts, conjunction: bool):
+    """Join compiled predicates with ``and`` (conjunction) or ``or``."""
+    combine = all if conjunction else any
+    vector_op = operator.and_ if conjunction else operator.or_
+
+    def boolean(columns, size, np):
+        masks = [part(columns, size, np) for part in parts]
+        if np is not None:
+            return reduce(vector_op, masks)
+        return [combine(row) for row in zip(*masks)]
+    return boolean
+
+
+def _current_weather(value: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """Extract the ``current_weather`` block of a cached value, if any."""
+    if isinstance(value, CompactWeather):
+        value = value.to_dict()
+    if isinstance(value, dict) and isinstance(value.get('current_weather'), dict):
+        return value['current_weather']
+    return None
+
+
+def _number(node: ast.AST) -> Optional[float]:
+    """Return the value of a numeric literal node (allowing a sign)."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _number(node.operand)
+        if value is None:
+            return None
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        return float(node.value)
+    return None
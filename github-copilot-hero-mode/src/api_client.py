@@ -1,61 +1,431 @@
 """API Client for Weather Service.
 
 This module handles secure communication with external weather APIs.
+``requests`` (with urllib3, charset detection and the SSL setup) is only
+imported on the first network call, so importing the package stays cheap
+for short-lived processes; ``src.api_client.requests`` still resolves to
+the module on attribute access.
 """
 
+import hashlib
+import json
 import os
-import requests
+from contextlib import contextmanager
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .tracing import NULL_TRACER
+
+DEFAULT_BASE_URL = "https://api.open-meteo.com/v1/forecast"
+DEFAULT_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+# For demonstration, cities without known coordinates resolve to Berlin.
+# In production, would use geocoding service to convert city to coordinates
+DEFAULT_COORDINATES = (52.52, 13.405)
+
+# Response keys that differ on every response, even when the data is unchanged
+VOLATILE_KEYS = ("generationtime_ms",)
+
+# current_weather field name -> Open-Meteo ``current=`` variable
+CURRENT_FIELDS = {
+    "temperature": "temperature_2m",
+    "windspeed": "wind_speed_10m",
+    "winddirection": "wind_direction_10m",
+    "weathercode": "weather_code",
+    "is_day": "is_day",
+}
+
+
+def _load_requests():
+    """Import ``requests`` on first use and bind it as a module global."""
+    module = globals().get('requests')
+    if module is None:
+        import requests as module
+        globals()['requests'] = module
+    return module
+
+
+def __getattr__(name: str):
+    # Lazily provide ``requests`` as a module attribute (PEP 562), e.g. for
+    # ``patch('src.api_client.requests.get')``
+    if name == 'requests':
+        return _load_requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FetchResult(NamedTuple):
+    """Outcome of a conditional fetch."""
+
+    data: Any
+    validators: Dict[str, str]
+    not_modified: bool
 
 
 class APIClient:
     """Handles secure communication with external weather API."""
 
-    def __init__(self):
+    def __init__(self, tracer=NULL_TRACER,
+                 locations: Optional[Mapping[str, Tuple[float, float]]] = None):
         """Initialize API client with secure configuration.
         
         The API key is retrieved from the WEATHER_API_KEY environment variable.
-        Uses Open-Meteo API which provides free weather data.
+        Uses Open-Meteo API which provides free weather data; set
+        WEATHER_API_BASE_URL (and WEATHER_ARCHIVE_BASE_URL for historical
+        data) to point the client elsewhere, e.g. at a ``src.replay`` server.
+        
+        Args:
+            tracer: Optional ``Tracer`` recording HTTP phase spans.
+            locations: Optional mapping of city name to (latitude,
+                longitude). Names are matched case-insensitively; other
+                cities use ``DEFAULT_COORDINATES``.
         """
         self.api_key = os.getenv("WEATHER_API_KEY")
-        self.base_url = "https://api.open-meteo.com/v1/forecast"
+        self.base_url = os.getenv("WEATHER_API_BASE_URL", DEFAULT_BASE_URL)
+        self.archive_url = os.getenv("WEATHER_ARCHIVE_BASE_URL", DEFAULT_ARCHIVE_URL)
+        self.tracer = tracer
+        self._session = None
+        self.locations = {
+            name.strip().lower(): tuple(coordinates)
+            for name, coordinates in (locations or {}).items()
+        }
 
-    def fetch_weather(self, city: str):
+    def fetch_weather(self, city: str, fields: Optional[Sequence[str]] = None):
         """Fetch current weather data for a city.
         
         Args:
             city: Name of the city to fetch weather for.
+            fields: Optional ``current_weather`` fields to download (see
+                ``CURRENT_FIELDS``). When given, only those variables are
+                requested via Open-Meteo's ``current=`` parameter and the
+                response is reshaped into the usual ``current_weather`` block.
             
         Returns:
             dict: Weather data from the API.
             
         Raises:
-            ValueError: If city name is invalid.
+            ValueError: If city name or a field is invalid.
             requests.exceptions.RequestException: If API request fails.
             requests.exceptions.Timeout: If request times out.
             requests.exceptions.HTTPError: If API returns error status.
         """
+        self._validate_city(city)
+        
+        params = self._weather_params(fields, self.coordinates(city))
+        if fields is None:
+            return self._get(params)
+        return normalize_current(self._get(params))
+
+    def fetch_weather_conditional(self, city: str, validators: Optional[Dict[str, str]] = None,
+                                  fields: Optional[Sequence[str]] = None) -> FetchResult:
+        """Fetch current weather unless it is unchanged since a previous fetch.
+        
+        Stored validators are sent as ``If-None-Match`` / ``If-Modified-Since``.
+        A 304 response, or a payload whose content hash (see
+        ``content_hash``) matches the stored ``content_hash``, is reported
+        as not modified, so the caller keeps its stored value instead of
+        re-storing and re-encoding the new one.
+        
+        Args:
+            city: Name of the city to fetch weather for.
+            validators: Validators returned by a previous call, if any.
+            fields: Optional field projection, as for ``fetch_weather``.
+            
+        Returns:
+            FetchResult: Parsed data (None when not modified), the
+            validators to store with it, and the not-modified flag.
+            
+        Raises:
+            ValueError: If city name or a field is invalid.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        self._validate_city(city)
+        
+        params = self._weather_params(fields, self.coordinates(city))
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        
+        with self._translate_errors():
+            if self.tracer.enabled:
+                with self.tracer.span('http.request', url=self.base_url, conditional=bool(headers)):
+                    response = self._http_get(self.base_url, params=params, headers=headers,
+                                              timeout=5, stream=True)
+            else:
+                response = self._http_get(self.base_url, params=params, headers=headers, timeout=5)
+            if response.status_code == 304:
+                return FetchResult(None, dict(validators or {}), True)
+            response.raise_for_status()
+            data = self._decode(response)
+        
+        fresh = {"content_hash": content_hash(data)}
+        if response.headers.get("ETag"):
+            fresh["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            fresh["last_modified"] = response.headers["Last-Modified"]
+        if validators and validators.get("content_hash") == fresh["content_hash"]:
+            return FetchResult(None, fresh, True)
+        
+        if fields is not None:
+            data = normalize_current(data)
+        return FetchResult(data, fresh, False)
+
+    def fetch_forecast(self, city: str, variables: Sequence[str], hours: int):
+        """Fetch an hourly forecast for a city.
+        
+        Times are requested as Unix timestamps so they can be stored in
+        integer arrays without string parsing.
+        
+        Args:
+            city: Name of the city to fetch the forecast for.
+            variables: Open-Meteo hourly variable names, e.g. "temperature_2m".
+            hours: Number of forecast hours to request.
+            
+        Returns:
+            dict: Forecast data from the API, with an ``hourly`` block of
+            parallel arrays.
+            
+        Raises:
+            ValueError: If city name is invalid.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        self._validate_city(city)
+        
+        latitude, longitude = self.coordinates(city)
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "hourly": ",".join(variables),
+            "forecast_hours": hours,
+            "timeformat": "unixtime"
+        }
+        
+        return self._get(params)
+
+    def fetch_history(self, latitude: float, longitude: float, start_date: str,
+                      end_date: str, variables: Sequence[str]):
+        """Fetch historical hourly data for a location from the archive API.
+        
+        Args:
+            latitude: Location latitude.
+            longitude: Location longitude.
+            start_date: First day, ISO format (YYYY-MM-DD).
+            end_date: Last day (inclusive), ISO format.
+            variables: Open-Meteo hourly variable names.
+            
+        Returns:
+            dict: Archive data with an ``hourly`` block of parallel arrays
+            and Unix timestamps.
+            
+        Raises:
+            requests.exceptions.RequestException: If API request fails.
+        """
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "start_date": start_date,
+            "end_date": end_date,
+            "hourly": ",".join(variables),
+            "timeformat": "unixtime"
+        }
+        
+        return self._get(params, self.archive_url)
+
+    def coordinates(self, city: str) -> Tuple[float, float]:
+        """Return the (latitude, longitude) used for a city."""
+        return self.locations.get(city.strip().lower(), DEFAULT_COORDINATES)
+
+    @staticmethod
+    def _weather_params(fields: Optional[Sequence[str]],
+                        coordinates: Tuple[float, float] = DEFAULT_COORDINATES) -> dict:
+        """Build query parameters for a current weather request."""
+        params = {
+            "latitude": coordinates[0],
+            "longitude": coordinates[1],
+            "current_weather": True
+        }
+        
+        if fields is not None:
+            del params["current_weather"]
+            params["current"] = ",".join(projection_variables(fields))
+        return params
+
+    @staticmethod
+    def _validate_city(city: str) -> None:
+        """Validate a city name before it is used in a request.
+        
+        Raises:
+            ValueError: If city name is invalid or empty.
+        """
         if not city or not isinstance(city, str):
             raise ValueError("Invalid city name.")
         
         # Validate city is not empty after stripping whitespace
         if not city.strip():
             raise ValueError("City name cannot be empty.")
+
+    def prewarm(self, pool_size: int = 16, connect: bool = True) -> bool:
+        """Load the HTTP stack and open a pooled connection ahead of traffic.
         
-        # For demonstration, using fixed coordinates (Berlin)
-        # In production, would use geocoding service to convert city to coordinates
-        params = {
-            "latitude": 52.52,
-            "longitude": 13.405,
-            "current_weather": True
-        }
+        Meant for long-running servers: it moves the ``requests`` import,
+        TLS setup and the first TCP/TLS handshake out of the first user
+        request. Afterwards all requests go through a shared keep-alive
+        ``requests.Session``.
         
+        Args:
+            pool_size: Connections kept per host by the session.
+            connect: Also open a connection to the API host now.
+            
+        Returns:
+            bool: True if the session is ready (and connected, if asked);
+            False if connecting failed. Failures are not raised, since
+            the first real request will simply connect itself.
+        """
+        requests = _load_requests()
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        if not connect:
+            return True
         try:
-            response = requests.get(self.base_url, params=params, timeout=5)
+            self._session.head(self.base_url, timeout=5)
+        except requests.exceptions.RequestException:
+            return False
+        return True
+
+    def _http_get(self, url: str, **kwargs):
+        """Issue a GET through the pre-warmed session, if any."""
+        if self._session is not None:
+            return self._session.get(url, **kwargs)
+        return _load_requests().get(url, **kwargs)
+
+    def _get(self, params: dict, url: Optional[str] = None):
+        """Perform a GET request against the API and decode the JSON body.
+        
+        Args:
+            params: Query parameters.
+            url: Endpoint to call (default: ``base_url``).
+        
+        Raises:
+            requests.exceptions.Timeout: If request times out.
+            requests.exceptions.HTTPError: If API returns error status.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        with self._translate_errors():
+            url = url or self.base_url
+            if self.tracer.enabled:
+                return self._traced_get(url, params)
+            response = self._http_get(url, params=params, timeout=5)
             response.raise_for_status()
             return response.json()
+
+    @staticmethod
+    @contextmanager
+    def _translate_errors():
+        """Re-raise request failures with descriptive messages.
+        
+        Raises:
+            requests.exceptions.Timeout: If request times out.
+            requests.exceptions.HTTPError: If API returns error status.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        requests = _load_requests()
+        try:
+            yield
         except requests.exceptions.Timeout:
             raise requests.exceptions.Timeout("API request timed out after 5 seconds")
         except requests.exceptions.HTTPError as e:
             raise requests.exceptions.HTTPError(f"API returned error status: {e}")
         except requests.exceptions.RequestException as e:
             raise requests.exceptions.RequestException(f"API request failed: {e}")
+
+    def _traced_get(self, url: str, params: dict):
+        """Perform ``_get`` with one span per HTTP phase.
+        
+        requests does not expose DNS/connect timings separately, so the
+        first span covers connection setup through response headers; the
+        body is streamed so reading and decoding are timed on their own.
+        """
+        with self.tracer.span('http.request', url=url):
+            response = self._http_get(url, params=params, timeout=5, stream=True)
+            response.raise_for_status()
+        return self._decode(response)
+
+    def _decode(self, response):
+        """Read and decode a JSON response body, traced per phase if enabled."""
+        if not self.tracer.enabled:
+            return response.json()
+        with self.tracer.span('http.read_body'):
+            body = response.content
+        with self.tracer.span('http.decode_json', bytes=len(body)):
+            return response.json()
+
+
+def content_hash(data: Any) -> str:
+    """Hash a decoded weather payload, ignoring per-response metadata.
+    
+    Open-Meteo reports a different ``generationtime_ms`` in every
+    response, so hashing the raw body would never match. The payload is
+    hashed as canonical JSON (sorted keys, compact separators) without the
+    ``VOLATILE_KEYS``.
+    
+    Args:
+        data: Decoded response payload.
+        
+    Returns:
+        str: Hex SHA-256 digest.
+    """
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key not in VOLATILE_KEYS}
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def projection_variables(fields: Sequence[str]) -> list:
+    """Map ``current_weather`` field names onto Open-Meteo variables.
+    
+    Args:
+        fields: Field names such as "temperature" or "windspeed".
+        
+    Returns:
+        list: Open-Meteo ``current=`` variable names, in request order.
+        
+    Raises:
+        ValueError: If fields is empty or names an unknown field.
+    """
+    if isinstance(fields, str) or not fields:
+        raise ValueError("Fields must be a non-empty list of names.")
+    unknown = [field for field in fields if field not in CURRENT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown weather field: {', '.join(map(str, unknown))}")
+    return [CURRENT_FIELDS[field] for field in dict.fromkeys(fields)]
+
+
+def normalize_current(data: dict) -> dict:
+    """Reshape a ``current=`` response into the ``current_weather`` layout.
+    
+    Args:
+        data: Open-Meteo response containing ``current``/``current_units``.
+        
+    Returns:
+        dict: The same response with ``current_weather`` and
+        ``current_weather_units`` keyed by field names.
+    """
+    if not isinstance(data, dict) or "current" not in data:
+        return data
+    names = {variable: field for field, variable in CURRENT_FIELDS.items()}
+    names.update(time="time", interval="interval")
+    
+    result = {key: value for key, value in data.items() if key not in ("current", "current_units")}
+    result["current_weather"] = {
+        names.get(key, key): value for key, value in data["current"].items()
+    }
+    if isinstance(data.get("current_units"), dict):
+        result["current_weather_units"] = {
+            names.get(key, key): value for key, value in data["current_units"].items()
+        }
+    return result
@@ -0,0 +1,272 @@
+"""Columnar on-disk archive of historical hourly weather.
+
+The archive is a directory holding one append-only binary column file per
+variable plus a JSON index:
+
+    time.i64            int64 Unix timestamps
+    <variable>.f32      float32 values, row-aligned with time.i64
+    index.json          variables, row count and per-location segments
+
+Each appended chunk becomes a segment (location, first row, row count,
+first/last timestamp). Range queries find the overlapping segments in the
+index, binary-search the memory-mapped time column and read only the
+needed slices of each variable file.
+"""
+
+import json
+import math
+import mmap
+import os
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .forecast import HourlyForecast, _numpy
+
+INDEX_FILE = "index.json"
+TIME_FILE = "time.i64"
+
+
+class ColumnarArchive:
+    """Append-only columnar archive of hourly series for many locations."""
+
+    def __init__(self, root: str, variables: Optional[Sequence[str]] = None):
+        """Open an archive directory, creating it if needed.
+
+        Args:
+            root: Archive directory.
+            variables: Hourly variables stored in the archive. Required when
+                creating a new archive; must match an existing one if given.
+
+        Raises:
+            ValueError: If variables are missing for a new archive or do not
+                match an existing one, or the archive byte order differs.
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._maps: Dict[str, mmap.mmap] = {}
+        index_path = os.path.join(root, INDEX_FILE)
+
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as file:
+                self.index = json.load(file)
+            if variables is not None and list(variables) != self.index['variables']:
+                raise ValueError(f"Archive stores variables {self.index['variables']}")
+            if self.index['byteorder'] != sys.byteorder:
+                raise ValueError("Archive was written with a different byte order")
+            self._truncate_to_index()
+        else:
+            if not variables:
+                raise ValueError("Variables are required to create an archive")
+            os.makedirs(root, exist_ok=True)
+            self.index = {'variables': list(variables), 'byteorder': sys.byteorder,
+                          'rows': 0, 'segments': []}
+            self._write_index()
+        self._spans = {(segment['location'], segment['first'], segment['last'], segment['count'])
+                       for segment in self.index['segments']}
+
+    @property
+    def variables(self) -> List[str]:
+        """Variables stored in the archive."""
+        return list(self.index['variables'])
+
+    @property
+    def rows(self) -> int:
+        """Total rows across all locations."""
+        return self.index['rows']
+
+    def locations(self) -> List[str]:
+        """Location ids with archived data."""
+        return sorted({segment['location'] for segment in self.index['segments']})
+
+    def segments(self, location: str) -> List[Dict[str, Any]]:
+        """Index segments for a location, ordered by first timestamp."""
+        return sorted((segment for segment in self.index['segments']
+                       if segment['location'] == location), key=lambda segment: segment['first'])
+
+    def append(self, location: str, forecast: HourlyForecast) -> int:
+        """Append one chunk of hourly data for a location.
+
+        Args:
+            location: Location id, e.g. a city name or "lat,lon".
+            forecast: Hourly data; variables it lacks are stored as NaN.
+
+        Returns:
+            int: Rows appended.
+        """
+        return self.append_many([(location, forecast)])
+
+    def append_many(self, chunks: Iterable[Tuple[str, HourlyForecast]]) -> int:
+        """Append several chunks and rewrite the index once.
+
+        Column data is appended before the index is rewritten, so a crash
+        leaves at most unindexed trailing bytes, which are dropped on the
+        next open; a failed write truncates the column files straight away.
+        Chunks whose location and time span are already indexed are skipped,
+        so retried chunks are not duplicated.
+
+        Args:
+            chunks: ``(location, forecast)`` pairs; variables a forecast
+                lacks are stored as NaN.
+
+        Returns:
+            int: Rows appended.
+        """
+        with self._lock:
+            rows = self.index['rows']
+            segments = []
+            spans = set()
+            try:
+                for location, forecast in chunks:
+                    count = len(forecast)
+                    if count == 0:
+                        continue
+                    times = array('q', forecast.times)
+                    span = (location, times[0], times[-1], count)
+                    if span in self._spans or span in spans:
+                        continue
+
+                    self._append_bytes(TIME_FILE, times.tobytes())
+                    for name in self.index['variables']:
+                        if name in forecast.columns:
+                            values = array('f', forecast.columns[name])
+                        else:
+                            values = array('f', [math.nan]) * count
+                        self._append_bytes(_column_file(name), values.tobytes())
+
+                    spans.add(span)
+                    segments.append({'location': location, 'start': rows, 'count': count,
+                                     'first': span[1], 'last': span[2]})
+                    rows += count
+            except BaseException:
+                self._truncate_to_index()
+                raise
+
+            if not segments:
+                return 0
+            appended = rows - self.index['rows']
+            self.index['segments'].extend(segments)
+            self.index['rows'] = rows
+            self._spans.update(spans)
+            self._write_index()
+        return appended
+
+    def query(self, location: str, start_time: Optional[float] = None,
+              end_time: Optional[float] = None,
+              variables: Optional[Iterable[str]] = None) -> HourlyForecast:
+        """Read the hours with ``start_time <= time < end_time`` for a location.
+
+        Args:
+            location: Location id used when appending.
+            start_time: Inclusive Unix timestamp (default: earliest).
+            end_time: Exclusive Unix timestamp (default: latest).
+            variables: Variables to read (default: all).
+
+        Returns:
+            HourlyForecast: Time-ordered columns (NumPy arrays when
+            available, ``array`` otherwise).
+
+        Raises:
+            KeyError: If a requested variable is not archived.
+        """
+        names = self.variables if variables is None else list(variables)
+        for name in names:
+            if name not in self.index['variables']:
+                raise KeyError(f"Variable not in archive: {name}")
+        low = -math.inf if start_time is None else start_time
+        high = math.inf if end_time is None else end_time
+
+        # Row ranges [begin, end) to read, in time order
+        ranges = []
+        with self._lock:
+            times_map = self._map(TIME_FILE)
+            time_view = memoryview(times_map).cast('q') if times_map is not None else None
+            for segment in self.segments(location):
+                if segment['last'] < low or segment['first'] >= high:
+                    continue
+                begin, end = segment['start'], segment['start'] + segment['count']
+                begin = bisect_left(time_view, low, begin, end)
+                end = bisect_left(time_view, high, begin, end)
+                if begin < end:
+                    ranges.append((begin, end))
+            if time_view is not None:
+                time_view.release()
+
+            np = _numpy()
+            times = self._read(TIME_FILE, 'q', ranges, np)
+            columns = {name: self._read(_column_file(name), 'f', ranges, np) for name in names}
+        return HourlyForecast(times, columns)
+
+    def close(self) -> None:
+        """Release memory maps."""
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+
+    def __enter__(self) -> "ColumnarArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.root, filename)
+
+    def _append_bytes(self, filename: str, data: bytes) -> None:
+        with open(self._path(filename), 'ab') as file:
+            file.write(data)
+
+    def _write_index(self) -> None:
+        """Atomically replace the index file."""
+        path = self._path(INDEX_FILE)
+        with open(path + ".tmp", 'w', encoding='utf-8') as file:
+            json.dump(self.index, file)
+        os.replace(path + ".tmp", path)
+
+    def _truncate_to_index(self) -> None:
+        """Drop column bytes written after the last indexed append."""
+        rows = self.index['rows']
+        files = [(TIME_FILE, 8)] + [(_column_file(name), 4) for name in self.index['variables']]
+        for filename, itemsize in files:
+            path = self._path(filename)
+            if os.path.exists(path) and os.path.getsize(path) > rows * itemsize:
+                with open(path, 'r+b') as file:
+                    file.truncate(rows * itemsize)
+
+    def _map(self, filename: str) -> Optional[mmap.mmap]:
+        """Memory-map a column file, remapping it after appends."""
+        itemsize = 8 if filename == TIME_FILE else 4
+        length = self.index['rows'] * itemsize
+        mapped = self._maps.get(filename)
+        if mapped is not None and len(mapped) == length:
+            return mapped
+        if mapped is not None:
+            mapped.close()
+            del self._maps[filename]
+        if length == 0:
+            return None
+        with open(self._path(filename), 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), length, access=mmap.ACCESS_READ)
+        self._maps[filename] = mapped
+        return mapped
+
+    def _read(self, filename: str, typecode: str, ranges, np) -> Any:
+        """Copy the given row ranges of one column file into a new column."""
+        mapped = self._map(filename) if ranges else None
+        itemsize = 8 if typecode == 'q' else 4
+        if np is not None:
+            dtype = np.int64 if typecode == 'q' else np.float32
+            parts = [np.frombuffer(mapped, dtype=dtype, count=end - begin, offset=begin * itemsize)
+                     for begin, end in ranges]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        column = array(typecode)
+        for begin, end in ranges:
+            column.frombytes(mapped[begin * itemsize:end * itemsize])
+        return column
+
+
+def _column_file(variable: str) -> str:
+    return variable + ".f32"
@@ -3,26 +3,94 @@
 This module provides in-memory caching with TTL (Time-To-Live) functionality.
 """
 
+import itertools
+import json
+import sys
+import threading
 import time
-from typing import Any, Optional
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .tracing import NULL_TRACER
+
+# Computes a per-entry TTL from (key, value, now); None means "use default"
+TTLPolicy = Callable[[str, Any, float], Optional[float]]
+
+# Called with (key, value) after a set, and (key, None) after a removal
+CacheListener = Callable[[str, Optional[Any]], None]
+
+COMPRESSION_CODECS = ('zlib', 'lzma')
 
 
 class CacheManager:
     """In-memory cache with TTL (time-to-live)."""
 
-    def __init__(self, ttl: int = 600):
+    def __init__(self, ttl: int = 600, ttl_policy: Optional[TTLPolicy] = None,
+                 clock: Callable[[], float] = time.time,
+                 compress_threshold: Optional[int] = None, compression: str = 'zlib',
+                 max_bytes: Optional[int] = None, keep_stale: bool = False,
+                 stale_ttl: Optional[float] = None, tracer=NULL_TRACER):
         """Initialize cache manager with configurable TTL.
         
         Args:
             ttl: Time-to-live in seconds (default: 600 = 10 minutes).
+            ttl_policy: Optional callable computing a per-entry TTL from
+                the key, value and current time. Entries for which it
+                returns None use ``ttl``.
+            clock: Time source returning Unix timestamps (default: time.time).
+            compress_threshold: Compress JSON-serializable values whose
+                serialized size is at least this many bytes. None disables
+                compression.
+            compression: Codec for compressed entries, 'zlib' or 'lzma'.
+            max_bytes: Optional capacity in bytes. Compressed entries count
+                their compressed size; the oldest entries are evicted first.
+            keep_stale: Keep expired entries for up to ``stale_ttl``
+                (or until evicted or ``remove_expired``) so they can be
+                revalidated with ``get_stale`` and ``refresh`` instead of
+                refetched.
+            stale_ttl: Seconds an expired entry is kept when
+                ``keep_stale`` is set (default: ``ttl``). Older entries are
+                dropped on lookup and by a sweep run from ``set`` at most
+                once per ``stale_ttl``.
+            tracer: Optional ``Tracer`` recording cache.get/cache.set spans.
         """
         if ttl <= 0:
             raise ValueError("TTL must be positive")
+        if compress_threshold is not None and compress_threshold < 0:
+            raise ValueError("Compression threshold cannot be negative")
+        if compression not in COMPRESSION_CODECS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Cache capacity must be positive")
+        if stale_ttl is not None and stale_ttl < 0:
+            raise ValueError("Stale TTL cannot be negative")
         self.ttl = ttl
+        self.ttl_policy = ttl_policy
+        self.clock = clock
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.keep_stale = keep_stale
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.tracer = tracer
         self.cache = {}
+        # Guards entries and byte accounting when shared across threads
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self._raw_bytes = 0
+        self._compressed_bytes = 0
+        self._compress_seconds = 0.0
+        self._decompress_seconds = 0.0
+        self._evictions = 0
+        self._listeners: List[CacheListener] = []
+        # Every set gets a new version; refresh keeps it (value unchanged)
+        self._versions = itertools.count(1)
+        self._next_stale_sweep = 0.0
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve value from cache if not expired.
+
+        Compressed entries are decompressed on each successful lookup.
         
         Args:
             key: Cache key to retrieve.
@@ -30,37 +98,197 @@ class CacheManager:
         Returns:
             Cached value if found and not expired, None otherwise.
         """
+        if self.tracer.enabled:
+            with self.tracer.span('cache.get', key=key):
+                return self._get(key)
+        return self._get(key)
+
+    def _get(self, key: str) -> Optional[Any]:
+        """Look up an entry (see ``get``)."""
         if not isinstance(key, str):
             raise TypeError("Cache key must be a string")
             
-        entry = self.cache.get(key)
-        if entry and time.time() - entry['timestamp'] < self.ttl:
-            return entry['data']
-        
-        # Remove expired entry
-        if entry:
-            del self.cache[key]
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry and self.clock() < entry['expires_at']:
+                if 'codec' not in entry:
+                    return entry['data']
+            elif entry:
+                # Remove expired entry unless it may still be revalidated
+                if not self._revalidatable(entry):
+                    self._remove(key)
+                return None
+            else:
+                return None
         
-        return None
+        # Decompress outside the lock; the entry itself is never mutated
+        return self._decompress(entry)
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            validators: Optional[Dict[str, str]] = None) -> None:
         """Store value in cache with current timestamp.
         
         Args:
             key: Cache key to store under.
             value: Data to cache.
+            ttl: Optional TTL override in seconds for this entry. When
+                omitted, the TTL policy (if any) and then the default TTL
+                are used.
+            validators: Optional HTTP validators (e.g. ETag, Last-Modified,
+                content hash) used to revalidate the entry once expired.
         """
+        if self.tracer.enabled:
+            with self.tracer.span('cache.set', key=key):
+                return self._set(key, value, ttl, validators)
+        return self._set(key, value, ttl, validators)
+
+    def _set(self, key: str, value: Any, ttl: Optional[float],
+             validators: Optional[Dict[str, str]] = None) -> None:
+        """Store an entry (see ``set``)."""
         if not isinstance(key, str):
             raise TypeError("Cache key must be a string")
-            
-        self.cache[key] = {
+
+        now = self.clock()
+        entry = {
             'data': value,
-            'timestamp': time.time()
+            'timestamp': now,
+            'expires_at': now + self._entry_ttl(key, value, now, ttl)
         }
+        if validators:
+            entry['validators'] = dict(validators)
+        if self.compress_threshold is not None or self.max_bytes is not None:
+            self._encode(entry)
+        entry['version'] = next(self._versions)
+
+        with self._lock:
+            # Re-inserting moves the key to the end of the eviction order
+            replaced = key in self.cache
+            if replaced:
+                self._remove(key, notify=False)
+            if self.max_bytes is not None and entry['size'] > self.max_bytes:
+                if replaced:
+                    self._notify(key, None)
+                return
+            self.cache[key] = entry
+            self._total_bytes += entry.get('size', 0)
+            self._notify(key, value)
+            self._evict_to_capacity()
+            if self.keep_stale and now >= self._next_stale_sweep:
+                self._sweep_stale(now)
+
+    def get_versioned(self, key: str,
+                      known_version: Optional[int] = None) -> Optional[Tuple[Optional[Any], int]]:
+        """Retrieve a live entry together with its version.
+
+        Each ``set`` gives the entry a new version and ``refresh`` keeps it,
+        so callers holding work derived from a value (e.g. a serialized
+        response) can check it is current by version. Compressed entries
+        decode to a new object on every lookup, so identity cannot be used.
+        
+        Args:
+            key: Cache key to retrieve.
+            known_version: Version the caller already holds. If it is
+                still current the value is not decoded.
+            
+        Returns:
+            Tuple of (value, version), where value is None if the version
+            equals ``known_version``; None if the key is missing or expired.
+        """
+        if not isinstance(key, str):
+            raise TypeError("Cache key must be a string")
+
+        with self._lock:
+            entry = self.cache.get(key)
+            if not entry:
+                return None
+            if self.clock() >= entry['expires_at']:
+                if not self._revalidatable(entry):
+                    self._remove(key)
+                return None
+        version = entry['version']
+        if version == known_version:
+            return None, version
+        value = self._decompress(entry) if 'codec' in entry else entry['data']
+        return value, version
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, Dict[str, str]]]:
+        """Retrieve an entry and its validators, even if it has expired.
+        
+        Args:
+            key: Cache key to retrieve.
+            
+        Returns:
+            Tuple of (value, validators) if the key is stored, None
+            otherwise. Validators are empty if none were stored.
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if self.clock() >= entry['expires_at'] and not self._revalidatable(entry):
+                self._remove(key)
+                return None
+        value = self._decompress(entry) if 'codec' in entry else entry['data']
+        return value, dict(entry.get('validators', {}))
+
+    def refresh(self, key: str, ttl: Optional[float] = None,
+                validators: Optional[Dict[str, str]] = None) -> bool:
+        """Extend an entry's lifetime without replacing its value.
+        
+        Used after upstream confirms that a stored entry is unchanged.
+        
+        Args:
+            key: Cache key to refresh.
+            ttl: Optional TTL override, as for ``set``.
+            validators: Optional new validators to store with the entry.
+            
+        Returns:
+            True if the entry was refreshed, False if it is not stored.
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+        if entry is None:
+            return False
+
+        now = self.clock()
+        value = None
+        if ttl is None and self.ttl_policy is not None:
+            # The policy may depend on the value (e.g. its upstream timestamp)
+            value = self._decompress(entry) if 'codec' in entry else entry['data']
+        refreshed = dict(entry, timestamp=now, expires_at=now + self._entry_ttl(key, value, now, ttl))
+        if validators:
+            refreshed['validators'] = dict(validators)
+
+        with self._lock:
+            if self.cache.get(key) is not entry:
+                return False
+            # Replace rather than mutate, and move to the end of the eviction order
+            del self.cache[key]
+            self.cache[key] = refreshed
+        return True
+
+    def add_listener(self, listener: CacheListener) -> None:
+        """Register a callback observing stored values.
+        
+        The listener is called with ``(key, value)`` after each ``set``
+        and with ``(key, None)`` when an entry is removed (expiry,
+        eviction or ``clear``). It runs while the cache lock is held, so
+        it must be fast and must not call back into the cache.
+        
+        Args:
+            listener: Callable taking the key and the new value or None.
+        """
+        with self._lock:
+            self._listeners.append(listener)
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self.cache.clear()
+        with self._lock:
+            if self._listeners:
+                for key in self.cache:
+                    self._notify(key, None)
+            self.cache.clear()
+            self._total_bytes = 0
 
     def size(self) -> int:
         """Get number of entries in cache.
@@ -76,13 +304,127 @@ class CacheManager:
         Returns:
             Number of entries removed.
         """
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if current_time - entry['timestamp'] >= self.ttl
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
+        current_time = self.clock()
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self.cache.items()
+                if current_time >= entry['expires_at']
+            ]
+            
+            for key in expired_keys:
+                self._remove(key)
         
         return len(expired_keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get storage and compression statistics.
+
+        Returns:
+            dict: Entry counts, stored bytes, compression ratio of all
+            entries compressed so far, CPU seconds spent compressing and
+            decompressing, and capacity evictions.
+        """
+        ratio = (self._raw_bytes / self._compressed_bytes) if self._compressed_bytes else 1.0
+        with self._lock:
+            compressed_entries = sum(1 for entry in self.cache.values() if 'codec' in entry)
+        return {
+            'entries': len(self.cache),
+            'compressed_entries': compressed_entries,
+            'stored_bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'compression_ratio': round(ratio, 2),
+            'compress_cpu_seconds': round(self._compress_seconds, 6),
+            'decompress_cpu_seconds': round(self._decompress_seconds, 6),
+            'evictions': self._evictions
+        }
+
+    def _entry_ttl(self, key: str, value: Any, now: float, ttl: Optional[float]) -> float:
+        """Resolve an entry's TTL from the override, policy and default."""
+        if ttl is None and self.ttl_policy is not None:
+            ttl = self.ttl_policy(key, value, now)
+        if ttl is None:
+            ttl = self.ttl
+        return ttl
+
+    def _revalidatable(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an expired entry is still kept for revalidation."""
+        return self.keep_stale and self.clock() < entry['expires_at'] + self.stale_ttl
+
+    def _sweep_stale(self, now: float) -> None:
+        """Drop expired entries past ``stale_ttl`` (with the lock held)."""
+        cutoff = now - self.stale_ttl
+        for key in [key for key, entry in self.cache.items() if entry['expires_at'] <= cutoff]:
+            self._remove(key)
+        self._next_stale_sweep = now + self.stale_ttl
+
+    def _remove(self, key: str, notify: bool = True) -> None:
+        """Delete an entry and release its accounted bytes."""
+        entry = self.cache.pop(key)
+        self._total_bytes -= entry.get('size', 0)
+        if notify:
+            self._notify(key, None)
+
+    def _notify(self, key: str, value: Optional[Any]) -> None:
+        """Call registered listeners (with the lock held)."""
+        for listener in self._listeners:
+            listener(key, value)
+
+    def _evict_to_capacity(self) -> None:
+        """Evict oldest entries until the byte capacity is respected."""
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes and self.cache:
+            self._remove(next(iter(self.cache)))
+            self._evictions += 1
+
+    def _encode(self, entry: Dict[str, Any]) -> None:
+        """Size an entry and compress it when it crosses the threshold."""
+        value = entry['data']
+        try:
+            raw = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError):
+            # Not JSON data (e.g. compact records, forecasts); store as-is
+            entry['size'] = _value_size(value)
+            return
+
+        entry['size'] = len(raw)
+        if self.compress_threshold is None or len(raw) < self.compress_threshold:
+            return
+
+        started = time.thread_time()
+        if self.compression == 'lzma':
+            import lzma
+            packed = lzma.compress(raw)
+        else:
+            packed = zlib.compress(raw)
+        self._compress_seconds += time.thread_time() - started
+
+        if len(packed) >= len(raw):
+            return
+        self._raw_bytes += len(raw)
+        self._compressed_bytes += len(packed)
+        entry.update(data=packed, codec=self.compression, size=len(packed))
+
+    def _decompress(self, entry: Dict[str, Any]) -> Any:
+        """Decode a compressed entry back into its original value."""
+        started = time.thread_time()
+        if entry['codec'] == 'lzma':
+            import lzma
+            raw = lzma.decompress(entry['data'])
+        else:
+            raw = zlib.decompress(entry['data'])
+        value = json.loads(raw)
+        self._decompress_seconds += time.thread_time() - started
+        return value
+
+
+def _value_size(value: Any) -> int:
+    """Approximate the stored size of a value that is not JSON data.
+
+    Values exposing ``nbytes`` (``HourlyForecast``, NumPy arrays) are sized
+    from their buffers; ``sys.getsizeof`` would only count the wrapper.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
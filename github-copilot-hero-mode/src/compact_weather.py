@@ -0,0 +1,135 @@
+"""Compact storage for cached weather payloads.
+
+This module packs the handful of numeric ``current_weather`` fields callers
+actually use into a single bytes value, instead of keeping the full nested
+``response.json()`` dict alive in the cache.
+"""
+
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+# latitude, longitude, temperature, windspeed, winddirection (doubles),
+# time (epoch seconds), interval, utc_offset_seconds, weathercode, is_day
+_LAYOUT = struct.Struct("<5dqiihb")
+_MISSING_INT = -1
+_TIME_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+class CompactWeather:
+    """Struct-packed record for one cached ``current_weather`` response.
+
+    Fields are unpacked on access and the dict API is rebuilt only when
+    ``to_dict()`` is called, so an idle cache entry costs one small bytes
+    object instead of a tree of dicts and strings.
+    """
+
+    __slots__ = ('_packed',)
+
+    def __init__(self, packed: bytes):
+        """Wrap an already packed record.
+
+        Args:
+            packed: Bytes produced by ``CompactWeather.from_response``.
+        """
+        self._packed = packed
+
+    @classmethod
+    def from_response(cls, data: Any) -> Optional["CompactWeather"]:
+        """Pack an Open-Meteo response, if it has the expected shape.
+
+        Args:
+            data: Weather payload as returned by the API.
+
+        Returns:
+            CompactWeather record, or None if the payload has no parseable
+            ``current_weather`` block and must be cached as-is.
+        """
+        if not isinstance(data, dict):
+            return None
+        current = data.get('current_weather')
+        if not isinstance(current, dict) or not isinstance(current.get('time'), str):
+            return None
+
+        offset = data.get('utc_offset_seconds', 0) or 0
+        try:
+            local = datetime.strptime(current['time'], _TIME_FORMAT)
+            packed = _LAYOUT.pack(
+                _float(data.get('latitude')),
+                _float(data.get('longitude')),
+                _float(current.get('temperature')),
+                _float(current.get('windspeed')),
+                _float(current.get('winddirection')),
+                int(local.replace(tzinfo=timezone.utc).timestamp()) - offset,
+                _int(current.get('interval')),
+                offset,
+                _int(current.get('weathercode')),
+                _int(current.get('is_day')),
+            )
+        except (ValueError, TypeError, struct.error):
+            return None
+        return cls(packed)
+
+    @property
+    def upstream_timestamp(self) -> float:
+        """Unix timestamp of the upstream ``current_weather`` interval."""
+        return float(_LAYOUT.unpack(self._packed)[5])
+
+    @property
+    def interval(self) -> Optional[int]:
+        """Upstream update interval in seconds, if reported."""
+        value = _LAYOUT.unpack(self._packed)[6]
+        return None if value == _MISSING_INT else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the dict API for this record.
+
+        Returns:
+            dict: Weather data shaped like the Open-Meteo response, limited
+            to the compacted fields.
+        """
+        (latitude, longitude, temperature, windspeed, winddirection,
+         timestamp, interval, offset, weathercode, is_day) = _LAYOUT.unpack(self._packed)
+
+        local = datetime(1970, 1, 1) + timedelta(seconds=timestamp + offset)
+        current = {'time': local.strftime(_TIME_FORMAT)}
+        _put(current, 'interval', interval)
+        _put(current, 'temperature', temperature)
+        _put(current, 'windspeed', windspeed)
+        _put(current, 'winddirection', winddirection, integral=True)
+        _put(current, 'is_day', is_day)
+        _put(current, 'weathercode', weathercode)
+
+        data = {'utc_offset_seconds': offset, 'current_weather': current}
+        _put(data, 'latitude', latitude)
+        _put(data, 'longitude', longitude)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, CompactWeather) and other._packed == self._packed
+
+    def __repr__(self) -> str:
+        return f"CompactWeather({self.to_dict()!r})"
+
+
+def _float(value: Any) -> float:
+    """Convert an optional number to float, using NaN for missing values."""
+    return math.nan if value is None else float(value)
+
+
+def _int(value: Any) -> int:
+    """Convert an optional integer, using a sentinel for missing values."""
+    return _MISSING_INT if value is None else int(value)
+
+
+def _put(target: dict, key: str, value: Any, integral: bool = False) -> None:
+    """Store an unpacked value unless it is the missing-value marker."""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return
+        if integral and value.is_integer():
+            value = int(value)
+    elif value == _MISSING_INT:
+        return
+    target[key] = value
@@ -0,0 +1,275 @@
+"""Hourly forecast time series for the Weather Service.
+
+This module stores Open-Meteo hourly forecasts as compact typed columns
+(``array('f')``, or NumPy arrays when available) and provides slicing and
+window aggregation helpers that never build per-hour Python dicts.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+_numpy_module = None
+_numpy_checked = False
+
+
+def _numpy():
+    """Return the NumPy module if installed, importing it on first use."""
+    global _numpy_module, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = None
+        _numpy_checked = True
+    return _numpy_module
+
+
+class HourlyForecast:
+    """Column-oriented hourly forecast for one location.
+
+    ``times`` holds Unix timestamps and each variable is a float32 column of
+    the same length. Columns are NumPy arrays when NumPy is available and
+    ``array('f')`` otherwise; both support ``len``, indexing and slicing.
+    """
+
+    __slots__ = ('times', 'columns', 'latitude', 'longitude')
+
+    def __init__(self, times: Any, columns: Dict[str, Any],
+                 latitude: Optional[float] = None, longitude: Optional[float] = None):
+        """Initialize a forecast from prebuilt columns.
+
+        Args:
+            times: Unix timestamps, one per hour.
+            columns: Mapping of variable name to value column.
+            latitude: Location latitude, if known.
+            longitude: Location longitude, if known.
+        """
+        for name, column in columns.items():
+            if len(column) != len(times):
+                raise ValueError(f"Column {name} does not match the time axis")
+        self.times = times
+        self.columns = columns
+        self.latitude = latitude
+        self.longitude = longitude
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any], use_numpy: Optional[bool] = None) -> "HourlyForecast":
+        """Parse an Open-Meteo hourly response into typed columns.
+
+        Args:
+            data: Forecast payload requested with ``timeformat=unixtime``.
+            use_numpy: Force (True) or disable (False) NumPy columns. By
+                default NumPy is used when it is installed.
+
+        Returns:
+            HourlyForecast with one column per hourly variable.
+
+        Raises:
+            ValueError: If the payload has no hourly time axis.
+        """
+        hourly = data.get('hourly') if isinstance(data, dict) else None
+        if not isinstance(hourly, dict) or 'time' not in hourly:
+            raise ValueError("Forecast response has no hourly data")
+
+        np = _numpy() if use_numpy is not False else None
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+
+        raw_times = hourly['time']
+        columns = {
+            name: _float_column(values, np)
+            for name, values in hourly.items() if name != 'time'
+        }
+        times = np.asarray(raw_times, dtype=np.int64) if np is not None else array('q', raw_times)
+        return cls(times, columns, data.get('latitude'), data.get('longitude'))
+
+    @property
+    def variables(self) -> Sequence[str]:
+        """Names of the forecast variables."""
+        return tuple(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the time axis and value column buffers."""
+        return sum(_column_nbytes(column) for column in (self.times, *self.columns.values()))
+
+    def column(self, variable: str) -> Any:
+        """Return the value column for a variable.
+
+        Raises:
+            KeyError: If the variable was not requested.
+        """
+        try:
+            return self.columns[variable]
+        except KeyError:
+            raise KeyError(f"Variable not in forecast: {variable}") from None
+
+    def covers(self, variables: Iterable[str], hours: int) -> bool:
+        """Check whether this forecast can answer a narrower request."""
+        return len(self) >= hours and all(name in self.columns for name in variables)
+
+    def select(self, variables: Optional[Iterable[str]] = None,
+               start: int = 0, stop: Optional[int] = None) -> "HourlyForecast":
+        """Return a forecast restricted to some variables and hours.
+
+        Args:
+            variables: Variables to keep (default: all).
+            start: First hour index to keep.
+            stop: Hour index to stop before (default: end).
+
+        Returns:
+            HourlyForecast built from array slices of this one.
+        """
+        names = self.columns if variables is None else variables
+        return HourlyForecast(
+            self.times[start:stop],
+            {name: self.column(name)[start:stop] for name in names},
+            self.latitude, self.longitude
+        )
+
+    def between(self, start_time: float, end_time: float) -> "HourlyForecast":
+        """Return the hours with ``start_time <= time < end_time``.
+
+        Args:
+            start_time: Inclusive Unix timestamp.
+            end_time: Exclusive Unix timestamp.
+        """
+        start = bisect_left(self.times, start_time)
+        stop = bisect_left(self.times, end_time)
+        return self.select(start=start, stop=stop)
+
+    def window_min(self, variable: str, start: int = 0, stop: Optional[int] = None) -> float:
+        """Minimum of a variable over an hour range (NaN-aware)."""
+        return _reduce(self.column(variable)[start:stop], 'min')
+
+    def window_max(self, variable: str, start: int = 0, stop: Optional[int] = None) -> float:
+        """Maximum of a variable over an hour range (NaN-aware)."""
+        return _reduce(self.column(variable)[start:stop], 'max')
+
+    def window_mean(self, variable: str, start: int = 0, stop: Optional[int] = None) -> float:
+        """Mean of a variable over an hour range (NaN-aware)."""
+        return _reduce(self.column(variable)[start:stop], 'mean')
+
+    def rolling(self, variable: str, size: int, how: str = 'mean') -> Any:
+        """Compute a trailing rolling window aggregate for a variable.
+
+        Args:
+            variable: Variable to aggregate.
+            size: Window length in hours.
+            how: 'min', 'max' or 'mean'.
+
+        Returns:
+            Column of ``len(self) - size + 1`` aggregates, where element i
+            covers hours ``i .. i + size - 1``. Missing (NaN) hours are
+            skipped as in the ``window_*`` helpers; a window with no
+            values is NaN.
+        """
+        if size <= 0:
+            raise ValueError("Window size must be positive")
+        if how not in ('min', 'max', 'mean'):
+            raise ValueError(f"Unsupported aggregation: {how}")
+
+        values = self.column(variable)
+        if size > len(values):
+            return values[:0]
+
+        np = _numpy()
+        if np is not None and isinstance(values, np.ndarray):
+            return _rolling_numpy(np, values, size, how)
+        if how == 'mean':
+            return _rolling_mean(values, size)
+        return _rolling_extreme(values, size, how)
+
+
+def _float_column(values: Sequence[Optional[float]], np) -> Any:
+    """Build a float32 column, mapping JSON nulls to NaN."""
+    if None in values:
+        values = [math.nan if value is None else value for value in values]
+    if np is not None:
+        return np.asarray(values, dtype=np.float32)
+    return array('f', values)
+
+
+def _column_nbytes(column: Any) -> int:
+    """Buffer size of a NumPy or ``array`` column."""
+    nbytes = getattr(column, 'nbytes', None)
+    if nbytes is None:
+        nbytes = column.itemsize * len(column)
+    return int(nbytes)
+
+
+def _reduce(values: Any, how: str) -> float:
+    """Reduce a column slice, ignoring NaN values."""
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        if values.size == 0 or np.isnan(values).all():
+            return math.nan
+        return float(getattr(np, 'nan' + how)(values))
+
+    present = [value for value in values if value == value]
+    if not present:
+        return math.nan
+    if how == 'min':
+        return min(present)
+    if how == 'max':
+        return max(present)
+    return math.fsum(present) / len(present)
+
+
+def _rolling_numpy(np, values: Any, size: int, how: str) -> Any:
+    """Rolling aggregate of a NumPy column, ignoring NaN values."""
+    missing = np.isnan(values)
+    counts = np.lib.stride_tricks.sliding_window_view(~missing, size).sum(axis=1)
+    if how == 'mean':
+        windows = np.lib.stride_tricks.sliding_window_view(values, size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.nansum(windows, axis=1) / counts
+    else:
+        # Missing hours never win: +inf for min, -inf for max
+        filled = np.where(missing, np.inf if how == 'min' else -np.inf, values)
+        result = getattr(np.lib.stride_tricks.sliding_window_view(filled, size), how)(axis=1)
+        result[counts == 0] = np.nan
+    return result.astype(np.float32)
+
+
+def _rolling_mean(values: array, size: int) -> array:
+    """Rolling mean using a running sum and count of present values (O(n))."""
+    result = array('f')
+    total = 0.0
+    count = 0
+    for index, value in enumerate(values):
+        if value == value:
+            total += value
+            count += 1
+        if index >= size:
+            old = values[index - size]
+            if old == old:
+                total -= old
+                count -= 1
+        if index >= size - 1:
+            result.append(total / count if count else math.nan)
+    return result
+
+
+def _rolling_extreme(values: array, size: int, how: str) -> array:
+    """Rolling min/max using a monotonic deque of present values (O(n))."""
+    better = (lambda a, b: a <= b) if how == 'min' else (lambda a, b: a >= b)
+    result = array('f')
+    window = deque()
+    for index, value in enumerate(values):
+        if value == value:
+            while window and better(value, values[window[-1]]):
+                window.pop()
+            window.append(index)
+        if window and window[0] <= index - size:
+            window.popleft()
+        if index >= size - 1:
+            result.append(values[window[0]] if window else math.nan)
+    return result
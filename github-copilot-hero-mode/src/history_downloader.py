@@ -0,0 +1,250 @@
+"""Bulk historical weather ingestion into a ``ColumnarArchive``.
+
+Splits locations and a date range into chunks (one location, up to
+``chunk_days`` days each), fetches them from the Open-Meteo archive API
+with a bounded thread pool, writes each finished chunk to the archive from
+a single thread, and records it in an append-only checkpoint file so an
+interrupted backfill resumes where it stopped.
+
+Usage:
+    python -m src.history_downloader --locations locations.txt --archive data/archive \\
+        --start 2020-01-01 --end 2023-12-31 --variables temperature_2m,wind_speed_10m \\
+        [--workers 8] [--chunk-days 92]
+
+The locations file holds one ``name,latitude,longitude`` per line.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .api_client import APIClient
+from .archive import ColumnarArchive
+from .forecast import HourlyForecast
+
+
+class Chunk(NamedTuple):
+    """One unit of download work: a location over a date range."""
+
+    location: str
+    latitude: float
+    longitude: float
+    start_date: str
+    end_date: str
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used in the checkpoint file."""
+        return f"{self.location}|{self.start_date}|{self.end_date}"
+
+
+def plan_chunks(locations: Mapping[str, Tuple[float, float]], start_date: str,
+                end_date: str, chunk_days: int = 92) -> List[Chunk]:
+    """Split locations and an inclusive date range into download chunks.
+
+    Args:
+        locations: Location id to (latitude, longitude).
+        start_date: First day, ISO format.
+        end_date: Last day (inclusive), ISO format.
+        chunk_days: Maximum days per chunk.
+
+    Returns:
+        list: Chunks ordered by date, then location, so early progress
+        covers every location.
+
+    Raises:
+        ValueError: If the dates are invalid or out of order.
+    """
+    if chunk_days <= 0:
+        raise ValueError("Chunk size must be positive")
+    first, last = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if last < first:
+        raise ValueError("End date is before start date")
+
+    chunks = []
+    chunk_start = first
+    while chunk_start <= last:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), last)
+        for name, (latitude, longitude) in locations.items():
+            chunks.append(Chunk(name, latitude, longitude,
+                                chunk_start.isoformat(), chunk_end.isoformat()))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class Checkpoint:
+    """Append-only record of completed chunk keys."""
+
+    def __init__(self, path: str):
+        """Load completed keys from ``path`` if it exists."""
+        self.path = path
+        self.completed: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.completed = {line.strip() for line in file if line.strip()}
+
+    def __contains__(self, chunk: Chunk) -> bool:
+        return chunk.key in self.completed
+
+    def mark(self, chunk: Chunk) -> None:
+        """Record a chunk as done (flushed immediately)."""
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(chunk.key + "\n")
+        self.completed.add(chunk.key)
+
+
+class HistoryDownloader:
+    """Fetches chunks in parallel and appends them to an archive."""
+
+    def __init__(self, archive: ColumnarArchive, client: Optional[APIClient] = None,
+                 workers: int = 4, checkpoint: Optional[Checkpoint] = None,
+                 retries: int = 2, backoff: float = 1.0):
+        """Initialize the downloader.
+
+        Args:
+            archive: Destination archive; its variables are requested.
+            client: API client (default: a new APIClient).
+            workers: Maximum concurrent requests.
+            checkpoint: Optional checkpoint; completed chunks are skipped.
+            retries: Extra attempts per chunk after a failed request.
+            backoff: Seconds to wait before the first retry; doubles after
+                each further failure.
+        """
+        if workers <= 0:
+            raise ValueError("Workers must be positive")
+        self.archive = archive
+        self.client = client if client is not None else APIClient()
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.retries = retries
+        self.backoff = backoff
+
+    def run(self, chunks: Iterable[Chunk],
+            progress: Optional[Callable[[Chunk, Optional[Exception]], None]] = None) -> Dict[str, int]:
+        """Download chunks and append them to the archive.
+
+        At most ``2 * workers`` chunks are in flight, so memory stays
+        bounded however many chunks are planned. Failed chunks are not
+        checkpointed and are retried on the next run.
+
+        Args:
+            chunks: Chunks to download.
+            progress: Optional callback invoked with each finished chunk and
+                the exception it failed with (None on success).
+
+        Returns:
+            dict: Counts of completed, skipped and failed chunks and rows
+            appended.
+        """
+        summary = {'completed': 0, 'skipped': 0, 'failed': 0, 'rows': 0}
+        pending = iter(chunks)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                while len(in_flight) < 2 * self.workers:
+                    chunk = next(pending, None)
+                    if chunk is None:
+                        break
+                    if self.checkpoint is not None and chunk in self.checkpoint:
+                        summary['skipped'] += 1
+                        continue
+                    in_flight[pool.submit(self._fetch, chunk)] = chunk
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                finished = [(in_flight.pop(future), future) for future in done]
+                fetched = [(chunk, future.result()) for chunk, future in finished
+                           if future.exception() is None]
+                # Single writer: archive appends happen on this thread, one
+                # index rewrite per batch of finished chunks
+                summary['rows'] += self.archive.append_many(
+                    (chunk.location, forecast) for chunk, forecast in fetched)
+                for chunk, future in finished:
+                    error = future.exception()
+                    if error is None:
+                        if self.checkpoint is not None:
+                            self.checkpoint.mark(chunk)
+                        summary['completed'] += 1
+                    else:
+                        summary['failed'] += 1
+                    if progress is not None:
+                        progress(chunk, error)
+        return summary
+
+    def _fetch(self, chunk: Chunk) -> HourlyForecast:
+        """Fetch and parse one chunk, retrying with exponential backoff."""
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                data = self.client.fetch_history(chunk.latitude, chunk.longitude, chunk.start_date,
+                                                 chunk.end_date, self.archive.variables)
+                return HourlyForecast.from_response(data, use_numpy=False)
+            except ValueError:
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+
+def load_locations(path: str) -> Dict[str, Tuple[float, float]]:
+    """Read ``name,latitude,longitude`` lines; blank and # lines are skipped.
+
+    Raises:
+        ValueError: If a line is malformed.
+    """
+    locations = {}
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                name, latitude, longitude = (part.strip() for part in line.rsplit(',', 2))
+                locations[name] = (float(latitude), float(longitude))
+            except ValueError:
+                raise ValueError(f"{path}:{number}: expected name,latitude,longitude") from None
+    return locations
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill historical weather into a columnar archive.")
+    parser.add_argument('--locations', required=True, help="File of name,latitude,longitude lines")
+    parser.add_argument('--archive', required=True, help="Archive directory")
+    parser.add_argument('--start', required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument('--end', required=True, help="Last day, inclusive (YYYY-MM-DD)")
+    parser.add_argument('--variables', default="temperature_2m",
+                        help="Comma-separated hourly variables")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--chunk-days', type=int, default=92)
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <archive>/checkpoint.txt)")
+    args = parser.parse_args(argv)
+
+    archive = ColumnarArchive(args.archive, args.variables.split(','))
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(args.archive, "checkpoint.txt"))
+    chunks = plan_chunks(load_locations(args.locations), args.start, args.end, args.chunk_days)
+    downloader = HistoryDownloader(archive, workers=args.workers, checkpoint=checkpoint)
+
+    finished = [0]
+
+    def report(chunk: Chunk, error: Optional[Exception]) -> None:
+        finished[0] += 1
+        status = "ok" if error is None else f"failed: {error}"
+        print(f"[{finished[0]}/{len(chunks)}] {chunk.key} {status}")
+
+    started = time.perf_counter()
+    with archive:
+        summary = downloader.run(chunks, report)
+    print(f"Completed {summary['completed']}, skipped {summary['skipped']}, "
+          f"failed {summary['failed']} chunks; {summary['rows']} rows "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Asyncio HTTP front-end for the Weather Service.
+
+This module serves ``GET /weather?city=...`` from one shared
+``WeatherService`` so that several consuming services share one cache.
+Cache hits are answered with pre-serialized response bytes (no
+``json.dumps`` per request) while the cache entry's version is unchanged,
+with ETag / ``If-None-Match`` support and
+HTTP/1.1 keep-alive. Cache misses run the blocking upstream fetch in a
+worker thread, and concurrent misses for the same city share one fetch.
+
+Usage:
+    python -m src.http_server [--host 127.0.0.1] [--port 8080] [--cache-ttl 600] [--prewarm]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .compact_weather import CompactWeather
+from .units import CANONICAL_TEMPERATURE_UNIT, CANONICAL_WINDSPEED_UNIT, convert_weather, validate_units
+from .weather_service import WeatherService
+
+MAX_HEADER_BYTES = 65536
+
+_REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 502: "Bad Gateway"
+}
+
+
+class _Rendered:
+    """Pre-serialized response for one version of a cached entry."""
+
+    __slots__ = ('version', 'etag', 'response', 'not_modified')
+
+    def __init__(self, version: Optional[int], body: bytes):
+        self.version = version
+        self.etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        self.response = _build_response(200, body, self.etag)
+        self.not_modified = _build_response(304, b"", self.etag)
+
+
+class WeatherHTTPServer:
+    """Minimal HTTP/1.1 server in front of a shared WeatherService."""
+
+    def __init__(self, service: Optional[WeatherService] = None,
+                 host: str = "127.0.0.1", port: int = 8080):
+        """Initialize the server.
+
+        Args:
+            service: Shared weather service (default: a new WeatherService).
+            host: Interface to bind (default: loopback only).
+            port: Port to bind; 0 picks a free port.
+        """
+        self.service = service if service is not None else WeatherService()
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        # city key -> (temperature unit, windspeed unit) -> pre-serialized
+        # response; dropped when the cache replaces or removes the entry
+        self._rendered: Dict[str, Dict[Tuple[str, str], _Rendered]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.service.cache.add_listener(self._forget_rendered)
+
+    async def start(self) -> None:
+        """Bind the listening socket; ``port`` is updated if it was 0."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                method, target, version, headers = _parse_head(head)
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                response = await self._respond(method, target, headers)
+                keep_alive = _keep_alive(version, headers)
+                if not keep_alive:
+                    response = response.replace(b"Connection: keep-alive", b"Connection: close", 1)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: Dict[str, str]) -> bytes:
+        """Build the full response bytes for one request."""
+        if method not in ('GET', 'HEAD'):
+            return _error(405, "Method not allowed")
+        url = urlsplit(target)
+        if url.path != '/weather':
+            return _error(404, "Not found")
+
+        query = parse_qs(url.query)
+        city = query.get('city', [''])[0]
+        temperature_unit = query.get('temperature_unit', [CANONICAL_TEMPERATURE_UNIT])[0]
+        windspeed_unit = query.get('windspeed_unit', [CANONICAL_WINDSPEED_UNIT])[0]
+        if not city.strip():
+            return _error(400, "Missing city parameter")
+        try:
+            validate_units(temperature_unit, windspeed_unit)
+        except ValueError as e:
+            return _error(400, str(e))
+
+        key = (city.strip().lower(), temperature_unit, windspeed_unit)
+        try:
+            rendered = await self._lookup(key, city)
+        except ValueError as e:
+            return _error(400, str(e))
+        except Exception as e:
+            return _error(502, f"Upstream request failed: {e}")
+
+        if headers.get('if-none-match') == rendered.etag:
+            return rendered.not_modified
+        if method == 'HEAD':
+            return rendered.response.split(b"\r\n\r\n", 1)[0] + b"\r\n\r\n"
+        return rendered.response
+
+    async def _lookup(self, key: Tuple[str, str, str], city: str) -> _Rendered:
+        """Return the rendered response for a request, fetching on a miss."""
+        city_key, units = key[0], key[1:]
+        rendered = self._rendered.get(city_key, {}).get(units)
+        found = self.service.get_cached_weather_version(
+            city, rendered.version if rendered is not None else None)
+        if found is not None:
+            source, version = found
+            if rendered is not None and version == rendered.version:
+                return rendered
+            return self._render(city_key, units, source, version)
+
+        self._rendered.pop(city_key, None)
+        # Share one upstream fetch between concurrent misses for any units
+        pending = self._inflight.get(city_key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(None, self.service.fetch_and_cache_weather, city)
+            self._inflight[city_key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(city_key, None))
+        data = await asyncio.shield(pending)
+        return _Rendered(None, _serialize(convert_weather(data, *units)))
+
+    def _render(self, city_key: str, units: Tuple[str, str], source: Any, version: int) -> _Rendered:
+        """Serialize one version of a cached entry and keep it until it changes."""
+        data = source.to_dict() if isinstance(source, CompactWeather) else source
+        rendered = _Rendered(version, _serialize(convert_weather(data, *units)))
+        self._rendered.setdefault(city_key, {})[units] = rendered
+        return rendered
+
+    def _forget_rendered(self, key: str, value: Any) -> None:
+        """Cache listener: drop responses rendered from a replaced or removed entry."""
+        self._rendered.pop(key, None)
+
+
+def _serialize(data: Any) -> bytes:
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _build_response(status: int, body: bytes, etag: Optional[str] = None) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS[status]}"]
+    if status != 304:
+        lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body)}")
+    if etag is not None:
+        lines.append(f"ETag: {etag}")
+    lines.append("Connection: keep-alive")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+
+def _error(status: int, message: str) -> bytes:
+    return _build_response(status, _serialize({'error': message}))
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    """Parse the request line and headers.
+
+    Raises:
+        ValueError: If the request line is malformed.
+    """
+    lines = head.decode('latin-1').split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == "HTTP/1.0":
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve WeatherService over HTTP.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cache-ttl', type=int, default=600)
+    parser.add_argument('--prewarm', action='store_true',
+                        help="Open the upstream connection before serving")
+    args = parser.parse_args()
+
+    service = WeatherService(cache_ttl=args.cache_ttl)
+    if args.prewarm:
+        service.prewarm()
+    server = WeatherHTTPServer(service, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Metrics for the Weather Service.
+
+This module provides low-overhead counters and fixed-bucket latency
+histograms, and renders them in the Prometheus text exposition format.
+Observations go to per-thread shards so the hot path takes no lock; shards
+are only summed when metrics are scraped. When a thread exits its shard is
+folded into a shared retired shard, so short-lived threads do not grow the
+shard list.
+"""
+
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds in seconds; cache lookups land in the low buckets and
+# upstream fetches in the high ones
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001,
+    0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+REQUEST_OUTCOMES = ('hit', 'miss', 'error', 'timeout')
+LOOKUP_OUTCOMES = ('hit', 'miss')
+FETCH_OUTCOMES = ('ok', 'error', 'timeout')
+
+
+class _ThreadToken:
+    """Weak-referenceable marker stored in a thread's locals."""
+
+    __slots__ = ('__weakref__',)
+
+
+class _Sharded(ABC):
+    """Base class keeping one shard of counts per live thread."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._retired: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_shard(self) -> dict:
+        """Return an empty shard for a newly seen thread."""
+
+    @abstractmethod
+    def _fold(self, target: dict, shard: dict) -> None:
+        """Add the counts of ``shard`` into ``target``."""
+
+    def _shard(self) -> dict:
+        """Return this thread's shard, registering it on first use."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            # The token dies with the thread's locals, retiring the shard
+            token = self._local.token = _ThreadToken()
+            weakref.finalize(token, self._retire, shard)
+            return shard
+
+    def _retire(self, shard: dict) -> None:
+        """Fold an exited thread's shard into the retired shard."""
+        with self._lock:
+            if self._retired is None:
+                self._retired = self._new_shard()
+                self._shards.append(self._retired)
+            self._fold(self._retired, shard)
+            # Shards with equal counts compare equal, so match by identity
+            for index, existing in enumerate(self._shards):
+                if existing is shard:
+                    del self._shards[index]
+                    break
+
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Counter(_Sharded):
+    """Monotonic counter with one label dimension."""
+
+    def _new_shard(self) -> dict:
+        return dict.fromkeys(self.labels, 0)
+
+    def _fold(self, target: dict, shard: dict) -> None:
+        for label, count in shard.items():
+            target[label] += count
+
+    def inc(self, label: str, amount: int = 1) -> None:
+        """Increment the counter for a label value."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard[label] += amount
+
+    def value(self, label: str) -> int:
+        """Return the total across all threads for a label value."""
+        return sum(shard[label] for shard in self._snapshot())
+
+    def render(self, label_name: str) -> Iterable[str]:
+        """Yield exposition lines for this counter."""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for label in self.labels:
+            yield f'{self.name}{{{label_name}="{label}"}} {self.value(label)}'
+
+
+class Histogram(_Sharded):
+    """Fixed-bucket histogram with one label dimension."""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_shard(self) -> dict:
+        # Per label: bucket counts (last slot is +Inf) followed by the sum
+        size = len(self.buckets) + 1
+        return {label: [0] * size + [0.0] for label in self.labels}
+
+    def _fold(self, target: dict, shard: dict) -> None:
+        for label, counts in shard.items():
+            merged = target[label]
+            for index, count in enumerate(counts):
+                merged[index] += count
+
+    def observe(self, label: str, value: float) -> None:
+        """Record one observation in seconds."""
+        try:
+            counts = self._local.shard[label]
+        except AttributeError:
+            counts = self._shard()[label]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def summary(self, label: str) -> Dict[str, float]:
+        """Return the count and sum across all threads for a label value."""
+        count = 0
+        total = 0.0
+        for shard in self._snapshot():
+            counts = shard[label]
+            count += sum(counts[:-1])
+            total += counts[-1]
+        return {'count': count, 'sum': total}
+
+    def render(self, label_name: str) -> Iterable[str]:
+        """Yield exposition lines for this histogram."""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        shards = self._snapshot()
+        for label in self.labels:
+            merged = [0] * (len(self.buckets) + 1)
+            total = 0.0
+            for shard in shards:
+                counts = shard[label]
+                for index in range(len(merged)):
+                    merged[index] += counts[index]
+                total += counts[-1]
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), merged):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket{{{label_name}="{label}",le="{le}"}} {cumulative}'
+            yield f'{self.name}_sum{{{label_name}="{label}"}} {total!r}'
+            yield f'{self.name}_count{{{label_name}="{label}"}} {cumulative}'
+
+
+class WeatherMetrics:
+    """Metrics for the weather request path."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize request counters and latency histograms.
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds.
+        """
+        # Hits are counted by the cache_lookup histogram to keep the hit
+        # path to a single observation
+        self.requests = Counter(
+            'weather_requests_total', "Weather requests by outcome.", REQUEST_OUTCOMES[1:])
+        self.cache_lookup = Histogram(
+            'weather_cache_lookup_seconds', "Cache lookup latency by outcome.",
+            LOOKUP_OUTCOMES, buckets)
+        self.upstream_fetch = Histogram(
+            'weather_upstream_fetch_seconds', "Upstream fetch latency by outcome.",
+            FETCH_OUTCOMES, buckets)
+
+    def record_lookup(self, hit: bool, seconds: float) -> None:
+        """Record a cache lookup; hits also count as completed requests."""
+        self.cache_lookup.observe('hit' if hit else 'miss', seconds)
+
+    def record_fetch(self, outcome: str, seconds: float) -> None:
+        """Record an upstream fetch and the request outcome it implies.
+
+        Args:
+            outcome: 'ok', 'error' or 'timeout'.
+            seconds: Fetch duration.
+        """
+        self.upstream_fetch.observe(outcome, seconds)
+        self.requests.inc('miss' if outcome == 'ok' else outcome)
+
+    def request_count(self, outcome: str) -> int:
+        """Return the number of requests that ended with an outcome."""
+        if outcome == 'hit':
+            return self.cache_lookup.summary('hit')['count']
+        return self.requests.value(outcome)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        name = self.requests.name
+        lines = [f"# HELP {name} {self.requests.help_text}", f"# TYPE {name} counter"]
+        lines.extend(f'{name}{{outcome="{outcome}"}} {self.request_count(outcome)}'
+                     for outcome in REQUEST_OUTCOMES)
+        lines.extend(self.cache_lookup.render('outcome'))
+        lines.extend(self.upstream_fetch.render('outcome'))
+        return "\n".join(lines) + "\n"
+
+
+def fetch_outcome(exc: BaseException) -> str:
+    """Classify a fetch exception as 'timeout' or 'error'.
+
+    Matches by class name so the HTTP library need not be imported here.
+    """
+    for cls in type(exc).__mro__:
+        if cls.__name__ in ('Timeout', 'TimeoutError'):
+            return 'timeout'
+    return 'error'
+
+
+def start_metrics_server(metrics: WeatherMetrics, host: str = "127.0.0.1",
+                         port: int = 9100) -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` in a background thread.
+
+    Args:
+        metrics: Metrics to expose.
+        host: Interface to bind (default: loopback only).
+        port: Port to bind; 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call ``shutdown()`` to stop.
+    """
+    # Imported here so that only processes exposing metrics pay for it
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,355 @@
+"""Record/replay HTTP stand-in for the weather API.
+
+In record mode a local server proxies requests to the real upstream and
+captures each response in a ``FixtureStore``. In replay mode it serves the
+stored responses without any network access, optionally adding latency
+drawn from a distribution, injected errors and rate limiting, so load and
+tail-latency benchmarks run offline and reproducibly (given a seed).
+
+Point ``APIClient`` at the server with the WEATHER_API_BASE_URL
+environment variable, or by setting ``client.base_url``.
+
+Usage:
+    python -m src.replay record --fixtures fixtures.json [--port 8081]
+    python -m src.replay replay --fixtures fixtures.json [--latency lognormal:40:0.5]
+        [--error-rate 0.01] [--rate-limit 50 --burst 10] [--seed 1]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_UPSTREAM = "https://api.open-meteo.com"
+
+# Response headers kept in fixtures
+_STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def fixture_key(path: str, query: str = "") -> str:
+    """Build a fixture key that ignores query parameter order."""
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    return path + ("?" + urlencode(params) if params else "")
+
+
+class FixtureStore:
+    """Recorded responses keyed by request path and query."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the store, loading fixtures from ``path`` if it exists.
+
+        Args:
+            path: JSON file the fixtures are loaded from and saved to.
+        """
+        self.path = path
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, encoding='utf-8') as file:
+                    self.fixtures = json.load(file)
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the fixture for a key: status, headers and body text."""
+        with self._lock:
+            return self.fixtures.get(key)
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """Store a response, replacing any earlier one for the key."""
+        fixture = {
+            'status': status,
+            'headers': {name: headers[name] for name in _STORED_HEADERS if name in headers},
+            'body': body.decode('utf-8')
+        }
+        with self._lock:
+            self.fixtures[key] = fixture
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write all fixtures as JSON to ``path`` (default: the load path)."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No fixture file path given")
+        with self._lock:
+            data = dict(self.fixtures)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+
+    def __len__(self) -> int:
+        return len(self.fixtures)
+
+
+class LatencyModel:
+    """Random response delay drawn from a named distribution.
+
+    Specs are ``kind:param[:param]`` with times in milliseconds:
+    ``fixed:MS``, ``uniform:LOW:HIGH``, ``normal:MEAN:STDDEV`` and
+    ``lognormal:MEDIAN:SIGMA`` (heavy-tailed, like real network latency).
+    """
+
+    _PARAMS = {'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+
+    def __init__(self, spec: str = "fixed:0", seed: Optional[int] = None):
+        """Parse a latency spec.
+
+        Raises:
+            ValueError: If the spec is malformed.
+        """
+        kind, _, rest = spec.partition(':')
+        if kind not in self._PARAMS:
+            raise ValueError(f"Unsupported latency distribution: {kind}")
+        try:
+            params = [float(value) for value in rest.split(':')] if rest else []
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec}") from None
+        if len(params) != self._PARAMS[kind] or any(value < 0 for value in params):
+            raise ValueError(f"Invalid latency spec: {spec}")
+        self.spec = spec
+        self.kind = kind
+        self.params = params
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Draw one delay in seconds (never negative)."""
+        with self._lock:
+            if self.kind == 'fixed':
+                millis = self.params[0]
+            elif self.kind == 'uniform':
+                millis = self._random.uniform(*self.params)
+            elif self.kind == 'normal':
+                millis = self._random.gauss(*self.params)
+            else:
+                median, sigma = self.params
+                millis = median * self._random.lognormvariate(0.0, sigma)
+        return max(millis, 0.0) / 1000
+
+
+class TokenBucket:
+    """Request rate limiter; requests over the limit are throttled."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None,
+                 clock=time.monotonic):
+        """Initialize the bucket.
+
+        Args:
+            rate: Sustained requests per second.
+            burst: Bucket size (default: one second's worth of requests).
+            clock: Monotonic time source.
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take one token; returns False if the request should be throttled."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class ReplayServer:
+    """Local HTTP server recording or replaying upstream responses."""
+
+    def __init__(self, store: FixtureStore, mode: str = 'replay',
+                 upstream: str = DEFAULT_UPSTREAM, latency: Optional[LatencyModel] = None,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 rate_limit: Optional[float] = None, burst: Optional[int] = None,
+                 seed: Optional[int] = None, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the server.
+
+        Args:
+            store: Fixture store to record into or replay from.
+            mode: 'record' to proxy and capture, 'replay' to serve fixtures.
+            upstream: Upstream origin used in record mode.
+            latency: Optional delay model applied to every replayed response.
+            error_rate: Fraction of replayed requests answered with
+                ``error_status`` instead of the fixture.
+            error_status: Status code for injected errors.
+            rate_limit: Optional requests per second; requests over the
+                limit get 429 with a Retry-After header.
+            burst: Token bucket size for ``rate_limit``.
+            seed: Seed for error injection (and the latency model, if it
+                was not given its own), making runs reproducible.
+            host: Interface to bind (default: loopback only).
+            port: Port to bind; 0 picks a free port.
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unsupported mode: {mode}")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("Error rate must be between 0 and 1")
+        self.store = store
+        self.mode = mode
+        self.upstream = upstream.rstrip('/')
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit is not None else None
+        self.counts = dict.fromkeys(('served', 'recorded', 'missing', 'errors', 'throttled'), 0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server, e.g. ``http://127.0.0.1:8081``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving and release the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.shutdown()
+
+    def handle(self, target: str, headers: Dict[str, str]):
+        """Produce (status, headers, body) for a GET request target."""
+        url = urlsplit(target)
+        key = fixture_key(url.path, url.query)
+
+        if self.mode == 'record':
+            status, response_headers, body = self._proxy(target)
+            self.store.put(key, status, response_headers, body)
+            self._count('recorded')
+            return status, response_headers, body
+
+        if self.limiter is not None and not self.limiter.acquire():
+            self._count('throttled')
+            return 429, {'Retry-After': '1'}, _error_body("Too many requests")
+        if self.latency is not None:
+            time.sleep(self.latency.sample())
+        if self.error_rate:
+            with self._lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                self._count('errors')
+                return self.error_status, {}, _error_body("Injected error")
+
+        fixture = self.store.get(key)
+        if fixture is None:
+            self._count('missing')
+            return 404, {}, _error_body(f"No fixture for {key}")
+
+        body = fixture['body'].encode('utf-8')
+        response_headers = dict(fixture['headers'])
+        etag = response_headers.setdefault(
+            'ETag', '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"')
+        self._count('served')
+        if headers.get('if-none-match') == etag:
+            return 304, {'ETag': etag}, b""
+        return fixture['status'], response_headers, body
+
+    def _proxy(self, target: str):
+        """Forward a request upstream and return its response."""
+        request = urllib.request.Request(self.upstream + target, headers={'Accept': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _handler_class(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                headers = {name.lower(): value for name, value in self.headers.items()}
+                status, response_headers, body = server.handle(self.path, headers)
+                self.send_response(status)
+                response_headers.setdefault('Content-Type', 'application/json')
+                for name, value in response_headers.items():
+                    if name.lower() not in ('content-length', 'transfer-encoding', 'connection'):
+                        self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ReplayHandler
+
+
+def _error_body(reason: str) -> bytes:
+    """Error payload in Open-Meteo's format."""
+    return json.dumps({'error': True, 'reason': reason}).encode('utf-8')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record or replay weather API responses.")
+    parser.add_argument('mode', choices=('record', 'replay'))
+    parser.add_argument('--fixtures', required=True, help="Fixture JSON file")
+    parser.add_argument('--upstream', default=DEFAULT_UPSTREAM)
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', default="fixed:0", help="e.g. lognormal:40:0.5 (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--rate-limit', type=float, default=None, help="Requests per second")
+    parser.add_argument('--burst', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    server = ReplayServer(
+        store, args.mode, upstream=args.upstream,
+        latency=LatencyModel(args.latency, args.seed), error_rate=args.error_rate,
+        error_status=args.error_status, rate_limit=args.rate_limit, burst=args.burst,
+        seed=args.seed, host=args.host, port=args.port)
+    print(f"{args.mode.capitalize()}ing on {server.url}/v1/forecast "
+          f"(set WEATHER_API_BASE_URL={server.url}/v1/forecast)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        if args.mode == 'record':
+            store.save()
+            print(f"Saved {len(store)} fixtures to {args.fixtures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Span-based tracing for the Weather Service.
+
+This module records nested timing spans for the weather request path and
+exports them as Chrome trace-event JSON (viewable in chrome://tracing or
+Perfetto). Components default to ``NULL_TRACER``, whose spans are a shared
+no-op object, and skip span creation entirely when tracing is disabled.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class _Span:
+    """Context manager timing one span."""
+
+    __slots__ = ('_tracer', '_name', '_args', '_start')
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self._args['error'] = exc_type.__name__
+        self._tracer._record(self._name, self._start, end, self._args)
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullTracer:
+    """Tracer that records nothing."""
+
+    enabled = False
+
+    def span(self, name: str, **args: Any) -> _NullSpan:
+        """Return the shared no-op span."""
+        return _NULL_SPAN
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Collects spans as Chrome trace "complete" events."""
+
+    enabled = True
+
+    def __init__(self, on_span: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_events: int = 100_000):
+        """Initialize the tracer.
+
+        Args:
+            on_span: Optional callback invoked with each finished event.
+            max_events: Events kept in memory; older events are dropped.
+        """
+        self.on_span = on_span
+        self.max_events = max_events
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def span(self, name: str, **args: Any) -> _Span:
+        """Create a span; use as ``with tracer.span("name", key=value):``.
+
+        Spans opened inside another span on the same thread nest under it.
+        """
+        return _Span(self, name, args)
+
+    def _record(self, name: str, start_ns: int, end_ns: int, args: Dict[str, Any]) -> None:
+        event = {
+            'name': name,
+            'ph': 'X',
+            'ts': start_ns / 1000,
+            'dur': (end_ns - start_ns) / 1000,
+            'pid': self._pid,
+            'tid': threading.get_ident(),
+            'args': args
+        }
+        with self._lock:
+            self.events.append(event)
+            if len(self.events) > self.max_events:
+                del self.events[:len(self.events) - self.max_events]
+        if self.on_span is not None:
+            self.on_span(event)
+
+    def clear(self) -> None:
+        """Drop all recorded events."""
+        with self._lock:
+            self.events.clear()
+
+    def export_chrome_trace(self) -> Dict[str, Any]:
+        """Return recorded spans in Chrome trace-event format."""
+        with self._lock:
+            events = list(self.events)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write recorded spans to a Chrome trace-event JSON file."""
+        with open(path, 'w') as file:
+            json.dump(self.export_chrome_trace(), file, default=str)
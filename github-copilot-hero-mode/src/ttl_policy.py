@@ -0,0 +1,124 @@
+"""TTL policies for the Weather Service cache.
+
+This module computes per-entry cache lifetimes from the upstream data itself
+instead of using a single fixed TTL.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+class UpstreamAlignedTTL:
+    """Expire weather entries right after Open-Meteo publishes new data.
+
+    Open-Meteo refreshes ``current_weather`` at fixed model intervals and
+    reports the start of the current interval in the ``time`` field. An
+    entry therefore stays valid until ``time + interval`` (plus a small grace
+    period for upstream publishing delay) and never longer.
+    """
+
+    def __init__(self, interval: int = 900, grace: int = 30,
+                 min_ttl: int = 30, max_ttl: int = 3600):
+        """Initialize the policy.
+
+        Args:
+            interval: Upstream update cadence in seconds, used when the
+                response does not report its own ``interval`` (default: 900).
+            grace: Seconds to wait past the next update before refetching.
+            min_ttl: Lower bound for any computed TTL, so lagging upstream
+                data is not refetched in a tight loop.
+            max_ttl: Upper bound for any computed TTL.
+        """
+        if interval <= 0:
+            raise ValueError("Interval must be positive")
+        if grace < 0:
+            raise ValueError("Grace period cannot be negative")
+        if min_ttl <= 0 or max_ttl < min_ttl:
+            raise ValueError("TTL bounds must satisfy 0 < min_ttl <= max_ttl")
+        self.interval = interval
+        self.grace = grace
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+
+    def __call__(self, key: str, value: Any, now: float) -> Optional[float]:
+        """Compute the TTL for a cache entry.
+
+        Args:
+            key: Cache key being stored.
+            value: Weather payload being stored.
+            now: Current time as a Unix timestamp.
+
+        Returns:
+            TTL in seconds, or None to fall back to the cache default.
+        """
+        upstream = upstream_timestamp(value)
+        if upstream is None:
+            return None
+
+        interval = upstream_interval(value) or self.interval
+        ttl = upstream + interval + self.grace - now
+        return min(max(ttl, self.min_ttl), self.max_ttl)
+
+
+def upstream_timestamp(value: Any) -> Optional[float]:
+    """Extract the upstream observation time of a weather payload.
+
+    Args:
+        value: Weather payload as returned by the Open-Meteo API.
+
+    Returns:
+        Unix timestamp of the ``current_weather`` interval, or None if the
+        payload does not carry a parseable ``time`` field.
+    """
+    if hasattr(value, 'upstream_timestamp'):
+        # Compact records keep the parsed timestamp
+        return value.upstream_timestamp
+
+    current = _current_block(value)
+    if not current:
+        return None
+
+    raw_time = current.get('time')
+    if isinstance(raw_time, (int, float)):
+        # timeformat=unixtime responses already carry epoch seconds
+        return float(raw_time)
+    if not isinstance(raw_time, str):
+        return None
+
+    try:
+        parsed = datetime.strptime(raw_time, "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return None
+
+    # Times are local to the requested timezone; GMT unless configured
+    offset = value.get('utc_offset_seconds', 0) or 0
+    return parsed.replace(tzinfo=timezone.utc).timestamp() - offset
+
+
+def upstream_interval(value: Any) -> Optional[int]:
+    """Extract the update interval reported by a weather payload.
+
+    Args:
+        value: Weather payload as returned by the Open-Meteo API.
+
+    Returns:
+        Interval in seconds, or None if not reported.
+    """
+    if hasattr(value, 'upstream_timestamp'):
+        return value.interval
+
+    current = _current_block(value)
+    if not current:
+        return None
+    interval = current.get('interval')
+    if isinstance(interval, (int, float)) and interval > 0:
+        return int(interval)
+    return None
+
+
+def _current_block(value: Any) -> Optional[dict]:
+    """Return the ``current_weather`` block of a payload, if any."""
+    if not isinstance(value, dict):
+        return None
+    current = value.get('current_weather')
+    return current if isinstance(current, dict) else None
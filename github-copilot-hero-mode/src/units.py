@@ -0,0 +1,128 @@
+"""Unit conversion for the Weather Service.
+
+Weather data is always fetched and cached in Open-Meteo's canonical units
+(Celsius and km/h). This module converts it locally at read time, so one
+cache entry serves every unit combination.
+"""
+
+from array import array
+from typing import Any, Dict, Tuple
+
+CANONICAL_TEMPERATURE_UNIT = "celsius"
+CANONICAL_WINDSPEED_UNIT = "kmh"
+
+# unit -> (scale, offset, display symbol), applied as value * scale + offset
+TEMPERATURE_UNITS: Dict[str, Tuple[float, float, str]] = {
+    "celsius": (1.0, 0.0, "°C"),
+    "fahrenheit": (1.8, 32.0, "°F"),
+}
+WINDSPEED_UNITS: Dict[str, Tuple[float, float, str]] = {
+    "kmh": (1.0, 0.0, "km/h"),
+    "ms": (1 / 3.6, 0.0, "m/s"),
+    "mph": (1 / 1.609344, 0.0, "mp/h"),
+    "kn": (1 / 1.852, 0.0, "kn"),
+}
+
+# current_weather fields and hourly variable prefixes affected by each unit
+_TEMPERATURE_FIELDS = ("temperature", "apparent_temperature", "dew_point", "soil_temperature")
+_WINDSPEED_FIELDS = ("windspeed", "wind_speed", "wind_gusts")
+
+
+def validate_units(temperature_unit: str, windspeed_unit: str) -> None:
+    """Validate requested units.
+
+    Raises:
+        ValueError: If either unit is not supported.
+    """
+    if temperature_unit not in TEMPERATURE_UNITS:
+        raise ValueError(f"Unsupported temperature unit: {temperature_unit}")
+    if windspeed_unit not in WINDSPEED_UNITS:
+        raise ValueError(f"Unsupported windspeed unit: {windspeed_unit}")
+
+
+def is_canonical(temperature_unit: str, windspeed_unit: str) -> bool:
+    """Check whether the requested units match the cached canonical units."""
+    return (temperature_unit == CANONICAL_TEMPERATURE_UNIT
+            and windspeed_unit == CANONICAL_WINDSPEED_UNIT)
+
+
+def convert_weather(data: Dict[str, Any], temperature_unit: str, windspeed_unit: str) -> Dict[str, Any]:
+    """Convert a canonical ``current_weather`` payload to other units.
+
+    The input is not modified; converted blocks are shallow copies.
+
+    Args:
+        data: Weather payload in canonical units.
+        temperature_unit: Target temperature unit.
+        windspeed_unit: Target windspeed unit.
+
+    Returns:
+        dict: Payload with converted values and ``current_weather_units``.
+    """
+    if is_canonical(temperature_unit, windspeed_unit) or not isinstance(data, dict):
+        return data
+    current = data.get('current_weather')
+    if not isinstance(current, dict):
+        return data
+
+    converted = dict(current)
+    for field, value in current.items():
+        conversion = _conversion_for(field, temperature_unit, windspeed_unit)
+        if conversion and isinstance(value, (int, float)):
+            scale, offset, _ = conversion
+            converted[field] = round(value * scale + offset, 1)
+
+    result = dict(data)
+    result['current_weather'] = converted
+    units = data.get('current_weather_units')
+    if isinstance(units, dict):
+        result['current_weather_units'] = {
+            field: (_conversion_for(field, temperature_unit, windspeed_unit) or (0, 0, symbol))[2]
+            for field, symbol in units.items()
+        }
+    return result
+
+
+def convert_column(column: Any, scale: float, offset: float = 0.0) -> Any:
+    """Convert a whole value column in one pass.
+
+    Args:
+        column: NumPy array or ``array('f')`` of values.
+        scale: Multiplier applied to every value.
+        offset: Constant added after scaling.
+
+    Returns:
+        Converted column of the same kind.
+    """
+    if isinstance(column, array):
+        return array(column.typecode, [value * scale + offset for value in column])
+    # NumPy arrays broadcast the arithmetic
+    return (column * scale + offset).astype(column.dtype)
+
+
+def forecast_conversions(variables, temperature_unit: str, windspeed_unit: str) -> Dict[str, Tuple[float, float]]:
+    """Map forecast variables to the (scale, offset) needed to convert them.
+
+    Args:
+        variables: Hourly variable names.
+        temperature_unit: Target temperature unit.
+        windspeed_unit: Target windspeed unit.
+
+    Returns:
+        dict: Variable name to (scale, offset) for variables that change.
+    """
+    conversions = {}
+    for name in variables:
+        conversion = _conversion_for(name, temperature_unit, windspeed_unit)
+        if conversion and conversion[:2] != (1.0, 0.0):
+            conversions[name] = conversion[:2]
+    return conversions
+
+
+def _conversion_for(field: str, temperature_unit: str, windspeed_unit: str):
+    """Return the conversion tuple for a field, or None if unit-less."""
+    if field.startswith(_TEMPERATURE_FIELDS):
+        return TEMPERATURE_UNITS[temperature_unit]
+    if field.startswith(_WINDSPEED_FIELDS):
+        return WINDSPEED_UNITS[windspeed_unit]
+    return None
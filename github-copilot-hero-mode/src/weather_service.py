@@ -4,71 +4,394 @@ This module orchestrates weather data retrieval with intelligent caching
 to reduce API calls and improve performance.
 """
 
-from .api_client import APIClient
-from .cache_manager import CacheManager
+from time import perf_counter
+from typing import Dict, FrozenSet, Mapping, Optional, Sequence, Set, Tuple
+
+from .api_client import APIClient, projection_variables
+from .cache_manager import CacheManager, TTLPolicy
+from .compact_weather import CompactWeather
+from .forecast import HourlyForecast
+from .metrics import WeatherMetrics, fetch_outcome
+from .tracing import NULL_TRACER
+from .units import (
+    CANONICAL_TEMPERATURE_UNIT, CANONICAL_WINDSPEED_UNIT,
+    convert_column, convert_weather, forecast_conversions, validate_units
+)
+
+# Open-Meteo serves at most 16 days of hourly data
+MAX_FORECAST_HOURS = 384
 
 
 class WeatherService:
     """Weather service with caching to reduce API calls."""
 
-    def __init__(self, cache_ttl: int = 600):
+    def __init__(self, cache_ttl: int = 600, ttl_policy: Optional[TTLPolicy] = None,
+                 compact: bool = False, compress_threshold: Optional[int] = None,
+                 max_cache_bytes: Optional[int] = None,
+                 metrics: Optional[WeatherMetrics] = None, revalidate: bool = False,
+                 locations: Optional[Mapping[str, Tuple[float, float]]] = None,
+                 tracer=NULL_TRACER):
         """Initialize weather service with API client and cache.
         
         Args:
             cache_ttl: Cache time-to-live in seconds (default: 600 = 10 minutes).
+            ttl_policy: Optional per-entry TTL policy, e.g.
+                ``UpstreamAlignedTTL()`` to expire entries when Open-Meteo
+                publishes new data. ``cache_ttl`` remains the fallback.
+            compact: Cache responses as struct-packed ``CompactWeather``
+                records holding only the ``current_weather`` fields and
+                coordinates. Other response keys are dropped.
+            compress_threshold: Compress cached payloads whose JSON size is
+                at least this many bytes (default: None, no compression).
+            max_cache_bytes: Optional cache capacity in (compressed) bytes.
+            metrics: Optional ``WeatherMetrics`` recording request outcomes
+                and cache lookup / upstream fetch latency histograms.
+            revalidate: Keep expired weather entries with their validators
+                and refetch them with conditional requests. When upstream
+                reports them unchanged (HTTP 304 or identical payload hash),
+                the entry's TTL is extended instead of storing the body
+                again. Expired entries are kept for one more ``cache_ttl``.
+            locations: Optional mapping of city name to (latitude,
+                longitude) passed to the API client.
+            tracer: Optional ``Tracer`` recording nested spans for requests,
+                cache operations and HTTP phases.
         """
-        self.api = APIClient()
-        self.cache = CacheManager(ttl=cache_ttl)
+        self.api = APIClient(tracer=tracer, locations=locations)
+        self.cache = CacheManager(ttl=cache_ttl, ttl_policy=ttl_policy,
+                                  compress_threshold=compress_threshold,
+                                  max_bytes=max_cache_bytes, keep_stale=revalidate,
+                                  tracer=tracer)
+        self.tracer = tracer
+        self.compact = compact
+        self.metrics = metrics
+        self.revalidate = revalidate
+        # city key -> field sets cached as projected entries
+        self._projections: Dict[str, Set[FrozenSet[str]]] = {}
         self.cache_hits = 0
         self.cache_misses = 0
+        self.revalidated = 0
 
-    def get_weather(self, city: str):
+    def get_weather(self, city: str, fields: Optional[Sequence[str]] = None,
+                    temperature_unit: str = CANONICAL_TEMPERATURE_UNIT,
+                    windspeed_unit: str = CANONICAL_WINDSPEED_UNIT):
         """Return weather data using cache when available.
         
         This method first checks the cache for recent weather data.
         If found, returns cached data (cache hit). Otherwise, fetches
         fresh data from the API, caches it, and returns it (cache miss).
         
+        Data is always fetched and cached in canonical units (Celsius,
+        km/h) and converted locally, so every unit combination shares one
+        cache entry and one upstream call.
+        
         Args:
             city: Name of the city to get weather for.
+            fields: Optional ``current_weather`` fields to return, e.g.
+                ["temperature", "windspeed"]. Only these are downloaded
+                on a miss, and any cached entry holding a superset of them
+                (including a full response) serves the request.
+            temperature_unit: "celsius" (default) or "fahrenheit".
+            windspeed_unit: "kmh" (default), "ms", "mph" or "kn".
             
         Returns:
             dict: Weather data including current conditions.
             
         Raises:
-            ValueError: If city name is invalid.
+            ValueError: If city name, a field or a unit is invalid.
             requests.exceptions.RequestException: If API request fails.
         """
+        if self.tracer.enabled:
+            with self.tracer.span('weather.get_weather', city=city):
+                return self._get_weather(city, fields, temperature_unit, windspeed_unit)
+        return self._get_weather(city, fields, temperature_unit, windspeed_unit)
+
+    def _get_weather(self, city: str, fields: Optional[Sequence[str]],
+                     temperature_unit: str, windspeed_unit: str):
+        """Validate arguments and serve a weather request (see ``get_weather``)."""
         if not city or not isinstance(city, str):
             raise ValueError("Invalid city name.")
+        validate_units(temperature_unit, windspeed_unit)
+        
+        if fields is None:
+            data = self._get_canonical_weather(city)
+        else:
+            projection_variables(fields)
+            data = self._get_projected_weather(city, frozenset(fields))
+        return convert_weather(data, temperature_unit, windspeed_unit)
+
+    def get_cached_weather(self, city: str):
+        """Return the cached canonical entry for a city without fetching.
+        
+        The stored value is returned as-is (a dict, or a ``CompactWeather``
+        record in compact mode). Lookups count as cache hits or misses; a
+        caller following a miss with an upstream fetch should use
+        ``fetch_and_cache_weather`` so the miss is not counted twice.
         
+        Args:
+            city: Name of the city to look up.
+            
+        Returns:
+            The cached value, or None if the city is not cached.
+            
+        Raises:
+            ValueError: If city name is invalid.
+        """
+        found = self.get_cached_weather_version(city)
+        return found[0] if found else None
+
+    def get_cached_weather_version(self, city: str, known_version: Optional[int] = None):
+        """Return the cached canonical entry for a city and its version.
+        
+        Callers such as the HTTP front-end keep work derived from an entry
+        (a serialized body) and reuse it while the version is unchanged,
+        without decoding the entry again. Counts a cache hit or miss.
+        
+        Args:
+            city: Name of the city to look up.
+            known_version: Version the caller already holds (see
+                ``CacheManager.get_versioned``).
+            
+        Returns:
+            Tuple of (value, version), where value is None if the version
+            equals ``known_version``; None if the city is not cached.
+            
+        Raises:
+            ValueError: If city name is invalid.
+        """
+        if not city or not isinstance(city, str):
+            raise ValueError("Invalid city name.")
+        
+        started = perf_counter() if self.metrics else 0.0
+        found = self.cache.get_versioned(city.strip().lower(), known_version)
+        if self.metrics:
+            self.metrics.record_lookup(found is not None, perf_counter() - started)
+        if found is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        return found
+
+    def fetch_and_cache_weather(self, city: str):
+        """Fetch a city's canonical weather from upstream and cache it.
+        
+        Skips the cache lookup, for callers that already counted a miss
+        with ``get_cached_weather`` or ``get_cached_weather_version``.
+        
+        Args:
+            city: Name of the city to fetch.
+            
+        Returns:
+            dict: Weather data in canonical units.
+            
+        Raises:
+            ValueError: If city name is invalid.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        if not city or not isinstance(city, str):
+            raise ValueError("Invalid city name.")
+        return self._fetch_and_store(city.strip().lower(), city)
+
+    def _get_canonical_weather(self, city: str):
+        """Return full weather data in canonical units from cache or API."""
         # Normalize city name for consistent cache keys
         cache_key = city.strip().lower()
         
         # Try to get from cache
-        cached = self.cache.get(cache_key)
+        started = perf_counter() if self.metrics else 0.0
+        cached = self._cache_get(cache_key)
+        if self.metrics:
+            self.metrics.record_lookup(bool(cached), perf_counter() - started)
         if cached:
             self.cache_hits += 1
             return cached
         
         # Cache miss - fetch from API
         self.cache_misses += 1
-        data = self.api.fetch_weather(city)
+        return self._fetch_and_store(cache_key, city)
+
+    def _get_projected_weather(self, city: str, fields: FrozenSet[str]):
+        """Return a field subset from any covering cache entry or the API."""
+        city_key = city.strip().lower()
         
-        # Store in cache
-        self.cache.set(cache_key, data)
+        # A full entry covers every field; then try stored projections
+        started = perf_counter() if self.metrics else 0.0
+        candidates = [(city_key, None)] + [
+            (_projection_key(city_key, stored), stored)
+            for stored in self._projections.get(city_key, ()) if fields <= stored
+        ]
+        for key, stored in candidates:
+            cached = self._cache_get(key)
+            if cached:
+                if self.metrics:
+                    self.metrics.record_lookup(True, perf_counter() - started)
+                self.cache_hits += 1
+                return _project(cached, fields)
+            if stored is not None:
+                self._projections[city_key].discard(stored)
+        if self.metrics:
+            self.metrics.record_lookup(False, perf_counter() - started)
+        
+        self.cache_misses += 1
+        data = self._fetch_and_store(_projection_key(city_key, fields), city, fields)
+        self._projections.setdefault(city_key, set()).add(fields)
+        
+        return data
+
+    def _fetch_and_store(self, cache_key: str, city: str, fields: Optional[FrozenSet[str]] = None):
+        """Fetch weather for a missed cache key and store it.
+        
+        With revalidation enabled, an expired entry's validators are sent
+        with the request and an unchanged response only refreshes its TTL.
+        """
+        kwargs = {} if fields is None else {'fields': sorted(fields)}
+        if not self.revalidate:
+            return self._cache_set(cache_key, self._fetch(self.api.fetch_weather, city, **kwargs))
+        
+        stale = self.cache.get_stale(cache_key)
+        result = self._fetch(self.api.fetch_weather_conditional, city,
+                             stale[1] if stale else None, **kwargs)
+        if result.not_modified and stale is None:
+            # Nothing stored to keep (e.g. a proxy answered 304 anyway);
+            # fetch the body without conditions rather than cache None
+            return self._cache_set(cache_key, self._fetch(self.api.fetch_weather, city, **kwargs))
+        if not result.not_modified:
+            return self._cache_set(cache_key, result.data, result.validators)
+        
+        self.revalidated += 1
+        value = stale[0]
+        if not self.cache.refresh(cache_key, validators=result.validators):
+            # Evicted while revalidating; store the unchanged value again
+            self.cache.set(cache_key, value, validators=result.validators)
+        return value.to_dict() if isinstance(value, CompactWeather) else value
+
+    def _fetch(self, fetch, *args, **kwargs):
+        """Call an upstream fetch, recording its latency and outcome."""
+        if self.metrics is None:
+            return fetch(*args, **kwargs)
+        started = perf_counter()
+        try:
+            data = fetch(*args, **kwargs)
+        except Exception as exc:
+            self.metrics.record_fetch(fetch_outcome(exc), perf_counter() - started)
+            raise
+        self.metrics.record_fetch('ok', perf_counter() - started)
+        return data
+
+    def _cache_get(self, key: str):
+        """Read a cache entry, unpacking compact records."""
+        cached = self.cache.get(key)
+        if isinstance(cached, CompactWeather):
+            return cached.to_dict()
+        return cached
+
+    def _cache_set(self, key: str, data, validators: Optional[Dict[str, str]] = None):
+        """Store weather data, packed when compact storage is enabled."""
+        if self.compact:
+            record = CompactWeather.from_response(data)
+            if record is not None:
+                self.cache.set(key, record, validators=validators)
+                return record.to_dict()
+        self.cache.set(key, data, validators=validators)
         
         return data
 
+    def get_forecast(self, city: str, variables: Sequence[str], hours: int = 24,
+                     temperature_unit: str = CANONICAL_TEMPERATURE_UNIT,
+                     windspeed_unit: str = CANONICAL_WINDSPEED_UNIT) -> HourlyForecast:
+        """Return an hourly forecast using cache when available.
+        
+        Forecasts are cached per location. A cached forecast that already
+        holds the requested variables and at least ``hours`` hours answers
+        the request by slicing its columns; otherwise the forecast is
+        fetched again and replaces the cached one.
+        
+        Args:
+            city: Name of the city to get the forecast for.
+            variables: Open-Meteo hourly variable names, e.g.
+                ["temperature_2m", "wind_speed_10m"].
+            hours: Number of forecast hours (default: 24, max: 384).
+            temperature_unit: Unit for temperature variables; columns are
+                converted in bulk from the canonical cached values.
+            windspeed_unit: Unit for wind speed variables.
+            
+        Returns:
+            HourlyForecast: Typed time and value columns.
+            
+        Raises:
+            ValueError: If city, variables, hours or units are invalid.
+            requests.exceptions.RequestException: If API request fails.
+        """
+        if self.tracer.enabled:
+            with self.tracer.span('weather.get_forecast', city=city, hours=hours):
+                return self._get_forecast(city, variables, hours, temperature_unit, windspeed_unit)
+        return self._get_forecast(city, variables, hours, temperature_unit, windspeed_unit)
+
+    def _get_forecast(self, city: str, variables: Sequence[str], hours: int,
+                      temperature_unit: str, windspeed_unit: str) -> HourlyForecast:
+        """Validate arguments and serve a forecast request (see ``get_forecast``)."""
+        if not city or not isinstance(city, str):
+            raise ValueError("Invalid city name.")
+        if isinstance(variables, str) or not variables or \
+                not all(isinstance(name, str) and name for name in variables):
+            raise ValueError("Variables must be a non-empty list of names.")
+        if not isinstance(hours, int) or not 0 < hours <= MAX_FORECAST_HOURS:
+            raise ValueError(f"Hours must be between 1 and {MAX_FORECAST_HOURS}.")
+        validate_units(temperature_unit, windspeed_unit)
+        
+        result = self._get_canonical_forecast(city, variables, hours)
+        for name, (scale, offset) in forecast_conversions(
+                result.variables, temperature_unit, windspeed_unit).items():
+            result.columns[name] = convert_column(result.columns[name], scale, offset)
+        return result
+
+    def _get_canonical_forecast(self, city: str, variables: Sequence[str], hours: int) -> HourlyForecast:
+        """Return a forecast in canonical units from cache or API."""
+        cache_key = "forecast:" + city.strip().lower()
+        
+        started = perf_counter() if self.metrics else 0.0
+        cached = self.cache.get(cache_key)
+        hit = bool(cached) and cached.covers(variables, hours)
+        if self.metrics:
+            self.metrics.record_lookup(hit, perf_counter() - started)
+        if hit:
+            self.cache_hits += 1
+            return cached.select(variables, stop=hours)
+        
+        self.cache_misses += 1
+        fetch_variables, fetch_hours = list(variables), hours
+        if cached:
+            # Widen the request so the new entry still serves older callers
+            fetch_variables = list(dict.fromkeys(list(cached.variables) + fetch_variables))
+            fetch_hours = max(hours, len(cached))
+        data = self._fetch(self.api.fetch_forecast, city, fetch_variables, fetch_hours)
+        forecast = HourlyForecast.from_response(data)
+        self.cache.set(cache_key, forecast)
+        
+        return forecast.select(variables, stop=hours)
+
+    def prewarm(self) -> bool:
+        """Load the HTTP stack and open an API connection before traffic.
+        
+        Optional hook for long-running servers; short-lived processes
+        should skip it and let the first request pay the setup instead.
+        
+        Returns:
+            bool: True if a connection to the API was established.
+        """
+        return self.api.prewarm()
+
     def clear_cache(self) -> None:
         """Clear all cached weather data."""
         self.cache.clear()
+        self._projections.clear()
 
     def get_cache_stats(self):
         """Get cache performance statistics.
         
         Returns:
-            dict: Cache statistics including hits, misses, and hit rate.
+            dict: Cache statistics including hits, misses (and how many of
+            them upstream confirmed unchanged), hit rate, and
+            storage statistics (bytes, compression ratio, CPU time).
         """
         total_requests = self.cache_hits + self.cache_misses
         hit_rate = (self.cache_hits / total_requests * 100) if total_requests > 0 else 0
@@ -76,7 +399,28 @@ class WeatherService:
         return {
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
+            'revalidated': self.revalidated,
             'total_requests': total_requests,
             'hit_rate_percent': round(hit_rate, 2),
-            'cache_size': self.cache.size()
+            'cache_size': self.cache.size(),
+            'storage': self.cache.stats()
         }
+
+
+def _projection_key(city_key: str, fields: FrozenSet[str]) -> str:
+    """Build the cache key for a projected weather entry."""
+    return f"{city_key}|{','.join(sorted(fields))}"
+
+
+def _project(data, fields: FrozenSet[str]):
+    """Restrict a cached payload's ``current_weather`` block to some fields."""
+    current = data.get('current_weather') if isinstance(data, dict) else None
+    if not isinstance(current, dict):
+        return data
+    keep = fields | {'time', 'interval'}
+    result = dict(data)
+    result['current_weather'] = {key: value for key, value in current.items() if key in keep}
+    units = data.get('current_weather_units')
+    if isinstance(units, dict):
+        result['current_weather_units'] = {key: value for key, value in units.items() if key in keep}
+    return result
@@ -0,0 +1,111 @@
+"""Unit tests for vectorized threshold alerts.
+
+This module tests rule compilation, the cache-fed column mirror and
+change-only reporting, with and without NumPy.
+"""
+
+import pytest
+
+from src.alerts import AlertEngine, AlertRule, WeatherMirror
+from src.cache_manager import CacheManager
+from src.compact_weather import CompactWeather
+
+
+def _weather(temperature, windspeed=10.0, weathercode=0):
+    return {"current_weather": {"time": "2025-11-08T12:00", "interval": 900,
+                                "temperature": temperature, "windspeed": windspeed,
+                                "winddirection": 180, "weathercode": weathercode, "is_day": 1}}
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "pure"])
+def use_numpy(request):
+    return request.param
+
+
+def test_alert_rules_over_cache(use_numpy):
+    """Test rules see cache sets and removals and report only changes."""
+    cache = CacheManager()
+    cache.set("cairo", _weather(42.0))
+    mirror = WeatherMirror(use_numpy=use_numpy).attach(cache)
+    engine = AlertEngine(mirror, {
+        "heat": "temperature > 40",
+        "storm": "windspeed > 60 and weathercode in storm_codes",
+    })
+
+    cache.set("oslo", _weather(-5.0, windspeed=80.0, weathercode=95))
+    cache.set("forecast:oslo", {"hourly": {}})
+    changes = engine.evaluate()
+    assert changes.triggered == {"heat": ["cairo"], "storm": ["oslo"]}
+    assert changes.resolved == {}
+
+    # Nothing changed: nothing reported
+    assert engine.evaluate() == ({}, {})
+
+    cache.set("cairo", _weather(35.0))
+    cache.set("dubai", _weather(45.0))
+    cache.clear()
+    cache.set("dubai", _weather(45.0))
+    changes = engine.evaluate()
+    assert changes.triggered == {"heat": ["dubai"]}
+    assert changes.resolved == {"heat": ["cairo"], "storm": ["oslo"]}
+    assert engine.active("heat") == {"dubai"}
+    assert len(mirror) == 1
+
+
+def test_alert_rule_syntax(use_numpy):
+    """Test chained comparisons, not, or, literal lists and missing values."""
+    mirror = WeatherMirror(use_numpy=use_numpy)
+    mirror.update("a", _weather(5.0, weathercode=3))
+    mirror.update("b", _weather(15.0, weathercode=61))
+    mirror.update("c", {"current_weather": {"temperature": None}})
+    mirror.update("d", CompactWeather.from_response(_weather(-3.0)))
+
+    def match(expression):
+        return sorted(mirror.match(AlertRule("rule", expression)))
+
+    assert match("0 < temperature < 10") == ["a"]
+    assert match("temperature >= 15 or weathercode in (3,)") == ["a", "b"]
+    assert match("not temperature > 0") == ["c", "d"]
+    assert match("weathercode not in rain_codes and temperature > -10") == ["a", "d"]
+
+
+def test_alert_rule_rejects_invalid_expressions():
+    """Test malformed or unsafe expressions fail at compile time."""
+    for expression in ("temperature >", "temperature > 40 + 1", "__import__('os')",
+                       "temperature in storm", "1 < 2", "storm_codes > 1"):
+        with pytest.raises(ValueError, match="Invalid alert rule"):
+            AlertRule("bad", expression)
+
+    engine = AlertEngine(WeatherMirror())
+    with pytest.raises(ValueError, match="unknown field humidity"):
+        engine.add_rule("wet", "humidity > 90")
+
+
+def test_mirror_reuses_rows_after_removal():
+    """Test removed locations free their rows for new keys."""
+    mirror = WeatherMirror(use_numpy=False)
+    mirror.update("a", _weather(1.0))
+    mirror.update("b", _weather(2.0))
+    mirror.update("a", None)
+    mirror.update("c", _weather(50.0))
+    assert sorted(mirror.keys()) == ["b", "c"]
+    assert mirror.match(AlertRule("hot", "temperature > 40")) == ["c"]
+
+
+def test_alert_changes_track_reused_rows(use_numpy):
+    """Test a freed row reassigned to another active key is reported."""
+    mirror = WeatherMirror(use_numpy=use_numpy)
+    engine = AlertEngine(mirror, {"heat": "temperature > 40"})
+    mirror.update("a", _weather(45.0))
+    engine.evaluate()
+
+    # Same row, new key, same outcome
+    mirror.update("a", None)
+    mirror.update("b", _weather(41.0))
+    assert engine.evaluate() == ({"heat": ["b"]}, {"heat": ["a"]})
+
+    # Removed and re-added between runs: no change
+    mirror.update("b", None)
+    mirror.update("b", _weather(43.0))
+    assert engine.evaluate() == ({}, {})
+    assert engine.active("heat") == {"b"}
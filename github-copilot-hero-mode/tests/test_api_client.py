@@ -107,3 +107,169 @@ def test_api_client_timeout_setting(mock_get):
     # Verify timeout is set to 5 seconds
     call_args = mock_get.call_args
     assert call_args.kwargs['timeout'] == 5
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_fetch_forecast_params(mock_get):
+    """Test forecast requests ask for hourly variables as unix times."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"hourly": {"time": []}}
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+    
+    client = APIClient()
+    client.fetch_forecast("Berlin", ["temperature_2m", "wind_speed_10m"], 48)
+    
+    params = mock_get.call_args.kwargs['params']
+    assert params['hourly'] == "temperature_2m,wind_speed_10m"
+    assert params['forecast_hours'] == 48
+    assert params['timeformat'] == "unixtime"
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_field_projection(mock_get):
+    """Test projected requests use current= and are reshaped."""
+    mock_response = Mock()
+    mock_response.json.return_value = {
+        "latitude": 52.52,
+        "current_units": {"time": "iso8601", "temperature_2m": "°C"},
+        "current": {"time": "2025-11-08T12:00", "interval": 900, "temperature_2m": 20.5}
+    }
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+    
+    client = APIClient()
+    result = client.fetch_weather("Berlin", fields=["temperature"])
+    
+    params = mock_get.call_args.kwargs['params']
+    assert params['current'] == "temperature_2m"
+    assert "current_weather" not in params
+    assert result["current_weather"] == {"time": "2025-11-08T12:00", "interval": 900, "temperature": 20.5}
+    assert result["current_weather_units"] == {"time": "iso8601", "temperature": "°C"}
+    assert "current" not in result
+
+
+def test_api_client_rejects_unknown_fields():
+    """Test unknown projection fields are rejected before any request."""
+    client = APIClient()
+    
+    with pytest.raises(ValueError, match="Unknown weather field: humidity"):
+        client.fetch_weather("Berlin", fields=["temperature", "humidity"])
+    
+    with pytest.raises(ValueError, match="Fields must be a non-empty list"):
+        client.fetch_weather("Berlin", fields=[])
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_conditional_fetch(mock_get):
+    """Test conditional fetches send validators and skip unchanged payloads."""
+    mock_response = Mock(status_code=200, headers={"ETag": '"abc"'})
+    mock_response.json.return_value = {"generationtime_ms": 0.05, "current_weather": {"temperature": 20.5}}
+    mock_get.return_value = mock_response
+    
+    client = APIClient()
+    first = client.fetch_weather_conditional("Berlin")
+    assert first.not_modified is False
+    assert first.data["current_weather"]["temperature"] == 20.5
+    assert first.validators["etag"] == '"abc"'
+    
+    # Same data with a new per-response generation time: still unchanged
+    mock_response.json.return_value = {"generationtime_ms": 0.31, "current_weather": {"temperature": 20.5}}
+    second = client.fetch_weather_conditional("Berlin", first.validators)
+    assert second.not_modified is True
+    assert second.data is None
+    assert mock_get.call_args.kwargs['headers'] == {"If-None-Match": '"abc"'}
+    
+    mock_response.json.return_value = {"generationtime_ms": 0.31, "current_weather": {"temperature": 21.0}}
+    third = client.fetch_weather_conditional("Berlin", second.validators)
+    assert third.not_modified is False
+    assert third.validators["content_hash"] != first.validators["content_hash"]
+
+
+def test_content_hash_ignores_key_order_and_generation_time():
+    """Test the payload hash is canonical and skips volatile metadata."""
+    from src.api_client import content_hash
+    
+    assert content_hash({"a": 1, "b": {"c": 2}, "generationtime_ms": 0.1}) == \
+        content_hash({"b": {"c": 2}, "a": 1, "generationtime_ms": 9.9})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_conditional_fetch_304(mock_get):
+    """Test a 304 response keeps the stored validators."""
+    mock_get.return_value = Mock(status_code=304)
+    validators = {"last_modified": "Sat, 08 Nov 2025 12:00:00 GMT", "content_hash": "x"}
+    
+    client = APIClient()
+    result = client.fetch_weather_conditional("Berlin", validators)
+    
+    assert result.not_modified is True
+    assert result.validators == validators
+    assert mock_get.call_args.kwargs['headers'] == {"If-Modified-Since": validators["last_modified"]}
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_uses_known_locations(mock_get):
+    """Test configured cities are requested at their own coordinates."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"current_weather": {}}
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+    
+    client = APIClient(locations={"Mumbai, India": (19.08, 72.88)})
+    client.fetch_weather("mumbai, india ")
+    params = mock_get.call_args.kwargs['params']
+    assert (params['latitude'], params['longitude']) == (19.08, 72.88)
+    
+    client.fetch_weather("Atlantis")
+    params = mock_get.call_args.kwargs['params']
+    assert (params['latitude'], params['longitude']) == (52.52, 13.405)
+
+
+@patch('src.api_client.requests.get')
+def test_api_client_fetch_history_params(mock_get):
+    """Test historical requests go to the archive endpoint."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"hourly": {"time": []}}
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+    
+    client = APIClient()
+    client.fetch_history(19.08, 72.88, "2024-01-01", "2024-03-31", ["temperature_2m"])
+    
+    assert mock_get.call_args.args[0] == "https://archive-api.open-meteo.com/v1/archive"
+    params = mock_get.call_args.kwargs['params']
+    assert params['start_date'] == "2024-01-01"
+    assert params['end_date'] == "2024-03-31"
+    assert params['hourly'] == "temperature_2m"
+
+
+def test_api_client_imports_requests_lazily():
+    """Test importing the service does not import requests."""
+    import os
+    import subprocess
+    import sys
+    
+    code = ("import sys, src.weather_service, src.http_server; "
+            "sys.exit('requests' in sys.modules or 'http.server' in sys.modules)")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=root).returncode == 0
+
+
+def test_api_client_prewarm_uses_session():
+    """Test prewarm opens a pooled session used by later requests."""
+    from src.replay import FixtureStore, ReplayServer
+    
+    with ReplayServer(FixtureStore()) as server:
+        client = APIClient()
+        client.base_url = server.url + "/v1/forecast"
+        assert client.prewarm() is True
+        with patch('src.api_client.requests.get') as mock_get:
+            with pytest.raises(requests.exceptions.HTTPError, match="404"):
+                client.fetch_weather("Berlin")
+        mock_get.assert_not_called()
+    
+    client = APIClient()
+    client.base_url = "http://127.0.0.1:9/v1/forecast"
+    assert client.prewarm() is False
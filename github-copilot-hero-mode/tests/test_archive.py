@@ -0,0 +1,138 @@
+"""Unit tests for the columnar weather archive.
+
+This module tests appends, range queries across segments, persistence,
+crash recovery and the pure-Python (no NumPy) read path.
+"""
+
+import math
+import os
+from array import array
+
+import pytest
+
+from src import forecast as forecast_module
+from src.archive import ColumnarArchive
+from src.forecast import HourlyForecast
+
+HOUR = 3600
+
+
+def _chunk(start_hour, hours, offset=0.0):
+    times = array('q', [(start_hour + i) * HOUR for i in range(hours)])
+    return HourlyForecast(times, {
+        "temperature_2m": array('f', [offset + i for i in range(hours)]),
+        "wind_speed_10m": array('f', [offset + 100 + i for i in range(hours)]),
+    })
+
+
+def test_archive_requires_variables_on_create(tmp_path):
+    """Test a new archive must declare its variables."""
+    with pytest.raises(ValueError, match="Variables are required"):
+        ColumnarArchive(str(tmp_path / "archive"))
+
+
+def test_archive_range_query_across_segments(tmp_path):
+    """Test queries merge out-of-order segments and slice by time."""
+    archive = ColumnarArchive(str(tmp_path), ["temperature_2m", "wind_speed_10m"])
+    archive.append("berlin", _chunk(24, 24, offset=24))
+    archive.append("paris", _chunk(0, 48, offset=1000))
+    archive.append("berlin", _chunk(0, 24))
+    assert archive.rows == 96
+    assert archive.locations() == ["berlin", "paris"]
+
+    result = archive.query("berlin", 20 * HOUR, 30 * HOUR, ["temperature_2m"])
+    assert list(result.times) == [hour * HOUR for hour in range(20, 30)]
+    assert list(result.column("temperature_2m")) == [float(hour) for hour in range(20, 30)]
+    assert result.variables == ("temperature_2m",)
+
+    assert len(archive.query("berlin")) == 48
+    assert len(archive.query("berlin", 100 * HOUR)) == 0
+    assert len(archive.query("madrid")) == 0
+    with pytest.raises(KeyError):
+        archive.query("berlin", variables=["humidity"])
+    archive.close()
+
+
+def test_archive_reopen_and_duplicate_append(tmp_path):
+    """Test data persists and re-appending an indexed chunk is a no-op."""
+    with ColumnarArchive(str(tmp_path), ["temperature_2m"]) as archive:
+        assert archive.append("berlin", _chunk(0, 10)) == 10
+    with ColumnarArchive(str(tmp_path)) as archive:
+        assert archive.append("berlin", _chunk(0, 10)) == 0
+        assert archive.rows == 10
+        assert list(archive.query("berlin", 8 * HOUR).column("temperature_2m")) == [8.0, 9.0]
+    with pytest.raises(ValueError, match="stores variables"):
+        ColumnarArchive(str(tmp_path), ["wind_speed_10m"])
+
+
+def test_archive_missing_variables_are_nan(tmp_path):
+    """Test variables absent from a chunk are stored as NaN."""
+    with ColumnarArchive(str(tmp_path), ["temperature_2m", "rain"]) as archive:
+        archive.append("berlin", _chunk(0, 3))
+        assert all(math.isnan(value) for value in archive.query("berlin").column("rain"))
+
+
+def test_archive_drops_unindexed_bytes_on_open(tmp_path):
+    """Test bytes from an append interrupted before the index update are dropped."""
+    with ColumnarArchive(str(tmp_path), ["temperature_2m"]) as archive:
+        archive.append("berlin", _chunk(0, 4))
+    with open(os.path.join(str(tmp_path), "time.i64"), "ab") as file:
+        file.write(b"\x00" * 12)
+
+    with ColumnarArchive(str(tmp_path)) as archive:
+        assert os.path.getsize(os.path.join(str(tmp_path), "time.i64")) == 4 * 8
+        archive.append("berlin", _chunk(4, 2))
+        assert list(archive.query("berlin").times) == [hour * HOUR for hour in range(6)]
+
+
+def test_archive_without_numpy(tmp_path, monkeypatch):
+    """Test queries return arrays when NumPy is unavailable."""
+    monkeypatch.setattr(forecast_module, "_numpy_module", None)
+    monkeypatch.setattr(forecast_module, "_numpy_checked", True)
+    with ColumnarArchive(str(tmp_path), ["temperature_2m"]) as archive:
+        archive.append("berlin", _chunk(0, 5))
+        result = archive.query("berlin", HOUR, 3 * HOUR)
+        assert isinstance(result.times, array)
+        assert list(result.column("temperature_2m")) == [1.0, 2.0]
+
+
+def test_archive_append_many_writes_index_once(tmp_path, monkeypatch):
+    """Test a batch append rewrites the index once and skips duplicate spans."""
+    with ColumnarArchive(str(tmp_path), ["temperature_2m"]) as archive:
+        archive.append("berlin", _chunk(0, 4))
+        writes = []
+        original = archive._write_index
+        monkeypatch.setattr(archive, "_write_index", lambda: writes.append(1) or original())
+
+        rows = archive.append_many([("berlin", _chunk(4, 4)), ("paris", _chunk(0, 2)),
+                                    ("berlin", _chunk(0, 4)), ("paris", _chunk(0, 2))])
+
+        assert rows == 6 and archive.rows == 10
+        assert writes == [1]
+        assert archive.append_many([("berlin", _chunk(4, 4))]) == 0
+        assert writes == [1]
+    with ColumnarArchive(str(tmp_path)) as archive:
+        assert [segment['count'] for segment in archive.segments("paris")] == [2]
+        assert list(archive.query("berlin").times) == [hour * HOUR for hour in range(8)]
+
+
+def test_archive_failed_append_truncates_columns(tmp_path, monkeypatch):
+    """Test a write failing partway through a chunk leaves no stray bytes."""
+    with ColumnarArchive(str(tmp_path), ["temperature_2m", "wind_speed_10m"]) as archive:
+        archive.append("berlin", _chunk(0, 4))
+        original = archive._append_bytes
+
+        def failing_append(filename, data):
+            if filename == "wind_speed_10m.f32":
+                raise OSError("disk full")
+            original(filename, data)
+
+        monkeypatch.setattr(archive, "_append_bytes", failing_append)
+        with pytest.raises(OSError, match="disk full"):
+            archive.append("berlin", _chunk(4, 4))
+        monkeypatch.setattr(archive, "_append_bytes", original)
+
+        assert os.path.getsize(os.path.join(str(tmp_path), "time.i64")) == 4 * 8
+        assert os.path.getsize(os.path.join(str(tmp_path), "temperature_2m.f32")) == 4 * 4
+        assert archive.append("berlin", _chunk(4, 4)) == 4
+        assert list(archive.query("berlin").column("wind_speed_10m")) == [100.0 + i % 4 for i in range(8)]
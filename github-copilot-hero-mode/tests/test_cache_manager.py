@@ -171,3 +171,170 @@ def test_cache_expiry_boundary():
     # Just after expiry
     time.sleep(0.2)
     assert cache.get("key") is None
+
+
+def test_cache_compression_round_trip():
+    """Test large JSON values are compressed and decoded on get."""
+    cache = CacheManager(ttl=10, compress_threshold=100)
+    payload = {"hourly": {"temperature_2m": [20.5] * 500}}
+
+    cache.set("large", payload)
+    cache.set("small", {"temp": 20})
+
+    assert cache.cache["large"]["codec"] == "zlib"
+    assert "codec" not in cache.cache["small"]
+    assert cache.get("large") == payload
+    assert cache.get("small") == {"temp": 20}
+
+
+def test_cache_compression_lzma():
+    """Test the lzma codec can be selected."""
+    cache = CacheManager(ttl=10, compress_threshold=0, compression="lzma")
+    payload = {"values": list(range(200))}
+
+    cache.set("key", payload)
+
+    assert cache.cache["key"]["codec"] == "lzma"
+    assert cache.get("key") == payload
+
+
+def test_cache_compression_stats():
+    """Test stats report compression ratio and CPU time."""
+    cache = CacheManager(ttl=10, compress_threshold=100)
+    cache.set("large", {"values": [1.5] * 1000})
+    cache.get("large")
+
+    stats = cache.stats()
+
+    assert stats["compressed_entries"] == 1
+    assert stats["compression_ratio"] > 5
+    assert stats["stored_bytes"] == len(cache.cache["large"]["data"])
+    assert stats["compress_cpu_seconds"] >= 0
+    assert stats["decompress_cpu_seconds"] >= 0
+
+
+def test_cache_invalid_compression_settings():
+    """Test invalid compression and capacity settings are rejected."""
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        CacheManager(compression="gzip")
+    with pytest.raises(ValueError, match="Compression threshold cannot be negative"):
+        CacheManager(compress_threshold=-1)
+    with pytest.raises(ValueError, match="Cache capacity must be positive"):
+        CacheManager(max_bytes=0)
+
+
+def test_cache_byte_capacity_evicts_oldest():
+    """Test byte capacity counts compressed size and evicts oldest entries."""
+    payload = {"values": [0.0] * 2000}
+    probe = CacheManager(ttl=10, compress_threshold=100)
+    probe.set("probe", payload)
+    entry_size = len(probe.cache["probe"]["data"])
+
+    cache = CacheManager(ttl=10, compress_threshold=100, max_bytes=entry_size * 2)
+    cache.set("first", payload)
+    cache.set("second", payload)
+    cache.set("third", payload)
+
+    assert cache.stats()["stored_bytes"] == entry_size * 2
+    assert cache.get("first") is None
+    assert cache.get("third") == payload
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_cache_byte_accounting_on_overwrite_and_expiry():
+    """Test stored bytes are released on overwrite, expiry and clear."""
+    now = [0.0]
+    cache = CacheManager(ttl=10, max_bytes=10_000, clock=lambda: now[0])
+    cache.set("key", {"a": 1})
+    cache.set("key", {"a": 1})
+    assert cache.stats()["stored_bytes"] == len('{"a":1}')
+
+    now[0] = 20.0
+    assert cache.remove_expired() == 1
+    assert cache.stats()["stored_bytes"] == 0
+
+
+def test_cache_keep_stale_and_refresh():
+    """Test expired entries can be revalidated instead of refetched."""
+    now = [0.0]
+    cache = CacheManager(ttl=10, keep_stale=True, stale_ttl=30, clock=lambda: now[0])
+    cache.set("key", {"a": 1}, validators={"etag": '"v1"'})
+
+    now[0] = 20.0
+    assert cache.get("key") is None
+    assert cache.get_stale("key") == ({"a": 1}, {"etag": '"v1"'})
+
+    assert cache.refresh("key", validators={"etag": '"v2"'}) is True
+    assert cache.get("key") == {"a": 1}
+    assert cache.get_stale("key")[1] == {"etag": '"v2"'}
+
+    now[0] = 29.0
+    assert cache.get("key") == {"a": 1}
+    assert cache.refresh("missing") is False
+
+
+def test_cache_stale_entries_purged_after_stale_ttl():
+    """Test expired entries are only kept for revalidation up to stale_ttl."""
+    now = [0.0]
+    cache = CacheManager(ttl=10, keep_stale=True, stale_ttl=5, clock=lambda: now[0])
+    removed = []
+    cache.add_listener(lambda key, value: value is None and removed.append(key))
+    cache.set("looked_up", "a")
+    cache.set("swept", "b")
+
+    now[0] = 12.0
+    assert cache.get_stale("looked_up") == ("a", {})
+    now[0] = 15.0
+    assert cache.get_stale("looked_up") is None
+
+    # Untouched stale entries go in the next sweep, run from set
+    cache.set("fresh", "c")
+    assert removed == ["looked_up", "swept"]
+    assert cache.size() == 1
+
+    with pytest.raises(ValueError, match="Stale TTL cannot be negative"):
+        CacheManager(stale_ttl=-1)
+
+
+def test_cache_expired_entries_dropped_without_keep_stale():
+    """Test expired entries are still removed on lookup by default."""
+    now = [0.0]
+    cache = CacheManager(ttl=10, clock=lambda: now[0])
+    cache.set("key", "value")
+
+    now[0] = 20.0
+    assert cache.get("key") is None
+    assert cache.get_stale("key") is None
+
+
+def test_cache_listeners_see_sets_and_removals():
+    """Test listeners observe stored values and removals."""
+    now = [0.0]
+    cache = CacheManager(ttl=10, clock=lambda: now[0], compress_threshold=0)
+    events = []
+    cache.add_listener(lambda key, value: events.append((key, value)))
+
+    cache.set("a", {"x": 1})
+    cache.set("a", {"x": 2})
+    cache.set("b", "value")
+    now[0] = 20.0
+    cache.remove_expired()
+
+    assert events == [("a", {"x": 1}), ("a", {"x": 2}), ("b", "value"), ("a", None), ("b", None)]
+
+
+def test_cache_sizes_forecasts_from_column_buffers():
+    """Test non-JSON values exposing nbytes count their buffer size."""
+    from array import array
+    from src.forecast import HourlyForecast
+
+    hours = 384
+    forecast = HourlyForecast(array('q', range(hours)),
+                              {"temperature_2m": array('f', [0.0] * hours)})
+    cache = CacheManager(ttl=10, max_bytes=6_000)
+    cache.set("forecast", forecast)
+
+    assert cache.stats()["stored_bytes"] == hours * 8 + hours * 4
+    cache.set("second", forecast)
+    assert cache.get("forecast") is None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,84 @@
+"""Unit tests for the multi-city mode of check_real_weather.
+
+This module tests city selection, nearest-rank percentiles, concurrent
+fetching through a shared cache and loading cities from a file.
+"""
+
+import pytest
+
+import check_real_weather
+from check_real_weather import CITIES, main, percentile, run_multi_city, select_cities
+from src.weather_service import WeatherService
+
+MOCK_DATA = {"current_weather": {"time": "2025-11-08T12:00", "temperature": 20.0, "windspeed": 36.0}}
+
+
+def test_select_cities_by_full_or_short_name():
+    """Test cities match case-insensitively by full name or the part before the comma."""
+    selected = select_cities(["mumbai", " Delhi, India ", "Mumbai, India"])
+
+    assert list(selected) == ["Mumbai, India", "Delhi, India"]
+    assert selected["Mumbai, India"] == CITIES["Mumbai, India"]
+    with pytest.raises(ValueError, match="Unknown city: Paris"):
+        select_cities(["Paris"])
+
+
+def test_percentile_nearest_rank():
+    """Test the nearest-rank percentile of a sorted list."""
+    ordered = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+
+    assert percentile(ordered, 0.5) == 6.0
+    assert percentile(ordered, 0.95) == 10.0
+    assert percentile(ordered, 0.0) == 1.0
+    assert percentile([4.2], 0.95) == 4.2
+
+
+def test_run_multi_city_fetches_once_then_hits_cache():
+    """Test repeated rounds fetch each city once and then serve it from the cache."""
+    calls = []
+    service = WeatherService()
+
+    def mock_fetch(city):
+        calls.append(city)
+        return MOCK_DATA
+
+    service.api.fetch_weather = mock_fetch
+    cities = select_cities(["Mumbai", "Delhi"])
+
+    timings = run_multi_city(cities, workers=2, repeat=3, service=service)
+
+    assert sorted(calls) == ["Delhi, India", "Mumbai, India"]
+    assert {city: len(samples) for city, samples in timings.items()} == {
+        "Mumbai, India": 3, "Delhi, India": 3}
+    assert service.cache_hits == 4 and service.cache_misses == 2
+
+
+def test_run_multi_city_skips_failed_fetches(monkeypatch, capsys):
+    """Test failed cities are reported and left out of the timings."""
+    def stub_fetch_city(service, city):
+        if city == "Delhi, India":
+            return city, None, "error", RuntimeError("boom"), 0.002
+        return city, MOCK_DATA, "cache", None, 0.001
+
+    monkeypatch.setattr(check_real_weather, "fetch_city", stub_fetch_city)
+
+    timings = run_multi_city(select_cities(["Mumbai", "Delhi"]), repeat=2, service=WeatherService())
+
+    assert timings == {"Mumbai, India": [0.001, 0.001], "Delhi, India": []}
+    assert "boom" in capsys.readouterr().out
+
+
+def test_main_loads_cities_from_file(tmp_path, monkeypatch):
+    """Test --from-file reads name,latitude,longitude lines and rejects bad ones."""
+    path = tmp_path / "cities.txt"
+    path.write_text("# name,lat,lon\nPune, India,18.52,73.86\n")
+    seen = {}
+    monkeypatch.setattr(check_real_weather, "run_multi_city",
+                        lambda cities, workers, repeat: seen.update(cities))
+
+    main(["--from-file", str(path)])
+
+    assert seen == {"Pune, India": {"lat": 18.52, "lon": 73.86}}
+    path.write_text("Pune\n")
+    with pytest.raises(SystemExit):
+        main(["--from-file", str(path)])
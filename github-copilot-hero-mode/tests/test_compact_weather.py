@@ -0,0 +1,88 @@
+"""Unit tests for CompactWeather.
+
+This module tests packing of weather payloads, lazy conversion back to
+the dict API, and compact caching in WeatherService.
+"""
+
+from src.compact_weather import CompactWeather
+from src.ttl_policy import upstream_timestamp, upstream_interval
+from src.weather_service import WeatherService
+
+
+SAMPLE_RESPONSE = {
+    "latitude": 52.52,
+    "longitude": 13.419998,
+    "generationtime_ms": 0.0679492950439453,
+    "utc_offset_seconds": 0,
+    "timezone": "GMT",
+    "elevation": 38.0,
+    "current_weather_units": {"temperature": "°C", "windspeed": "km/h"},
+    "current_weather": {
+        "time": "2025-11-08T12:00",
+        "interval": 900,
+        "temperature": 20.5,
+        "windspeed": 12.3,
+        "winddirection": 29,
+        "is_day": 1,
+        "weathercode": 3
+    }
+}
+
+
+def test_compact_round_trip():
+    """Test packed records rebuild the used fields exactly."""
+    record = CompactWeather.from_response(SAMPLE_RESPONSE)
+    data = record.to_dict()
+
+    assert data["current_weather"] == SAMPLE_RESPONSE["current_weather"]
+    assert data["latitude"] == 52.52
+    assert data["longitude"] == 13.419998
+    assert "generationtime_ms" not in data
+
+
+def test_compact_preserves_local_time_with_offset():
+    """Test local times survive the round trip through epoch seconds."""
+    response = {"utc_offset_seconds": 19800,
+                "current_weather": {"time": "2025-11-08T17:30", "temperature": 28.8}}
+    data = CompactWeather.from_response(response).to_dict()
+
+    assert data["current_weather"] == {"time": "2025-11-08T17:30", "temperature": 28.8}
+    assert data["utc_offset_seconds"] == 19800
+
+
+def test_compact_rejects_unexpected_shapes():
+    """Test payloads without current_weather are not compacted."""
+    assert CompactWeather.from_response({"temp": 20}) is None
+    assert CompactWeather.from_response({"current_weather": {"time": "bad"}}) is None
+    assert CompactWeather.from_response(None) is None
+
+
+def test_compact_exposes_upstream_time_to_ttl_policy():
+    """Test TTL helpers read the packed timestamp and interval."""
+    record = CompactWeather.from_response(SAMPLE_RESPONSE)
+
+    assert upstream_timestamp(record) == upstream_timestamp(SAMPLE_RESPONSE)
+    assert upstream_interval(record) == 900
+
+
+def test_weather_service_compact_cache(monkeypatch):
+    """Test WeatherService stores packed records and returns dicts."""
+    service = WeatherService(compact=True)
+    monkeypatch.setattr(service.api, "fetch_weather", lambda city: SAMPLE_RESPONSE)
+
+    first = service.get_weather("Berlin")
+    second = service.get_weather("Berlin")
+
+    assert isinstance(service.cache.get("berlin"), CompactWeather)
+    assert first == second
+    assert second["current_weather"]["temperature"] == 20.5
+    assert service.cache_hits == 1
+
+
+def test_weather_service_compact_falls_back_for_other_payloads(monkeypatch):
+    """Test payloads that cannot be packed are cached unchanged."""
+    service = WeatherService(compact=True)
+    monkeypatch.setattr(service.api, "fetch_weather", lambda city: {"temp": 20})
+
+    assert service.get_weather("Berlin") == {"temp": 20}
+    assert service.cache.get("berlin") == {"temp": 20}
@@ -0,0 +1,189 @@
+"""Unit tests for HourlyForecast and WeatherService.get_forecast.
+
+This module tests parsing of hourly arrays into typed columns, slicing,
+window aggregation and per-location forecast caching.
+"""
+
+import math
+from array import array
+
+import pytest
+from src import forecast as forecast_module
+from src.forecast import HourlyForecast
+from src.weather_service import WeatherService
+
+
+def _response(hours=6, variables=("temperature_2m", "wind_speed_10m")):
+    hourly = {"time": [1762560000 + 3600 * i for i in range(hours)]}
+    for offset, name in enumerate(variables):
+        hourly[name] = [float(i + offset * 10) for i in range(hours)]
+    return {"latitude": 52.52, "longitude": 13.41, "hourly": hourly}
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    """Force the pure-array code path."""
+    monkeypatch.setattr(forecast_module, "_numpy", lambda: None)
+
+
+def test_from_response_builds_typed_columns(no_numpy):
+    """Test hourly arrays are parsed into array('q') and array('f')."""
+    forecast = HourlyForecast.from_response(_response())
+
+    assert isinstance(forecast.times, array) and forecast.times.typecode == "q"
+    assert forecast.column("temperature_2m").typecode == "f"
+    assert list(forecast.column("wind_speed_10m")) == [10.0, 11.0, 12.0, 13.0, 14.0, 15.0]
+    assert len(forecast) == 6
+    assert forecast.variables == ("temperature_2m", "wind_speed_10m")
+
+
+def test_from_response_maps_nulls_to_nan(no_numpy):
+    """Test JSON nulls become NaN and are ignored by aggregations."""
+    data = _response(hours=3)
+    data["hourly"]["temperature_2m"] = [1.0, None, 3.0]
+    forecast = HourlyForecast.from_response(data)
+
+    assert math.isnan(forecast.column("temperature_2m")[1])
+    assert forecast.window_mean("temperature_2m") == 2.0
+
+
+def test_from_response_requires_hourly_block():
+    """Test payloads without hourly data are rejected."""
+    with pytest.raises(ValueError, match="no hourly data"):
+        HourlyForecast.from_response({"current_weather": {}})
+
+
+def test_unknown_variable_raises(no_numpy):
+    """Test requesting a missing column raises KeyError."""
+    forecast = HourlyForecast.from_response(_response())
+    with pytest.raises(KeyError, match="Variable not in forecast"):
+        forecast.column("snowfall")
+
+
+def test_select_and_between(no_numpy):
+    """Test slicing by hour index and by time range."""
+    forecast = HourlyForecast.from_response(_response())
+
+    head = forecast.select(["temperature_2m"], stop=3)
+    assert head.variables == ("temperature_2m",)
+    assert list(head.column("temperature_2m")) == [0.0, 1.0, 2.0]
+
+    start = forecast.times[2]
+    window = forecast.between(start, start + 2 * 3600)
+    assert list(window.times) == [start, start + 3600]
+
+
+def test_window_aggregations(no_numpy):
+    """Test window min/max/mean over an hour range."""
+    forecast = HourlyForecast.from_response(_response())
+
+    assert forecast.window_min("temperature_2m", 1, 4) == 1.0
+    assert forecast.window_max("temperature_2m", 1, 4) == 3.0
+    assert forecast.window_mean("temperature_2m", 1, 4) == 2.0
+    assert math.isnan(forecast.window_mean("temperature_2m", 6, 6))
+
+
+def test_rolling_aggregations(no_numpy):
+    """Test rolling window aggregates on the array path."""
+    data = _response(hours=5)
+    data["hourly"]["temperature_2m"] = [3.0, 1.0, 4.0, 1.0, 5.0]
+    forecast = HourlyForecast.from_response(data)
+
+    assert list(forecast.rolling("temperature_2m", 3, "min")) == [1.0, 1.0, 1.0]
+    assert list(forecast.rolling("temperature_2m", 3, "max")) == [4.0, 4.0, 5.0]
+    assert list(forecast.rolling("temperature_2m", 2, "mean")) == [2.0, 2.5, 2.5, 3.0]
+    assert len(forecast.rolling("temperature_2m", 10)) == 0
+
+    with pytest.raises(ValueError, match="Window size must be positive"):
+        forecast.rolling("temperature_2m", 0)
+    with pytest.raises(ValueError, match="Unsupported aggregation"):
+        forecast.rolling("temperature_2m", 2, "median")
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_rolling_skips_missing_hours(use_numpy):
+    """Test rolling windows ignore NaN hours like the window helpers."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    data = _response(hours=6)
+    data["hourly"]["temperature_2m"] = [1.0, None, 3.0, None, None, 6.0]
+    forecast = HourlyForecast.from_response(data, use_numpy=use_numpy)
+
+    means = list(forecast.rolling("temperature_2m", 2, "mean"))
+    assert means[:3] == [1.0, 3.0, 3.0] and math.isnan(means[3]) and means[4] == 6.0
+    assert list(forecast.rolling("temperature_2m", 3, "min")) == [1.0, 3.0, 3.0, 6.0]
+    maxima = list(forecast.rolling("temperature_2m", 2, "max"))
+    assert maxima[:3] == [1.0, 3.0, 3.0] and math.isnan(maxima[3]) and maxima[4] == 6.0
+    assert forecast.rolling("temperature_2m", 3, "mean")[0] == forecast.window_mean("temperature_2m", 0, 3)
+
+
+def test_numpy_columns_match_array_columns():
+    """Test the NumPy path produces the same aggregates when available."""
+    np = pytest.importorskip("numpy")
+    forecast = HourlyForecast.from_response(_response(), use_numpy=True)
+
+    assert isinstance(forecast.column("temperature_2m"), np.ndarray)
+    assert forecast.window_max("temperature_2m") == 5.0
+    assert list(forecast.rolling("temperature_2m", 2, "mean")) == [0.5, 1.5, 2.5, 3.5, 4.5]
+
+
+def test_get_forecast_caches_per_location(monkeypatch, no_numpy):
+    """Test narrower forecast requests are served from the cached columns."""
+    service = WeatherService()
+    calls = []
+
+    def mock_fetch(city, variables, hours):
+        calls.append((list(variables), hours))
+        return _response(hours=hours, variables=variables)
+
+    monkeypatch.setattr(service.api, "fetch_forecast", mock_fetch)
+
+    full = service.get_forecast("Berlin", ["temperature_2m", "wind_speed_10m"], hours=6)
+    subset = service.get_forecast("berlin", ["wind_speed_10m"], hours=3)
+
+    assert len(full) == 6
+    assert subset.variables == ("wind_speed_10m",)
+    assert len(subset) == 3
+    assert calls == [(["temperature_2m", "wind_speed_10m"], 6)]
+    assert service.cache_hits == 1
+
+
+def test_get_forecast_widens_refetch(monkeypatch, no_numpy):
+    """Test a request outside the cached forecast refetches the union."""
+    service = WeatherService()
+    calls = []
+
+    def mock_fetch(city, variables, hours):
+        calls.append((list(variables), hours))
+        return _response(hours=hours, variables=variables)
+
+    monkeypatch.setattr(service.api, "fetch_forecast", mock_fetch)
+
+    service.get_forecast("Berlin", ["temperature_2m"], hours=12)
+    result = service.get_forecast("Berlin", ["precipitation"], hours=6)
+
+    assert calls[1] == (["temperature_2m", "precipitation"], 12)
+    assert result.variables == ("precipitation",)
+    assert len(result) == 6
+
+
+def test_get_forecast_validates_input():
+    """Test get_forecast rejects invalid arguments."""
+    service = WeatherService()
+
+    with pytest.raises(ValueError, match="Invalid city name"):
+        service.get_forecast("", ["temperature_2m"])
+    with pytest.raises(ValueError, match="Variables must be"):
+        service.get_forecast("Berlin", [])
+    with pytest.raises(ValueError, match="Variables must be"):
+        service.get_forecast("Berlin", "temperature_2m")
+    with pytest.raises(ValueError, match="Hours must be between"):
+        service.get_forecast("Berlin", ["temperature_2m"], hours=0)
+
+
+def test_nbytes_counts_column_buffers(no_numpy):
+    """Test nbytes sums the time axis and value columns."""
+    forecast = HourlyForecast.from_response(_response(hours=24))
+
+    assert forecast.nbytes == 24 * 8 + 2 * 24 * 4
+    assert forecast.select(["temperature_2m"]).nbytes == 24 * 8 + 24 * 4
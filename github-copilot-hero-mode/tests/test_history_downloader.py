@@ -0,0 +1,98 @@
+"""Unit tests for the historical bulk downloader.
+
+This module tests chunk planning, checkpoint resume, retries and archive
+writes against a stubbed API client.
+"""
+
+import threading
+
+import pytest
+
+from src.archive import ColumnarArchive
+from src.history_downloader import Checkpoint, HistoryDownloader, load_locations, plan_chunks
+
+LOCATIONS = {"berlin": (52.52, 13.405), "paris": (48.85, 2.35)}
+
+
+class StubClient:
+    """Returns one value per hour, failing the first ``failures`` calls."""
+
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def fetch_history(self, latitude, longitude, start_date, end_date, variables):
+        with self._lock:
+            self.calls.append((latitude, start_date))
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("upstream unavailable")
+        from datetime import date, datetime, timezone
+        start = datetime.combine(date.fromisoformat(start_date), datetime.min.time(), timezone.utc)
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+        times = [int(start.timestamp()) + hour * 3600 for hour in range(days * 24)]
+        return {"hourly": {"time": times, **{name: [latitude] * len(times) for name in variables}}}
+
+
+def test_plan_chunks_splits_dates_and_locations():
+    """Test the date range is split into inclusive chunks per location."""
+    chunks = plan_chunks(LOCATIONS, "2024-01-01", "2024-01-10", chunk_days=4)
+    assert [(c.location, c.start_date, c.end_date) for c in chunks] == [
+        ("berlin", "2024-01-01", "2024-01-04"), ("paris", "2024-01-01", "2024-01-04"),
+        ("berlin", "2024-01-05", "2024-01-08"), ("paris", "2024-01-05", "2024-01-08"),
+        ("berlin", "2024-01-09", "2024-01-10"), ("paris", "2024-01-09", "2024-01-10"),
+    ]
+    with pytest.raises(ValueError, match="before start"):
+        plan_chunks(LOCATIONS, "2024-02-01", "2024-01-01")
+
+
+def test_downloader_writes_archive_and_resumes(tmp_path):
+    """Test chunks land in the archive and completed ones are skipped."""
+    archive = ColumnarArchive(str(tmp_path / "archive"), ["temperature_2m"])
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.txt"))
+    chunks = plan_chunks(LOCATIONS, "2024-01-01", "2024-01-06", chunk_days=2)
+
+    client = StubClient()
+    summary = HistoryDownloader(archive, client, workers=3, checkpoint=checkpoint).run(chunks[:4])
+    assert summary == {"completed": 4, "skipped": 0, "failed": 0, "rows": 4 * 48}
+
+    # A fresh process reloads the checkpoint and only fetches the rest
+    client = StubClient()
+    summary = HistoryDownloader(archive, client, workers=3,
+                                checkpoint=Checkpoint(checkpoint.path)).run(chunks)
+    assert summary["skipped"] == 4 and summary["completed"] == 2
+    assert len(client.calls) == 2
+
+    berlin = archive.query("berlin")
+    assert len(berlin) == 6 * 24
+    assert list(berlin.times) == sorted(berlin.times)
+    assert list(archive.query("paris").column("temperature_2m")) == pytest.approx([48.85] * 6 * 24)
+    archive.close()
+
+
+def test_downloader_retries_and_reports_failures(tmp_path):
+    """Test transient errors are retried and persistent ones reported."""
+    archive = ColumnarArchive(str(tmp_path), ["temperature_2m"])
+    chunks = plan_chunks({"berlin": (52.52, 13.405)}, "2024-01-01", "2024-01-01")
+
+    summary = HistoryDownloader(archive, StubClient(failures=1), retries=1, backoff=0).run(chunks)
+    assert summary["completed"] == 1
+
+    errors = []
+    summary = HistoryDownloader(archive, StubClient(failures=5), retries=1, backoff=0).run(
+        plan_chunks({"paris": (48.85, 2.35)}, "2024-01-01", "2024-01-01"),
+        progress=lambda chunk, error: errors.append(error))
+    assert summary["failed"] == 1
+    assert isinstance(errors[0], ConnectionError)
+    archive.close()
+
+
+def test_load_locations(tmp_path):
+    """Test location files allow commas in names and comments."""
+    path = tmp_path / "locations.txt"
+    path.write_text("# name,lat,lon\nAhmedabad, India,23.03,72.58\n\nBerlin,52.52,13.405\n")
+    assert load_locations(str(path)) == {"Ahmedabad, India": (23.03, 72.58), "Berlin": (52.52, 13.405)}
+    path.write_text("Berlin,north\n")
+    with pytest.raises(ValueError, match=":1:"):
+        load_locations(str(path))
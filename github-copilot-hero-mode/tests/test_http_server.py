@@ -0,0 +1,187 @@
+"""Unit tests for the asyncio HTTP front-end.
+
+This module tests routing, pre-serialized cache hits, ETag revalidation,
+keep-alive and shared upstream fetches against a stubbed WeatherService.
+"""
+
+import asyncio
+import json
+
+from src.http_server import WeatherHTTPServer
+from src.weather_service import WeatherService
+
+MOCK_DATA = {"current_weather": {"time": "2025-11-08T12:00", "temperature": 20.0, "windspeed": 36.0}}
+
+
+def _service(calls):
+    service = WeatherService()
+
+    def mock_fetch(city):
+        calls.append(city)
+        return MOCK_DATA
+
+    service.api.fetch_weather = mock_fetch
+    return service
+
+
+async def _request(reader, writer, path, headers=""):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n{headers}\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    fields = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+    body = await reader.readexactly(int(fields.get("Content-Length", 0)))
+    return status, fields, body
+
+
+def _run(service, scenario):
+    async def main():
+        server = WeatherHTTPServer(service, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            try:
+                return await scenario(server, reader, writer)
+            finally:
+                writer.close()
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_weather_endpoint_serves_and_reuses_serialized_body():
+    """Test a miss fetches once and later hits reuse the rendered bytes."""
+    calls = []
+    service = _service(calls)
+
+    async def scenario(server, reader, writer):
+        first = await _request(reader, writer, "/weather?city=Berlin")
+        second = await _request(reader, writer, "/weather?city=berlin")
+        rendered = server._rendered["berlin"][("celsius", "kmh")]
+        third = await _request(reader, writer, "/weather?city=Berlin")
+        return first, second, third, rendered, server._rendered["berlin"][("celsius", "kmh")]
+
+    first, second, third, rendered_before, rendered_after = _run(service, scenario)
+
+    assert first[0] == 200 and json.loads(first[2]) == MOCK_DATA
+    assert second[2] == third[2] == first[2]
+    assert rendered_before is rendered_after
+    assert calls == ["Berlin"]
+    assert service.cache_hits == 2
+    assert service.cache_misses == 1
+
+
+def test_compressed_entries_reuse_serialized_body():
+    """Test hits reuse the rendered body even when entries decode to new objects."""
+    payload = dict(MOCK_DATA, hourly={"temperature_2m": [20.0] * 200})
+    service = WeatherService(compress_threshold=0)
+    service.api.fetch_weather = lambda city: payload
+    serialized = []
+
+    async def scenario(server, reader, writer):
+        await _request(reader, writer, "/weather?city=Berlin")
+        for _ in range(3):
+            await _request(reader, writer, "/weather?city=Berlin")
+            serialized.append(server._rendered["berlin"][("celsius", "kmh")])
+        return service.get_cache_stats()
+
+    stats = _run(service, scenario)
+
+    assert stats["storage"]["compressed_entries"] == 1
+    assert serialized[0] is serialized[1] is serialized[2]
+    assert stats["cache_hits"] == 3 and stats["cache_misses"] == 1
+
+
+def test_rendered_bodies_dropped_with_cache_entry():
+    """Test rendered responses are released when the cache entry goes away."""
+    calls = []
+    service = _service(calls)
+
+    async def scenario(server, reader, writer):
+        await _request(reader, writer, "/weather?city=Berlin")
+        await _request(reader, writer, "/weather?city=Berlin")
+        before = dict(server._rendered)
+        service.clear_cache()
+        return before, dict(server._rendered)
+
+    before, after = _run(service, scenario)
+
+    assert "berlin" in before
+    assert after == {}
+
+
+def test_weather_endpoint_etag_not_modified():
+    """Test If-None-Match with the current ETag returns 304."""
+    service = _service([])
+
+    async def scenario(server, reader, writer):
+        await _request(reader, writer, "/weather?city=Berlin")
+        status, headers, _ = await _request(reader, writer, "/weather?city=Berlin")
+        etag = headers["ETag"]
+        return await _request(reader, writer, "/weather?city=Berlin", f"If-None-Match: {etag}\r\n"), etag
+
+    (status, headers, body), etag = _run(service, scenario)
+
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert body == b""
+
+
+def test_weather_endpoint_converts_units():
+    """Test unit query parameters are converted from the shared entry."""
+    calls = []
+    service = _service(calls)
+
+    async def scenario(server, reader, writer):
+        await _request(reader, writer, "/weather?city=Berlin")
+        return await _request(reader, writer, "/weather?city=Berlin&temperature_unit=fahrenheit")
+
+    status, _, body = _run(service, scenario)
+
+    assert status == 200
+    assert json.loads(body)["current_weather"]["temperature"] == 68.0
+    assert calls == ["Berlin"]
+
+
+def test_weather_endpoint_errors():
+    """Test bad requests, unknown paths and upstream failures."""
+    service = WeatherService()
+
+    def failing_fetch(city):
+        raise RuntimeError("boom")
+
+    service.api.fetch_weather = failing_fetch
+
+    async def scenario(server, reader, writer):
+        return [
+            await _request(reader, writer, "/weather"),
+            await _request(reader, writer, "/weather?city=Berlin&temperature_unit=kelvin"),
+            await _request(reader, writer, "/other"),
+            await _request(reader, writer, "/weather?city=Berlin"),
+        ]
+
+    results = _run(service, scenario)
+
+    assert [status for status, _, _ in results] == [400, 400, 404, 502]
+    assert "boom" in json.loads(results[3][2])["error"]
+
+
+def test_concurrent_misses_share_one_fetch():
+    """Test simultaneous misses for one city trigger a single fetch."""
+    calls = []
+    service = _service(calls)
+
+    async def scenario(server, reader, writer):
+        async def one():
+            r, w = await asyncio.open_connection("127.0.0.1", server.port)
+            try:
+                return await _request(r, w, "/weather?city=Berlin")
+            finally:
+                w.close()
+        return await asyncio.gather(*(one() for _ in range(5)))
+
+    results = _run(service, scenario)
+
+    assert all(status == 200 for status, _, _ in results)
+    assert calls == ["Berlin"]
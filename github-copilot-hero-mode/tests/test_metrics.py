@@ -0,0 +1,134 @@
+"""Unit tests for weather metrics.
+
+This module tests sharded counters and histograms, Prometheus exposition
+output, the metrics HTTP endpoint and WeatherService instrumentation.
+"""
+
+import gc
+import threading
+import urllib.request
+
+import pytest
+import requests
+from src.metrics import (
+    Counter, Histogram, WeatherMetrics, fetch_outcome, start_metrics_server
+)
+from src.weather_service import WeatherService
+
+
+def test_counter_sums_across_threads():
+    """Test per-thread shards are summed on read."""
+    counter = Counter("test_total", "Test counter.", ["a", "b"])
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", 5)
+
+    assert counter.value("a") == 4000
+    assert counter.value("b") == 5
+
+
+def test_exited_threads_shards_are_folded():
+    """Test short-lived threads do not grow the shard list or lose counts."""
+    counter = Counter("test_total", "Test counter.", ["a"])
+    histogram = Histogram("test_seconds", "Test histogram.", ["x"], buckets=[1.0])
+
+    def work():
+        counter.inc("a", 2)
+        histogram.observe("x", 0.5)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    gc.collect()
+    counter.inc("a")
+
+    assert len(counter._shards) == 2
+    assert len(histogram._shards) == 1
+    assert counter.value("a") == 101
+    assert histogram.summary("x") == {"count": 50, "sum": 25.0}
+
+
+def test_histogram_buckets_and_render():
+    """Test observations land in cumulative le buckets."""
+    histogram = Histogram("test_seconds", "Test histogram.", ["x"], buckets=[0.1, 1.0])
+    histogram.observe("x", 0.05)
+    histogram.observe("x", 0.1)
+    histogram.observe("x", 0.5)
+    histogram.observe("x", 3.0)
+
+    lines = list(histogram.render("outcome"))
+
+    assert '# TYPE test_seconds histogram' in lines
+    assert 'test_seconds_bucket{outcome="x",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{outcome="x",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{outcome="x",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{outcome="x"} 4' in lines
+    assert histogram.summary("x") == {"count": 4, "sum": 3.65}
+
+
+def test_fetch_outcome_classifies_timeouts():
+    """Test timeouts are told apart from other errors."""
+    assert fetch_outcome(requests.exceptions.ReadTimeout()) == "timeout"
+    assert fetch_outcome(TimeoutError()) == "timeout"
+    assert fetch_outcome(requests.exceptions.HTTPError()) == "error"
+
+
+def test_weather_service_records_outcomes(monkeypatch):
+    """Test hit, miss, error and timeout outcomes are recorded."""
+    metrics = WeatherMetrics()
+    service = WeatherService(metrics=metrics)
+    responses = iter([
+        {"current_weather": {"temperature": 20}},
+        requests.exceptions.Timeout("slow"),
+        RuntimeError("boom"),
+    ])
+
+    def mock_fetch(city):
+        result = next(responses)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(service.api, "fetch_weather", mock_fetch)
+
+    service.get_weather("Berlin")
+    service.get_weather("Berlin")
+    with pytest.raises(requests.exceptions.Timeout):
+        service.get_weather("London")
+    with pytest.raises(RuntimeError):
+        service.get_weather("Paris")
+
+    assert [metrics.request_count(o) for o in ("hit", "miss", "error", "timeout")] == [1, 1, 1, 1]
+    assert metrics.cache_lookup.summary("hit")["count"] == 1
+    assert metrics.cache_lookup.summary("miss")["count"] == 3
+    assert metrics.upstream_fetch.summary("ok")["count"] == 1
+    assert metrics.upstream_fetch.summary("timeout")["count"] == 1
+    assert metrics.upstream_fetch.summary("error")["count"] == 1
+
+
+def test_metrics_http_endpoint():
+    """Test /metrics serves the exposition text."""
+    metrics = WeatherMetrics()
+    metrics.record_lookup(True, 0.000002)
+    server = start_metrics_server(metrics, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'weather_requests_total{outcome="hit"} 1' in body
+    assert 'weather_cache_lookup_seconds_count{outcome="hit"} 1' in body
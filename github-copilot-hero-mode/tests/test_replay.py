@@ -0,0 +1,126 @@
+"""Unit tests for the record/replay HTTP stand-in.
+
+This module tests fixture storage, latency specs, replaying through
+APIClient, injected errors, throttling and recording via a proxied server.
+"""
+
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+import requests
+
+from src.api_client import APIClient
+from src.replay import FixtureStore, LatencyModel, ReplayServer, TokenBucket, fixture_key
+
+MOCK_DATA = {"current_weather": {"time": "2025-11-08T12:00", "temperature": 20.5, "windspeed": 12.3}}
+
+
+def _store_with_berlin(path=None):
+    store = FixtureStore(path)
+    query = urlencode(APIClient._weather_params(None))
+    store.put(fixture_key("/v1/forecast", query), 200,
+              {"Content-Type": "application/json"}, json.dumps(MOCK_DATA).encode())
+    return store
+
+
+def _client(server):
+    client = APIClient()
+    client.base_url = server.url + "/v1/forecast"
+    return client
+
+
+def test_fixture_key_ignores_parameter_order():
+    """Test query parameter order does not change the fixture key."""
+    assert fixture_key("/v1/forecast", "b=2&a=1") == fixture_key("/v1/forecast", "a=1&b=2")
+    assert fixture_key("/v1/forecast") == "/v1/forecast"
+
+
+def test_fixture_store_round_trip(tmp_path):
+    """Test fixtures survive a save and reload."""
+    path = str(tmp_path / "fixtures.json")
+    _store_with_berlin(path).save()
+
+    reloaded = FixtureStore(path)
+    assert len(reloaded) == 1
+    fixture = next(iter(reloaded.fixtures.values()))
+    assert fixture["status"] == 200
+    assert json.loads(fixture["body"]) == MOCK_DATA
+
+
+def test_latency_model_specs():
+    """Test latency specs are parsed and sampled in seconds."""
+    assert LatencyModel("fixed:20").sample() == 0.02
+    samples = [LatencyModel("uniform:5:10", seed=1).sample() for _ in range(10)]
+    assert all(0.005 <= value <= 0.01 for value in samples)
+    assert LatencyModel("lognormal:40:0.5", seed=3).sample() == LatencyModel("lognormal:40:0.5", seed=3).sample()
+
+    for spec in ("pareto:1", "fixed", "uniform:1", "normal:a:b", "fixed:-1"):
+        with pytest.raises(ValueError):
+            LatencyModel(spec)
+
+
+def test_token_bucket_throttles_bursts():
+    """Test the token bucket refills at the configured rate."""
+    now = [0.0]
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+    assert [bucket.acquire() for _ in range(3)] == [True, True, False]
+    now[0] = 0.5
+    assert bucket.acquire() is True
+    assert bucket.acquire() is False
+
+
+def test_replay_serves_fixture_to_api_client():
+    """Test APIClient reads recorded data from a replay server."""
+    with ReplayServer(_store_with_berlin(), latency=LatencyModel("fixed:20")) as server:
+        client = _client(server)
+        started = time.perf_counter()
+        assert client.fetch_weather("Berlin") == MOCK_DATA
+        assert time.perf_counter() - started >= 0.02
+
+        # Replayed responses carry an ETag, so conditional requests work
+        first = client.fetch_weather_conditional("Berlin")
+        second = client.fetch_weather_conditional("Berlin", first.validators)
+        assert second.not_modified is True
+
+        with pytest.raises(requests.exceptions.HTTPError, match="404"):
+            client.fetch_forecast("Berlin", ["temperature_2m"], 24)
+
+    assert server.counts["served"] == 3
+    assert server.counts["missing"] == 1
+
+
+def test_replay_injects_errors_and_throttles():
+    """Test error injection and rate limiting."""
+    with ReplayServer(_store_with_berlin(), error_rate=1.0, seed=1) as server:
+        with pytest.raises(requests.exceptions.HTTPError, match="503"):
+            _client(server).fetch_weather("Berlin")
+
+    with ReplayServer(_store_with_berlin(), rate_limit=1, burst=1) as server:
+        client = _client(server)
+        client.fetch_weather("Berlin")
+        with pytest.raises(requests.exceptions.HTTPError, match="429"):
+            client.fetch_weather("Berlin")
+    assert server.counts == {"served": 1, "recorded": 0, "missing": 0, "errors": 0, "throttled": 1}
+
+
+def test_record_mode_captures_upstream_responses():
+    """Test record mode proxies upstream and stores what it saw."""
+    with ReplayServer(_store_with_berlin()) as upstream:
+        store = FixtureStore()
+        with ReplayServer(store, mode="record", upstream=upstream.url) as recorder:
+            assert _client(recorder).fetch_weather("Berlin") == MOCK_DATA
+
+    assert recorder.counts["recorded"] == 1
+    fixture = next(iter(store.fixtures.values()))
+    assert json.loads(fixture["body"]) == MOCK_DATA
+    assert "ETag" in fixture["headers"]
+
+
+def test_replay_server_validates_options():
+    """Test invalid modes and error rates are rejected."""
+    with pytest.raises(ValueError, match="Unsupported mode"):
+        ReplayServer(FixtureStore(), mode="proxy")
+    with pytest.raises(ValueError, match="Error rate"):
+        ReplayServer(FixtureStore(), error_rate=2)
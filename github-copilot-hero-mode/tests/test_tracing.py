@@ -0,0 +1,112 @@
+"""Unit tests for tracing hooks.
+
+This module tests span recording, Chrome trace export, the disabled
+tracer, and spans emitted by WeatherService, CacheManager and APIClient.
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from src.cache_manager import CacheManager
+from src.tracing import NULL_TRACER, Tracer
+from src.weather_service import WeatherService
+
+
+def test_tracer_records_nested_spans():
+    """Test nested spans are recorded with containment in time."""
+    tracer = Tracer()
+    with tracer.span("outer", city="Berlin"):
+        with tracer.span("inner"):
+            pass
+
+    inner, outer = tracer.events
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert outer["args"] == {"city": "Berlin"}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert all(event["ph"] == "X" for event in tracer.events)
+
+
+def test_tracer_marks_errors_and_calls_callback():
+    """Test failing spans carry the error type and reach the callback."""
+    seen = []
+    tracer = Tracer(on_span=seen.append)
+
+    with pytest.raises(KeyError):
+        with tracer.span("lookup"):
+            raise KeyError("missing")
+
+    assert seen[0]["args"]["error"] == "KeyError"
+
+
+def test_tracer_bounds_event_buffer():
+    """Test only the newest events are kept."""
+    tracer = Tracer(max_events=2)
+    for name in ("a", "b", "c"):
+        with tracer.span(name):
+            pass
+    assert [event["name"] for event in tracer.events] == ["b", "c"]
+
+
+def test_chrome_trace_export(tmp_path):
+    """Test the exported file is Chrome trace-event JSON."""
+    tracer = Tracer()
+    with tracer.span("work"):
+        pass
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(str(path))
+
+    data = json.loads(path.read_text())
+    assert data["traceEvents"][0]["name"] == "work"
+
+
+def test_null_tracer_is_disabled():
+    """Test the default tracer records nothing."""
+    assert NULL_TRACER.enabled is False
+    with NULL_TRACER.span("ignored"):
+        pass
+    assert CacheManager().tracer is NULL_TRACER
+
+
+@patch('src.api_client.requests.get')
+def test_weather_service_spans(mock_get):
+    """Test a cache miss traces the request, cache and HTTP phases."""
+    mock_response = Mock()
+    mock_response.content = b'{"current_weather": {"temperature": 20.5}}'
+    mock_response.json.return_value = {"current_weather": {"temperature": 20.5}}
+    mock_response.raise_for_status = Mock()
+    mock_get.return_value = mock_response
+
+    tracer = Tracer()
+    service = WeatherService(tracer=tracer)
+    service.get_weather("Berlin")
+    service.get_weather("Berlin")
+
+    names = [event["name"] for event in tracer.events]
+    assert names == [
+        "cache.get", "http.request", "http.read_body", "http.decode_json",
+        "cache.set", "weather.get_weather",
+        "cache.get", "weather.get_weather",
+    ]
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+@patch('src.api_client.requests.get')
+def test_revalidating_service_traces_http_phases(mock_get):
+    """Test conditional fetches emit the same HTTP phase spans."""
+    mock_response = Mock(status_code=200, headers={})
+    mock_response.content = b'{"current_weather": {"temperature": 20.5}}'
+    mock_response.json.return_value = {"current_weather": {"temperature": 20.5}}
+    mock_get.return_value = mock_response
+
+    tracer = Tracer()
+    service = WeatherService(tracer=tracer, revalidate=True)
+    service.get_weather("Berlin")
+
+    names = [event["name"] for event in tracer.events]
+    assert names == [
+        "cache.get", "http.request", "http.read_body", "http.decode_json",
+        "cache.set", "weather.get_weather",
+    ]
+    assert mock_get.call_args.kwargs["stream"] is True
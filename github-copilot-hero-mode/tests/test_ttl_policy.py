@@ -0,0 +1,125 @@
+"""Unit tests for TTL policies.
+
+This module tests upstream-aligned expiry computation and its integration
+with CacheManager.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from src.cache_manager import CacheManager
+from src.ttl_policy import UpstreamAlignedTTL, upstream_timestamp, upstream_interval
+
+
+def _epoch(text):
+    """Convert an Open-Meteo GMT time string to a Unix timestamp."""
+    return datetime.strptime(text, "%Y-%m-%dT%H:%M").replace(tzinfo=timezone.utc).timestamp()
+
+
+def _payload(time_text, interval=None, utc_offset=None):
+    current = {"temperature": 20.5, "time": time_text}
+    if interval is not None:
+        current["interval"] = interval
+    payload = {"current_weather": current}
+    if utc_offset is not None:
+        payload["utc_offset_seconds"] = utc_offset
+    return payload
+
+
+def test_upstream_timestamp_parses_gmt_time():
+    """Test upstream time is parsed as GMT by default."""
+    assert upstream_timestamp(_payload("2025-11-08T12:00")) == _epoch("2025-11-08T12:00")
+
+
+def test_upstream_timestamp_applies_utc_offset():
+    """Test local times are shifted back to UTC."""
+    payload = _payload("2025-11-08T17:30", utc_offset=19800)
+    assert upstream_timestamp(payload) == _epoch("2025-11-08T12:00")
+
+
+def test_upstream_timestamp_missing_or_invalid():
+    """Test payloads without a usable time field yield None."""
+    assert upstream_timestamp({}) is None
+    assert upstream_timestamp("not a dict") is None
+    assert upstream_timestamp({"current_weather": {"time": "yesterday"}}) is None
+
+
+def test_upstream_interval():
+    """Test the reported update interval is extracted."""
+    assert upstream_interval(_payload("2025-11-08T12:00", interval=900)) == 900
+    assert upstream_interval(_payload("2025-11-08T12:00")) is None
+
+
+def test_policy_expires_after_next_update():
+    """Test TTL runs until the next upstream update plus grace."""
+    policy = UpstreamAlignedTTL(interval=900, grace=30)
+    published = _epoch("2025-11-08T12:00")
+
+    ttl = policy("berlin", _payload("2025-11-08T12:00"), published + 120)
+
+    assert ttl == 900 + 30 - 120
+
+
+def test_policy_prefers_reported_interval():
+    """Test the payload's own interval overrides the configured one."""
+    policy = UpstreamAlignedTTL(interval=900, grace=0)
+    published = _epoch("2025-11-08T12:00")
+
+    assert policy("k", _payload("2025-11-08T12:00", interval=3600), published) == 3600
+
+
+def test_policy_clamps_to_bounds():
+    """Test stale upstream data falls back to min_ttl and TTLs are capped."""
+    policy = UpstreamAlignedTTL(interval=900, grace=0, min_ttl=60, max_ttl=600)
+    published = _epoch("2025-11-08T12:00")
+
+    assert policy("k", _payload("2025-11-08T12:00"), published + 5000) == 60
+    assert policy("k", _payload("2025-11-08T12:00"), published) == 600
+
+
+def test_policy_returns_none_without_time():
+    """Test the policy defers to the default TTL when time is unknown."""
+    assert UpstreamAlignedTTL()("k", {"temp": 20}, 0) is None
+
+
+def test_policy_invalid_configuration():
+    """Test invalid policy settings are rejected."""
+    with pytest.raises(ValueError, match="Interval must be positive"):
+        UpstreamAlignedTTL(interval=0)
+    with pytest.raises(ValueError, match="Grace period cannot be negative"):
+        UpstreamAlignedTTL(grace=-1)
+    with pytest.raises(ValueError, match="TTL bounds"):
+        UpstreamAlignedTTL(min_ttl=100, max_ttl=10)
+
+
+def test_cache_uses_policy_expiry():
+    """Test CacheManager expires entries at the policy-computed time."""
+    published = _epoch("2025-11-08T12:00")
+    now = [published + 100]
+    cache = CacheManager(ttl=600, ttl_policy=UpstreamAlignedTTL(grace=0),
+                         clock=lambda: now[0])
+
+    cache.set("berlin", _payload("2025-11-08T12:00"))
+    cache.set("plain", "value")
+
+    now[0] = published + 699
+    assert cache.get("plain") == "value"
+
+    now[0] = published + 899
+    assert cache.get("berlin") is not None
+    assert cache.get("plain") is None
+
+    now[0] = published + 900
+    assert cache.get("berlin") is None
+
+
+def test_cache_explicit_ttl_overrides_policy():
+    """Test an explicit TTL on set takes precedence over the policy."""
+    now = [1000.0]
+    cache = CacheManager(ttl=600, ttl_policy=lambda k, v, t: 1, clock=lambda: now[0])
+    cache.set("key", "value", ttl=50)
+
+    now[0] = 1049.0
+    assert cache.get("key") == "value"
+    now[0] = 1050.0
+    assert cache.get("key") is None
@@ -0,0 +1,104 @@
+"""Unit tests for local unit conversion.
+
+This module tests conversion of canonical weather data and that
+WeatherService shares one cache entry across unit combinations.
+"""
+
+from array import array
+
+import pytest
+from src.units import convert_column, convert_weather, forecast_conversions, validate_units
+from src.weather_service import WeatherService
+
+
+CANONICAL = {
+    "latitude": 52.52,
+    "current_weather_units": {"time": "iso8601", "temperature": "°C", "windspeed": "km/h"},
+    "current_weather": {"time": "2025-11-08T12:00", "temperature": 20.0,
+                        "windspeed": 36.0, "winddirection": 29}
+}
+
+
+def test_convert_weather_fahrenheit_and_ms():
+    """Test current weather values and unit labels are converted."""
+    result = convert_weather(CANONICAL, "fahrenheit", "ms")
+
+    assert result["current_weather"]["temperature"] == 68.0
+    assert result["current_weather"]["windspeed"] == 10.0
+    assert result["current_weather"]["winddirection"] == 29
+    assert result["current_weather_units"] == {"time": "iso8601", "temperature": "°F", "windspeed": "m/s"}
+
+
+def test_convert_weather_does_not_mutate_input():
+    """Test the cached canonical payload is left untouched."""
+    convert_weather(CANONICAL, "fahrenheit", "mph")
+    assert CANONICAL["current_weather"]["temperature"] == 20.0
+
+
+def test_convert_weather_canonical_is_identity():
+    """Test canonical units return the same object without copying."""
+    assert convert_weather(CANONICAL, "celsius", "kmh") is CANONICAL
+
+
+def test_validate_units():
+    """Test unsupported units are rejected."""
+    with pytest.raises(ValueError, match="Unsupported temperature unit"):
+        validate_units("kelvin", "kmh")
+    with pytest.raises(ValueError, match="Unsupported windspeed unit"):
+        validate_units("celsius", "beaufort")
+
+
+def test_convert_column_array():
+    """Test whole columns are converted in one pass."""
+    column = array("f", [0.0, 100.0])
+    assert list(convert_column(column, 1.8, 32.0)) == [32.0, 212.0]
+
+
+def test_forecast_conversions_selects_affected_variables():
+    """Test only temperature and wind variables are converted."""
+    conversions = forecast_conversions(
+        ["temperature_2m", "wind_speed_10m", "precipitation"], "fahrenheit", "kmh")
+    assert conversions == {"temperature_2m": (1.8, 32.0)}
+
+
+def test_weather_service_shares_cache_across_units(monkeypatch):
+    """Test different units are served from one canonical cache entry."""
+    service = WeatherService()
+    calls = []
+
+    def mock_fetch(city):
+        calls.append(city)
+        return CANONICAL
+
+    monkeypatch.setattr(service.api, "fetch_weather", mock_fetch)
+
+    celsius = service.get_weather("Berlin")
+    fahrenheit = service.get_weather("Berlin", temperature_unit="fahrenheit")
+
+    assert celsius["current_weather"]["temperature"] == 20.0
+    assert fahrenheit["current_weather"]["temperature"] == 68.0
+    assert len(calls) == 1
+    assert service.cache.size() == 1
+
+
+def test_weather_service_rejects_invalid_units():
+    """Test get_weather validates units before any fetch."""
+    service = WeatherService()
+    with pytest.raises(ValueError, match="Unsupported temperature unit"):
+        service.get_weather("Berlin", temperature_unit="kelvin")
+
+
+def test_weather_service_converts_forecast_columns(monkeypatch):
+    """Test forecast columns are converted from the canonical cache."""
+    service = WeatherService()
+    response = {"hourly": {"time": [0, 3600], "temperature_2m": [0.0, 10.0],
+                           "precipitation": [1.0, 2.0]}}
+    monkeypatch.setattr(service.api, "fetch_forecast", lambda city, variables, hours: response)
+
+    result = service.get_forecast("Berlin", ["temperature_2m", "precipitation"], hours=2,
+                                  temperature_unit="fahrenheit")
+    canonical = service.get_forecast("Berlin", ["temperature_2m"], hours=2)
+
+    assert list(result.column("temperature_2m")) == [32.0, 50.0]
+    assert list(result.column("precipitation")) == [1.0, 2.0]
+    assert list(canonical.column("temperature_2m")) == [0.0, 10.0]
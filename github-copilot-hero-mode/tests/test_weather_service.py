@@ -218,3 +218,87 @@ def test_weather_service_integration(mock_get):
     result2 = service.get_weather("Berlin")
     assert result2 == result
     assert mock_get.call_count == 1  # Still 1, not called again
+
+
+def test_weather_service_field_projection_reuses_superset(monkeypatch):
+    """Test a cached field superset serves subset requests without refetch."""
+    service = WeatherService()
+    calls = []
+    
+    def mock_fetch(city, fields=None):
+        calls.append(fields)
+        current = {"time": "2025-11-08T12:00", "temperature": 20.5, "windspeed": 12.3}
+        return {"current_weather": {k: v for k, v in current.items() if k == "time" or k in fields}}
+    
+    monkeypatch.setattr(service.api, "fetch_weather", mock_fetch)
+    
+    both = service.get_weather("Berlin", fields=["temperature", "windspeed"])
+    temperature = service.get_weather("berlin", fields=["temperature"])
+    
+    assert calls == [["temperature", "windspeed"]]
+    assert both["current_weather"] == {"time": "2025-11-08T12:00", "temperature": 20.5, "windspeed": 12.3}
+    assert temperature["current_weather"] == {"time": "2025-11-08T12:00", "temperature": 20.5}
+    assert service.cache_hits == 1
+    
+    # A field outside the cached projection needs a fetch
+    service.get_weather("Berlin", fields=["winddirection"])
+    assert calls[-1] == ["winddirection"]
+
+
+def test_weather_service_full_entry_serves_projection(monkeypatch):
+    """Test a full cached response answers field-projected requests."""
+    service = WeatherService()
+    mock_data = {"current_weather": {"time": "2025-11-08T12:00", "temperature": 20.5, "windspeed": 12.3}}
+    monkeypatch.setattr(service.api, "fetch_weather", lambda city: mock_data)
+    
+    service.get_weather("Berlin")
+    result = service.get_weather("Berlin", fields=["windspeed"])
+    
+    assert result["current_weather"] == {"time": "2025-11-08T12:00", "windspeed": 12.3}
+    assert service.cache_hits == 1
+    assert service.cache_misses == 1
+
+
+def test_weather_service_revalidates_expired_entry(monkeypatch):
+    """Test an unchanged upstream response only extends the cached entry."""
+    from src.api_client import FetchResult
+    
+    service = WeatherService(cache_ttl=10, revalidate=True)
+    now = [0.0]
+    service.cache.clock = lambda: now[0]
+    mock_data = {"current_weather": {"temperature": 20.5}}
+    calls = []
+    
+    def mock_fetch(city, validators=None):
+        calls.append(validators)
+        if validators:
+            return FetchResult(None, validators, True)
+        return FetchResult(mock_data, {"content_hash": "abc"}, False)
+    
+    monkeypatch.setattr(service.api, "fetch_weather_conditional", mock_fetch)
+    
+    assert service.get_weather("Berlin") == mock_data
+    now[0] = 15.0
+    assert service.get_weather("Berlin") == mock_data
+    assert service.get_weather("Berlin") == mock_data
+    
+    assert calls == [None, {"content_hash": "abc"}]
+    stats = service.get_cache_stats()
+    assert stats['cache_misses'] == 2
+    assert stats['revalidated'] == 1
+    assert stats['cache_hits'] == 1
+
+
+def test_weather_service_refetches_on_304_without_stored_value(monkeypatch):
+    """Test a 304 with nothing stored to keep falls back to a full fetch."""
+    from src.api_client import FetchResult
+    
+    service = WeatherService(revalidate=True)
+    mock_data = {"current_weather": {"temperature": 20.5}}
+    monkeypatch.setattr(service.api, "fetch_weather_conditional",
+                        lambda city, validators=None: FetchResult(None, {}, True))
+    monkeypatch.setattr(service.api, "fetch_weather", lambda city: mock_data)
+    
+    assert service.get_weather("Berlin") == mock_data
+    assert service.get_weather("Berlin") == mock_data
+    assert service.get_cache_stats()['revalidated'] == 0
@@ -3,75 +3,347 @@ Data analyzer module.
 Performs statistical analysis and calculations on data.
 """
 
-from typing import Dict, Any, Optional, List
-from utils.data_utils import file_exists, read_csv_file, clean_numeric_field
-from utils.math_utils import round_to_decimal_places, calculate_statistics
+from itertools import chain
+from typing import Dict, Any, Optional, List, Iterable
+from utils.data_utils import file_exists, iter_csv_rows, clean_numeric_field
+from utils.math_utils import round_to_decimal_places, RunningStats
+from utils.checkpoint import (
+    load_checkpoint, save_checkpoint, fingerprint_region, region_unchanged, complete_row_ranges
+)
+from utils.date_index import iter_date_range_rows
+from utils.parallel import WORKER_LOGGER, iter_range_rows, map_row_ranges
+from utils.result_cache import ResultCache
 from utils.logging_utils import (
     setup_logger, log_info, log_error,
     format_report_header, format_report_footer, format_currency
 )
 
 
-def analyze_sales_data(data_file: str) -> Optional[Dict[str, Any]]:
+# The only columns the analysis reads; other fields are never materialized
+ANALYSIS_COLUMNS = ['product', 'amount', 'quantity']
+
+# Suffix of the incremental analysis checkpoint written next to the data file
+CHECKPOINT_SUFFIX = '.analysis'
+
+CHECKPOINT_VERSION = 1
+
+
+def analyze_sales_data(data_file: str, workers: int = 1, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None, incremental: bool = False,
+                       cache: Optional[ResultCache] = None) -> Optional[Dict[str, Any]]:
     """
     Analyze sales data and calculate statistics.
     
     Args:
         data_file: Path to the CSV data file
+        workers: Number of processes; above 1 the file is split into
+            row-aligned byte ranges analyzed in parallel (results are
+            identical to the serial path)
+        date_from: Only analyze rows dated on or after this ISO date
+        date_to: Only analyze rows dated on or before this ISO date; with
+            either date the file must be ordered by date and is read
+            serially through its date index (see utils.date_index), so a
+            date range cannot be combined with workers above 1 or incremental
+        incremental: Resume from the checkpoint saved by the previous
+            incremental run and parse only the rows appended since (see
+            summarize_incremental). Runs serially, so it cannot be
+            combined with workers above 1
+        cache: Result cache; while the file and date range are unchanged
+            the stored results are returned without reading the file
         
     Returns:
         Dictionary containing analysis results, or None if error occurs
+        (including options that cannot be combined; see
+        validate_analysis_options)
     """
     # Set up logger
     logger = setup_logger('analyzer')
     
     log_info(logger, "Starting data analysis...")
     
+    option_error = validate_analysis_options(workers, date_from, date_to, incremental)
+    if option_error is not None:
+        log_error(logger, f"Error: {option_error}")
+        return None
+    
     # Check if file exists
     if not file_exists(data_file):
         log_error(logger, f"Error: File {data_file} not found")
         return None
     
-    # Read CSV data
-    log_info(logger, f"Loading data from {data_file}...")
-    data = read_csv_file(data_file)
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = cache.key(data_file, {'result': 'analysis', 'date_from': date_from, 'date_to': date_to})
+        except OSError:
+            log_error(logger, "Error reading file")
+            return None
+        results = cache.get(cache_key)
+        if results is not None:
+            log_info(logger, f"Using cached analysis of {data_file}")
+            print_analysis_results(logger, results['amount_stats'], results['quantity_stats'],
+                                   results['product_stats'])
+            log_info(logger, "Analysis completed successfully")
+            return results
     
-    if data is None:
+    # Stream CSV data through the accumulators one row at a time
+    log_info(logger, f"Loading data from {data_file}...")
+    try:
+        if date_from is not None or date_to is not None:
+            rows = iter_date_range_rows(data_file, date_from, date_to, ANALYSIS_COLUMNS)
+            summary = summarize_rows(rows, logger)
+        elif incremental:
+            summary = summarize_incremental(data_file, logger)
+        elif workers > 1:
+            summary = summarize_rows([], logger)
+            for part in map_row_ranges(_summarize_range, data_file, workers):
+                merge_summaries(summary, part)
+        else:
+            summary = summarize_rows(iter_csv_rows(data_file, columns=ANALYSIS_COLUMNS), logger)
+    except Exception:
         log_error(logger, "Error reading file")
         return None
     
-    log_info(logger, f"Loaded {len(data)} records")
+    log_info(logger, f"Loaded {summary['records']} records")
     
-    # Extract and clean numeric data
-    amounts, quantities = extract_numeric_data(data, logger)
+    # Finalize amount and quantity statistics
+    amount_stats = summary['amount'].to_dict() if summary['amount'].count else {}
+    quantity_stats = summary['quantity'].to_dict() if summary['quantity'].count else {}
     
-    # Calculate amount statistics
-    amount_stats = calculate_statistics(amounts) if amounts else {}
-    
-    # Calculate quantity statistics
-    quantity_stats = calculate_statistics(quantities) if quantities else {}
-    
-    # Calculate product-wise statistics
-    product_stats = calculate_product_statistics(data)
+    # Finalize product-wise statistics
+    product_stats = finalize_product_statistics(summary['products'])
     
     # Print analysis results
     print_analysis_results(logger, amount_stats, quantity_stats, product_stats)
     
     log_info(logger, "Analysis completed successfully")
     
-    return {
+    results = {
         'amount_stats': amount_stats,
         'quantity_stats': quantity_stats,
         'product_stats': product_stats
     }
+    if cache_key is not None:
+        try:
+            cache.put(cache_key, results)
+        except OSError as e:
+            log_error(logger, "Error writing result cache", e)
+    return results
+
+
+def validate_analysis_options(workers: int, date_from: Optional[str], date_to: Optional[str],
+                              incremental: bool) -> Optional[str]:
+    """
+    Check that the analyze_sales_data options can be combined.
+    
+    Parallel workers, a date range and incremental analysis each choose a
+    different way of reading the file, so at most one can be used.
+    
+    Args:
+        workers: Number of processes
+        date_from: First date of the range, or None
+        date_to: Last date of the range, or None
+        incremental: Whether incremental analysis is requested
+        
+    Returns:
+        Description of the conflict, or None if the options are compatible
+    """
+    modes = []
+    if workers > 1:
+        modes.append('workers > 1')
+    if date_from is not None or date_to is not None:
+        modes.append('a date range')
+    if incremental:
+        modes.append('incremental')
+    if len(modes) > 1:
+        return f"Cannot combine {' and '.join(modes)}; use only one of them"
+    return None
+
+
+def summarize_rows(rows: Iterable[Dict[str, Any]], logger) -> Dict[str, Any]:
+    """
+    Accumulate amount, quantity and per-product statistics in one pass.
+    
+    Args:
+        rows: Raw data rows
+        logger: Logger instance
+        
+    Returns:
+        Dictionary with the record count, amount and quantity RunningStats
+        and running per-product totals (see update_product_statistics)
+    """
+    summary = {'records': 0, 'amount': RunningStats(), 'quantity': RunningStats(), 'products': {}}
+    amount_accumulator = summary['amount']
+    quantity_accumulator = summary['quantity']
+    product_totals = summary['products']
+    
+    for row in rows:
+        summary['records'] += 1
+        amount, quantity = extract_row_numbers(row, logger)
+        if amount is not None:
+            amount_accumulator.add(amount)
+        if quantity is not None:
+            quantity_accumulator.add(quantity)
+        update_product_statistics(product_totals, row.get('product'), amount, quantity)
+    
+    return summary
+
+
+def summarize_incremental(data_file: str, logger) -> Dict[str, Any]:
+    """
+    Summarize an append-only file, reusing the saved summary of the rows
+    already processed.
+    
+    The checkpoint stores the byte offset reached, fingerprints of the
+    processed region and the summary. If the region is unchanged, only
+    the rows after the offset are parsed and merged into the saved
+    summary; if the file was truncated or rewritten, it is summarized
+    from the start. An incomplete trailing row is left for the next run.
+    
+    Args:
+        data_file: Path to the CSV data file
+        logger: Logger instance
+        
+    Returns:
+        Summary of the whole file, as from summarize_rows
+        
+    Raises:
+        OSError: If the file or checkpoint cannot be read or written
+    """
+    checkpoint_file = data_file + CHECKPOINT_SUFFIX
+    checkpoint = load_checkpoint(checkpoint_file)
+    if (checkpoint is not None and checkpoint.get('version') == CHECKPOINT_VERSION
+            and region_unchanged(data_file, checkpoint.get('region'))):
+        start = checkpoint['region']['offset']
+        summary = summary_from_state(checkpoint['summary'])
+        log_info(logger, f"Resuming from byte {start} after {summary['records']} records")
+    else:
+        start = 0
+        summary = summarize_rows([], logger)
+    
+    fieldnames, ranges = complete_row_ranges(data_file, start or None)
+    if not ranges and start:
+        return summary
+    
+    rows = chain.from_iterable(iter_range_rows(data_file, fieldnames, range_start, range_end, ANALYSIS_COLUMNS)
+                               for range_start, range_end in ranges)
+    merge_summaries(summary, summarize_rows(rows, logger))
+    
+    offset = ranges[-1][1] if ranges else start
+    save_checkpoint(checkpoint_file, {
+        'version': CHECKPOINT_VERSION,
+        'region': fingerprint_region(data_file, offset),
+        'summary': summary_to_state(summary)
+    })
+    return summary
+
+
+def summary_to_state(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a summary to JSON-serializable values.
+    
+    Args:
+        summary: Summary from summarize_rows
+        
+    Returns:
+        Dictionary accepted by summary_from_state
+    """
+    return {
+        'records': summary['records'],
+        'amount': summary['amount'].get_state(),
+        'quantity': summary['quantity'].get_state(),
+        'products': {
+            product: {
+                'total_amount': stats['total_amount'].get_state(),
+                'total_quantity': stats['total_quantity'],
+                'count': stats['count']
+            }
+            for product, stats in summary['products'].items()
+        }
+    }
+
+
+def summary_from_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Restore a summary saved with summary_to_state.
+    
+    Args:
+        state: Dictionary from summary_to_state
+        
+    Returns:
+        Summary that can be merged with further summaries
+    """
+    return {
+        'records': state['records'],
+        'amount': RunningStats.from_state(state['amount']),
+        'quantity': RunningStats.from_state(state['quantity']),
+        'products': {
+            product: {
+                'total_amount': RunningStats.from_state(stats['total_amount']),
+                'total_quantity': stats['total_quantity'],
+                'count': stats['count']
+            }
+            for product, stats in state['products'].items()
+        }
+    }
 
 
-def extract_numeric_data(data: List[Dict[str, Any]], logger) -> tuple[List[float], List[int]]:
+def merge_summaries(summary: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the summary of a later part of the file into a summary.
+    
+    Args:
+        summary: Summary from summarize_rows, updated in place
+        other: Summary of the rows that follow
+        
+    Returns:
+        The updated summary
+    """
+    summary['records'] += other['records']
+    summary['amount'].merge(other['amount'])
+    summary['quantity'].merge(other['quantity'])
+    merge_product_statistics(summary['products'], other['products'])
+    return summary
+
+
+def _summarize_range(filepath: str, fieldnames: List[str], start: int, end: int, index: int) -> Dict[str, Any]:
+    """Worker for parallel analysis: summarize one byte range of the file."""
+    rows = iter_range_rows(filepath, fieldnames, start, end, ANALYSIS_COLUMNS)
+    return summarize_rows(rows, WORKER_LOGGER)
+
+
+def extract_row_numbers(row: Dict[str, Any], logger) -> tuple[Optional[float], Optional[int]]:
+    """
+    Extract and clean the numeric fields of a single row.
+    
+    Args:
+        row: Data row
+        logger: Logger instance
+        
+    Returns:
+        Tuple of (rounded amount or None, quantity or None)
+    """
+    # Clean amount field
+    amount = clean_numeric_field(row.get('amount'), float)
+    if amount is not None:
+        amount = round_to_decimal_places(amount)
+    
+    # Clean quantity field
+    quantity = clean_numeric_field(row.get('quantity'), int)
+    
+    # Log if both fields are invalid
+    if amount is None and quantity is None:
+        log_info(logger, "Skipping invalid row")
+    
+    return amount, quantity
+
+
+def extract_numeric_data(data: Iterable[Dict[str, Any]], logger) -> tuple[List[float], List[int]]:
     """
     Extract and clean numeric data from rows.
     
     Args:
-        data: List of data rows
+        data: Data rows
         logger: Logger instance
         
     Returns:
@@ -81,60 +353,90 @@ def extract_numeric_data(data: List[Dict[str, Any]], logger) -> tuple[List[float
     quantities = []
     
     for row in data:
-        # Clean amount field
-        amount = clean_numeric_field(row.get('amount'), float)
+        amount, quantity = extract_row_numbers(row, logger)
         if amount is not None:
-            amounts.append(round_to_decimal_places(amount))
-        
-        # Clean quantity field
-        quantity = clean_numeric_field(row.get('quantity'), int)
+            amounts.append(amount)
         if quantity is not None:
             quantities.append(quantity)
-        
-        # Log if both fields are invalid
-        if amount is None and quantity is None:
-            log_info(logger, "Skipping invalid row")
     
     return amounts, quantities
 
 
-def calculate_product_statistics(data: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+def update_product_statistics(
+    product_stats: Dict[str, Dict[str, Any]],
+    product: Optional[str],
+    amount: Optional[float],
+    quantity: Optional[int]
+) -> None:
     """
-    Calculate statistics grouped by product.
+    Add one row to the running per-product totals.
+    
+    Amount totals are RunningStats, so totals merged from parallel parts
+    equal the serial totals exactly.
+    
+    Args:
+        product_stats: Running totals keyed by product
+        product: Product name
+        amount: Rounded amount, or None if invalid
+        quantity: Quantity, or None if invalid
+    """
+    if not product or amount is None or quantity is None:
+        return
+    
+    # Initialize product entry if needed
+    if product not in product_stats:
+        product_stats[product] = {
+            'total_amount': RunningStats(),
+            'total_quantity': 0,
+            'count': 0
+        }
+    
+    # Aggregate values
+    product_stats[product]['total_amount'].add(amount)
+    product_stats[product]['total_quantity'] += quantity
+    product_stats[product]['count'] += 1
+
+
+def merge_product_statistics(
+    product_stats: Dict[str, Dict[str, Any]],
+    other: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge running per-product totals into another set of running totals.
     
     Args:
-        data: List of data rows
+        product_stats: Running totals keyed by product, updated in place
+        other: Running totals to add
         
     Returns:
-        Dictionary mapping products to their statistics
+        The updated running totals
     """
-    product_stats = {}
+    for product, stats in other.items():
+        if product not in product_stats:
+            product_stats[product] = {
+                'total_amount': RunningStats(),
+                'total_quantity': 0,
+                'count': 0
+            }
+        product_stats[product]['total_amount'].merge(stats['total_amount'])
+        product_stats[product]['total_quantity'] += stats['total_quantity']
+        product_stats[product]['count'] += stats['count']
     
-    for row in data:
-        product = row.get('product')
-        amount = clean_numeric_field(row.get('amount', 0), float)
-        quantity = clean_numeric_field(row.get('quantity', 0), int)
+    return product_stats
+
+
+def finalize_product_statistics(product_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Calculate averages and round the running per-product totals.
+    
+    Args:
+        product_stats: Running totals keyed by product
         
-        if product and amount is not None and quantity is not None:
-            # Round amount
-            amount = round_to_decimal_places(amount)
-            
-            # Initialize product entry if needed
-            if product not in product_stats:
-                product_stats[product] = {
-                    'total_amount': 0.0,
-                    'total_quantity': 0,
-                    'count': 0
-                }
-            
-            # Aggregate values
-            product_stats[product]['total_amount'] += amount
-            product_stats[product]['total_quantity'] += quantity
-            product_stats[product]['count'] += 1
-    
-    # Calculate averages and round totals
+    Returns:
+        Dictionary mapping products to their statistics
+    """
     for product in product_stats:
-        total = product_stats[product]['total_amount']
+        total = product_stats[product]['total_amount'].total
         count = product_stats[product]['count']
         
         product_stats[product]['total_amount'] = round_to_decimal_places(total)
@@ -143,6 +445,28 @@ def calculate_product_statistics(data: List[Dict[str, Any]]) -> Dict[str, Dict[s
     return product_stats
 
 
+def calculate_product_statistics(data: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Calculate statistics grouped by product.
+    
+    Args:
+        data: Data rows
+        
+    Returns:
+        Dictionary mapping products to their statistics
+    """
+    product_stats = {}
+    
+    for row in data:
+        amount = clean_numeric_field(row.get('amount', 0), float)
+        quantity = clean_numeric_field(row.get('quantity', 0), int)
+        if amount is not None:
+            amount = round_to_decimal_places(amount)
+        update_product_statistics(product_stats, row.get('product'), amount, quantity)
+    
+    return finalize_product_statistics(product_stats)
+
+
 def print_analysis_results(
     logger,
     amount_stats: Dict[str, Any],
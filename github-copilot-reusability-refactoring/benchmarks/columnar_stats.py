@@ -0,0 +1,166 @@
+"""
+Columnar loader and vectorized statistics benchmark.
+
+Compares the row-based path (read_csv_file, extract_numeric_data,
+calculate_statistics, calculate_product_statistics) with
+load_sales_columns plus column_statistics and column_product_statistics,
+timing loading and statistics separately, with and without NumPy.
+Speedups are relative to the row-based path with the original builtin
+statistics (sum, min and max); each columnar result is checked against
+the row-based path with calculate_statistics, whose totals are exact.
+The synthetic file has an invalid amount or quantity in every
+--invalid-every'th row.
+
+Usage:
+    python -m benchmarks.columnar_stats [--rows 10000000] [--invalid-every 100] [--file sales.csv]
+"""
+
+import argparse
+import csv
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from analyzer import extract_numeric_data, calculate_product_statistics
+from utils.columnar import load_sales_columns, column_statistics, column_product_statistics, _numpy
+from utils.data_utils import read_csv_file
+from utils.math_utils import (
+    calculate_statistics, calculate_sum, calculate_minimum, calculate_maximum,
+    round_to_decimal_places
+)
+from benchmarks.peak_rss import write_synthetic_csv
+
+
+def write_invalid_rows(source: str, target: str, every: int) -> None:
+    """
+    Copy a sales CSV, breaking the amount or quantity of every Nth row.
+    
+    Args:
+        source: Input CSV path
+        target: Output CSV path
+        every: Break one row in this many (alternating amount and quantity)
+    """
+    with open(source, newline='') as infile, open(target, 'w', newline='') as outfile:
+        reader = csv.reader(infile)
+        writer = csv.writer(outfile)
+        header = next(reader)
+        writer.writerow(header)
+        columns = [header.index('amount'), header.index('quantity')]
+        for index, row in enumerate(reader):
+            if index % every == every - 1:
+                row[columns[index // every % 2]] = 'n/a'
+            writer.writerow(row)
+
+
+def builtin_statistics(values: List[float]) -> Dict[str, Any]:
+    """
+    Calculate statistics as calculate_statistics originally did, with sum, min and max.
+    
+    Args:
+        values: List of numbers
+        
+    Returns:
+        Dictionary containing total, average, min, max, and count
+    """
+    if not values:
+        return calculate_statistics(values)
+    total = calculate_sum(values)
+    return {
+        'total': round_to_decimal_places(total),
+        'average': round_to_decimal_places(total / len(values)),
+        'min': round_to_decimal_places(calculate_minimum(values)),
+        'max': round_to_decimal_places(calculate_maximum(values)),
+        'count': len(values)
+    }
+
+
+def time_row_based(data_file: str,
+                   statistics: Callable[[List[float]], Dict[str, Any]] = calculate_statistics
+                   ) -> tuple[float, float, dict]:
+    """
+    Time the list-of-dicts path.
+    
+    Args:
+        data_file: Path to the CSV file
+        statistics: Function computing the amount and quantity statistics
+        
+    Returns:
+        Tuple of (load seconds, statistics seconds, amount, quantity and
+        product statistics)
+    """
+    logger = logging.getLogger('benchmark')
+    started = time.perf_counter()
+    data = read_csv_file(data_file)
+    loaded = time.perf_counter()
+    amounts, quantities = extract_numeric_data(data, logger)
+    results = {
+        'amount': statistics(amounts),
+        'quantity': statistics(quantities),
+        'products': calculate_product_statistics(data)
+    }
+    return loaded - started, time.perf_counter() - loaded, results
+
+
+def time_columnar(data_file: str, use_numpy: bool) -> tuple[float, float, dict]:
+    """
+    Time the columnar path.
+    
+    Returns:
+        Tuple of (load seconds, statistics seconds, amount, quantity and
+        product statistics)
+    """
+    started = time.perf_counter()
+    columns = load_sales_columns(data_file, use_numpy=use_numpy)
+    loaded = time.perf_counter()
+    results = {
+        'amount': column_statistics(columns.amount, columns.amount_valid),
+        'quantity': column_statistics(columns.quantity, columns.quantity_valid),
+        'products': column_product_statistics(columns)
+    }
+    return loaded - started, time.perf_counter() - loaded, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--invalid-every', type=int, default=100,
+                        help="Break the amount or quantity of one synthetic row in this many")
+    parser.add_argument('--file', help="Existing CSV to use instead of a synthetic one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_file = args.file
+        if data_file is None:
+            valid_file = os.path.join(workdir, 'valid.csv')
+            data_file = os.path.join(workdir, 'sales.csv')
+            write_synthetic_csv(valid_file, args.rows)
+            write_invalid_rows(valid_file, data_file, args.invalid_every)
+            os.remove(valid_file)
+
+        runs = [('row (builtins)', lambda: time_row_based(data_file, builtin_statistics)),
+                ('row-based', lambda: time_row_based(data_file)),
+                ('columnar (array)', lambda: time_columnar(data_file, False))]
+        if _numpy() is not None:
+            runs.append(('columnar (numpy)', lambda: time_columnar(data_file, True)))
+
+        baseline = None
+        expected = None
+        for name, run in runs:
+            load_seconds, stats_seconds, results = run()
+            total = load_seconds + stats_seconds
+            if baseline is None:
+                baseline = (stats_seconds, total)
+            elif expected is None:
+                expected = results
+            else:
+                assert results == expected, f"{name} statistics differ from the row-based path"
+            print(f"{name:<18} load {load_seconds:7.2f}s  stats {stats_seconds:7.3f}s "
+                  f"({baseline[0] / stats_seconds:6.1f}x)  total {total:7.2f}s "
+                  f"({baseline[1] / total:4.1f}x)  amounts {results['amount']['count']:,}  "
+                  f"sum {results['amount']['total']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
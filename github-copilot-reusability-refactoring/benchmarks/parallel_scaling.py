@@ -0,0 +1,78 @@
+"""
+Parallel scaling benchmark for the analyzer and cleaner.
+
+Runs analyze_sales_data and clean_csv_data on one synthetic file with
+1, 2, 4, ... up to --max-workers processes, checks that every parallel
+result matches the serial one exactly and reports speedup over 1 worker.
+
+Usage:
+    python -m benchmarks.parallel_scaling [--rows 5000000] [--file sales.csv] [--max-workers N]
+"""
+
+import argparse
+import filecmp
+import logging
+import os
+import tempfile
+import time
+
+from analyzer import analyze_sales_data
+from data_cleaner import clean_csv_data
+from benchmarks.peak_rss import write_synthetic_csv
+
+
+def worker_counts(max_workers: int) -> list:
+    """Return 1, 2, 4, ... up to and including max_workers."""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--file', help="Existing CSV to use instead of a synthetic one")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Keep the entry points' own logging out of the timings table
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_file = args.file
+        if data_file is None:
+            data_file = os.path.join(workdir, 'sales.csv')
+            write_synthetic_csv(data_file, args.rows)
+        print(f"Input: {os.path.getsize(data_file) / 2**20:,.1f} MiB, {os.cpu_count()} CPUs")
+
+        serial_output = os.path.join(workdir, 'clean_1.csv')
+        baseline = {}
+        expected = None
+        for workers in worker_counts(args.max_workers):
+            started = time.perf_counter()
+            result = analyze_sales_data(data_file, workers=workers)
+            analyze_seconds = time.perf_counter() - started
+
+            output = os.path.join(workdir, f'clean_{workers}.csv')
+            started = time.perf_counter()
+            clean_csv_data(data_file, output, workers=workers)
+            clean_seconds = time.perf_counter() - started
+
+            if expected is None:
+                expected = result
+                baseline = {'analyze': analyze_seconds, 'clean': clean_seconds}
+            matches = result == expected and filecmp.cmp(output, serial_output, shallow=False)
+            if output != serial_output:
+                os.remove(output)
+
+            print(f"workers {workers:>3}  analyze {analyze_seconds:7.2f}s "
+                  f"({baseline['analyze'] / analyze_seconds:4.1f}x)  clean {clean_seconds:7.2f}s "
+                  f"({baseline['clean'] / clean_seconds:4.1f}x)  matches serial: {matches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Peak memory benchmark for the streaming entry points.
+
+Writes a synthetic sales CSV (10 million rows by default), then runs
+analyze_sales_data, generate_report and clean_csv_data each in a fresh
+subprocess and reports the peak resident set size of that process. With
+--legacy, the list-materializing read_csv_file is measured as well for
+comparison (expect several GB at the default size).
+
+Usage:
+    python -m benchmarks.peak_rss [--rows 10000000] [--file sales.csv] [--legacy]
+"""
+
+import argparse
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PRODUCTS = ['Widget A', 'Widget B', 'Gadget X', 'Gadget Y', 'Gizmo Z']
+
+ENTRY_POINTS = {
+    'baseline': "import analyzer, report_generator, data_cleaner",
+    'analyzer': "from analyzer import analyze_sales_data; analyze_sales_data(DATA)",
+    'report_generator': "from report_generator import generate_report; generate_report(DATA)",
+    'data_cleaner': "from data_cleaner import clean_csv_data; clean_csv_data(DATA, OUTPUT)",
+    'read_csv_file (legacy)': "from utils.data_utils import read_csv_file; read_csv_file(DATA)",
+}
+
+MEASURE = """
+import resource, sys
+DATA, OUTPUT = sys.argv[1], sys.argv[2]
+{statement}
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(peak if sys.platform == 'darwin' else peak * 1024)
+"""
+
+
+def write_synthetic_csv(filepath: str, rows: int, seed: int = 1) -> None:
+    """
+    Write a synthetic sales CSV with the same columns as sales_data.csv.
+    
+    Args:
+        filepath: Output path
+        rows: Number of data rows
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['date', 'product', 'amount', 'quantity'])
+        for index in range(rows):
+            writer.writerow([
+                f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+                rng.choice(PRODUCTS),
+                f"{rng.uniform(1, 500):.2f}",
+                rng.randint(1, 20)
+            ])
+
+
+def measure_peak_rss(statement: str, data_file: str, output_file: str) -> tuple[int, float]:
+    """
+    Run a statement in a fresh interpreter and return its peak RSS.
+    
+    Args:
+        statement: Python statement using DATA and OUTPUT
+        data_file: Input CSV path
+        output_file: Output CSV path for the cleaner
+        
+    Returns:
+        Tuple of (peak RSS in bytes, elapsed seconds)
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', MEASURE.format(statement=statement), data_file, output_file],
+        cwd=project_root, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, check=True
+    )
+    return int(result.stdout.split()[-1]), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--file', help="Existing CSV to use instead of a synthetic one")
+    parser.add_argument('--legacy', action='store_true',
+                        help="Also measure the list-materializing read_csv_file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_file = args.file
+        if data_file is None:
+            data_file = os.path.join(workdir, 'sales.csv')
+            started = time.perf_counter()
+            write_synthetic_csv(data_file, args.rows)
+            print(f"Wrote {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+        print(f"Input: {os.path.getsize(data_file) / 2**20:,.1f} MiB")
+
+        output_file = os.path.join(workdir, 'sales_clean.csv')
+        for name, statement in ENTRY_POINTS.items():
+            if name.endswith('(legacy)') and not args.legacy:
+                continue
+            peak, elapsed = measure_peak_rss(statement, data_file, output_file)
+            print(f"{name:<24} peak RSS {peak / 2**20:8.1f} MiB  {elapsed:7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
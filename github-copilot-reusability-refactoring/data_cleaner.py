@@ -3,23 +3,30 @@ Data cleaning module.
 Handles data validation, cleaning, and normalization.
 """
 
-from typing import List, Dict, Any, Optional
+import csv
+import os
+import shutil
+import tempfile
+from itertools import chain
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from utils.data_utils import (
-    file_exists, read_csv_file, write_csv_file,
-    clean_numeric_field, clean_text_field,
-    validate_required_fields, validate_csv_structure
+    SALES_FIELDS, file_exists, iter_csv_rows, write_csv_rows,
+    clean_sales_row, validate_csv_structure
 )
-from utils.math_utils import round_to_decimal_places, validate_positive_number
 from utils.logging_utils import setup_logger, log_info, log_error
+from utils.parallel import WORKER_LOGGER, iter_range_rows, map_row_ranges
 
 
-def clean_csv_data(input_file: str, output_file: str) -> bool:
+def clean_csv_data(input_file: str, output_file: str, workers: int = 1) -> bool:
     """
     Clean CSV data and write to output file.
     
     Args:
         input_file: Path to input CSV file
         output_file: Path to output CSV file
+        workers: Number of processes; above 1 the file is split into
+            row-aligned byte ranges cleaned in parallel (the output file is
+            identical to the serial one)
         
     Returns:
         True if successful, False otherwise
@@ -34,91 +41,157 @@ def clean_csv_data(input_file: str, output_file: str) -> bool:
         log_error(logger, f"Error: Input file {input_file} not found")
         return False
     
-    # Read input data
+    if workers > 1:
+        return clean_csv_data_parallel(input_file, output_file, workers, logger)
+    
+    # Stream input rows through the cleaner into the output file
     log_info(logger, f"Reading data from {input_file}...")
-    data = read_csv_file(input_file)
+    counts = {'read': 0, 'invalid': 0}
+    clean_rows = iter_clean_rows(iter_csv_rows(input_file, columns=SALES_FIELDS), logger, counts)
     
-    if data is None:
+    try:
+        first_row = next(clean_rows, None)
+    except (OSError, csv.Error, ValueError):
         log_error(logger, "Error reading file")
         return False
     
-    log_info(logger, f"Loaded {len(data)} records")
+    if first_row is None:
+        log_info(logger, f"Loaded {counts['read']} records")
+        log_info(logger, f"Cleaned 0 records, skipped {counts['invalid']} invalid records")
+        log_info(logger, "No valid data to write")
+        return False
     
-    # Clean and validate data
-    clean_data, invalid_count = clean_and_validate_rows(data, logger)
+    # Write cleaned data to output file
+    log_info(logger, f"Writing cleaned data to {output_file}...")
+    try:
+        written = write_csv_rows(output_file, chain([first_row], clean_rows), SALES_FIELDS)
+    except (OSError, csv.Error, ValueError):
+        # The output file is only replaced once every row is written
+        log_error(logger, "Error reading file")
+        return False
     
-    log_info(logger, f"Cleaned {len(clean_data)} records, skipped {invalid_count} invalid records")
+    if written is None:
+        log_error(logger, "Error writing output file")
+        return False
     
-    # Write cleaned data to output file
-    if clean_data:
-        log_info(logger, f"Writing cleaned data to {output_file}...")
-        fieldnames = ['date', 'product', 'amount', 'quantity']
-        success = write_csv_file(output_file, clean_data, fieldnames)
+    log_info(logger, f"Loaded {counts['read']} records")
+    log_info(logger, f"Cleaned {written} records, skipped {counts['invalid']} invalid records")
+    log_info(logger, "Data cleaning completed successfully")
+    return True
+
+
+def clean_csv_data_parallel(input_file: str, output_file: str, workers: int, logger) -> bool:
+    """
+    Clean CSV data across worker processes and write to output file.
+    
+    Each worker cleans one byte range into a part file in a temporary
+    directory next to the output; the parts are concatenated in file order
+    after a single header, and the result replaces the output file only
+    once it is complete. The temporary directory is always removed.
+    
+    Args:
+        input_file: Path to input CSV file
+        output_file: Path to output CSV file
+        workers: Number of processes
+        logger: Logger instance
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    log_info(logger, f"Reading data from {input_file} with {workers} workers...")
+    part_dir = None
+    try:
+        part_dir = tempfile.mkdtemp(prefix=os.path.basename(output_file) + '.',
+                                    dir=os.path.dirname(os.path.abspath(output_file)))
+        parts = map_row_ranges(_clean_range, input_file, workers, extra_args=(part_dir,))
         
-        if success:
-            log_info(logger, "Data cleaning completed successfully")
-            return True
-        else:
-            log_error(logger, "Error writing output file")
+        read_count = sum(part[1] for part in parts)
+        invalid_count = sum(part[2] for part in parts)
+        written = sum(part[3] for part in parts)
+        log_info(logger, f"Loaded {read_count} records")
+        log_info(logger, f"Cleaned {written} records, skipped {invalid_count} invalid records")
+        if written == 0:
+            log_info(logger, "No valid data to write")
             return False
-    else:
-        log_info(logger, "No valid data to write")
+        
+        log_info(logger, f"Writing cleaned data to {output_file}...")
+        combined_file = os.path.join(part_dir, 'output.csv')
+        with open(combined_file, 'w', newline='') as output:
+            csv.DictWriter(output, fieldnames=SALES_FIELDS).writeheader()
+            for part_file, _, _, _ in parts:
+                with open(part_file, 'r', newline='') as part:
+                    shutil.copyfileobj(part, output)
+        os.replace(combined_file, output_file)
+    except Exception as e:
+        log_error(logger, "Error cleaning file", e)
         return False
+    finally:
+        if part_dir is not None:
+            shutil.rmtree(part_dir, ignore_errors=True)
+    
+    log_info(logger, "Data cleaning completed successfully")
+    return True
+
+
+def _clean_range(filepath: str, fieldnames: List[str], start: int, end: int, index: int,
+                 part_dir: str) -> tuple[str, int, int, int]:
+    """
+    Worker for parallel cleaning: clean one byte range into a part file.
+    
+    Returns:
+        Tuple of (part file path, rows read, invalid rows, rows written)
+    """
+    counts = {'read': 0, 'invalid': 0}
+    part_file = os.path.join(part_dir, f"part{index}.csv")
+    written = 0
+    with open(part_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=SALES_FIELDS)
+        rows = iter_range_rows(filepath, fieldnames, start, end, SALES_FIELDS)
+        for row in iter_clean_rows(rows, WORKER_LOGGER, counts):
+            writer.writerow(row)
+            written += 1
+    return part_file, counts['read'], counts['invalid'], written
 
 
-def clean_and_validate_rows(data: List[Dict[str, Any]], logger) -> tuple[List[Dict[str, Any]], int]:
+def clean_and_validate_rows(data: Iterable[Dict[str, Any]], logger) -> tuple[List[Dict[str, Any]], int]:
     """
     Clean and validate data rows.
     
     Args:
-        data: List of raw data rows
+        data: Raw data rows
         logger: Logger instance
         
     Returns:
         Tuple of (cleaned data list, invalid count)
     """
-    clean_data = []
-    invalid_count = 0
-    required_fields = ['amount', 'quantity', 'product']
+    counts = {'read': 0, 'invalid': 0}
+    clean_data = list(iter_clean_rows(data, logger, counts))
+    return clean_data, counts['invalid']
+
+
+def iter_clean_rows(data: Iterable[Dict[str, Any]], logger, counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily clean and validate data rows.
     
-    for row in data:
-        # Validate required fields
-        if not validate_required_fields(row, required_fields):
-            invalid_count += 1
-            log_info(logger, "Skipping row with missing fields")
-            continue
-        
-        # Clean and convert numeric fields
-        amount = clean_numeric_field(row['amount'], float)
-        quantity = clean_numeric_field(row['quantity'], int)
-        
-        if amount is None or quantity is None:
-            invalid_count += 1
-            log_info(logger, "Skipping row with invalid data")
-            continue
+    Args:
+        data: Raw data rows, e.g. from iter_csv_rows
+        logger: Logger instance
+        counts: Dictionary whose 'read' and 'invalid' entries are incremented
+            as rows are consumed
         
-        # Round amount to 2 decimal places
-        amount = round_to_decimal_places(amount)
+    Returns:
+        Iterator of cleaned rows
+    """
+    for row in data:
+        counts['read'] += 1
         
-        # Validate ranges
-        if not validate_positive_number(amount) or not validate_positive_number(quantity):
-            invalid_count += 1
-            log_info(logger, "Skipping row with negative values")
+        clean_row, reason = clean_sales_row(row)
+        if clean_row is None:
+            counts['invalid'] += 1
+            log_info(logger, reason)
             continue
         
-        # Clean product name
-        product = clean_text_field(row['product'])
-        
-        # Create cleaned row
-        clean_row = {
-            'date': row.get('date', ''),
-            'product': product,
-            'amount': amount,
-            'quantity': quantity
-        }
-        clean_data.append(clean_row)
-    
-    return clean_data, invalid_count
+        yield clean_row
 
 
 def validate_data_file(filename: str) -> bool:
@@ -140,17 +213,17 @@ def validate_data_file(filename: str) -> bool:
         log_info(logger, "File does not exist")
         return False
     
-    # Read and check file structure
-    data = read_csv_file(filename)
-    if data is None:
+    # Count rows without loading the file
+    try:
+        row_count = sum(1 for _ in iter_csv_rows(filename, columns=[]))
+    except Exception:
         log_error(logger, "Validation error: Cannot read file")
         return False
     
-    log_info(logger, f"File contains {len(data)} rows")
+    log_info(logger, f"File contains {row_count} rows")
     
     # Check for required fields
-    required_fields = ['date', 'product', 'amount', 'quantity']
-    if not validate_csv_structure(filename, required_fields):
+    if not validate_csv_structure(filename, SALES_FIELDS):
         log_info(logger, f"Missing required fields")
         return False
     
@@ -3,13 +3,12 @@ Main entry point for data processing pipeline.
 Orchestrates data cleaning, analysis, and report generation.
 """
 
-from typing import List, Dict, Any
-from utils.data_utils import (
-    file_exists, read_csv_file, create_sample_csv,
-    clean_numeric_field, validate_required_fields
+from utils.data_utils import file_exists, create_sample_csv
+from utils.logging_utils import (
+    setup_logger, log_info,
+    format_report_header, format_report_footer, format_currency
 )
-from utils.math_utils import round_to_decimal_places, calculate_statistics
-from utils.logging_utils import setup_logger, log_info, log_error, format_currency
+from pipeline import Pipeline, CleanCSVWriter, StatisticsConsumer, ProductAggregator, ReportBuilder
 
 
 def main() -> None:
@@ -25,63 +24,39 @@ def main() -> None:
         log_info(logger, "Creating sample data file...")
         create_sample_data(data_file)
     
-    # Read data from CSV
-    log_info(logger, f"Reading data from {data_file}...")
-    data = read_csv_file(data_file)
+    # Read, clean, analyze and report in a single pass over the file
+    pipeline = Pipeline(logger)
+    pipeline.register(CleanCSVWriter("sales_data_clean.csv"))
+    pipeline.register(StatisticsConsumer())
+    pipeline.register(ProductAggregator())
+    pipeline.register(ReportBuilder())
     
-    if data is None:
-        log_error(logger, "Error reading file")
+    results = pipeline.run(data_file)
+    if results is None:
         return
     
-    log_info(logger, f"Loaded {len(data)} records")
+    log_info(logger, f"Cleaned data: {results['clean_csv']} valid records")
     
-    # Clean the data
-    log_info(logger, "Cleaning data...")
-    clean_data = clean_and_validate_data(data, logger)
-    
-    log_info(logger, f"Cleaned data: {len(clean_data)} valid records")
-    
-    # Calculate basic statistics
-    amounts = [float(row['amount']) for row in clean_data]
-    if amounts:
-        stats = calculate_statistics(amounts)
-        
+    # Report basic statistics
+    stats = results['statistics']['amount']
+    if stats['count']:
         log_info(logger, "Statistics calculated successfully")
         log_info(logger, f"Total: {format_currency(stats['total'])}")
         log_info(logger, f"Average: {format_currency(stats['average'])}")
         log_info(logger, f"Min: {format_currency(stats['min'])}")
         log_info(logger, f"Max: {format_currency(stats['max'])}")
     
-    log_info(logger, "Pipeline completed successfully")
-
-
-def clean_and_validate_data(data: List[Dict[str, Any]], logger) -> List[Dict[str, Any]]:
-    """
-    Clean and validate data rows.
+    log_info(logger, "Product Statistics:")
+    for product, product_stats in sorted(results['products'].items()):
+        log_info(logger, f"  {product}: {format_currency(product_stats['total_amount'])} "
+                         f"({product_stats['total_quantity']} units)")
     
-    Args:
-        data: List of data rows to clean
-        logger: Logger instance for output
-        
-    Returns:
-        List of cleaned and validated data rows
-    """
-    clean_data = []
-    for row in data:
-        if validate_required_fields(row, ['amount', 'quantity']):
-            # Clean numeric fields
-            amount = clean_numeric_field(row['amount'], float)
-            quantity = clean_numeric_field(row['quantity'], int)
-            
-            if amount is not None and quantity is not None:
-                # Round amount to 2 decimal places
-                row['amount'] = round_to_decimal_places(amount)
-                row['quantity'] = quantity
-                clean_data.append(row)
-            else:
-                log_info(logger, "Skipping invalid row")
+    format_report_header("SALES REPORT", logger)
+    for line in results['report']:
+        log_info(logger, line)
+    format_report_footer(logger)
     
-    return clean_data
+    log_info(logger, "Pipeline completed successfully")
 
 
 def create_sample_data(filename: str) -> None:
@@ -0,0 +1,369 @@
+"""
+Single-pass pipeline module.
+Reads a sales CSV once and fans each row out to registered consumers.
+
+Each consumer validates rows with the rule of the standalone module it
+replaces (see VALIDATION_RULES), so its output equals that module's result
+on the same file: the cleaned CSV matches data_cleaner, the statistics and
+product totals match analyzer.analyze_sales_data and the report matches
+report_generator.generate_report, including on files with invalid rows.
+Each rule runs at most once per row, however many consumers share it.
+"""
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+from utils.data_utils import (
+    SALES_FIELDS, SALES_REQUIRED_FIELDS, TEMP_SUFFIX,
+    file_exists, iter_csv_rows, clean_sales_row, remove_file
+)
+from utils.math_utils import RunningStats
+from utils.logging_utils import (
+    setup_logger, log_info, log_error,
+    format_report_header, format_report_footer
+)
+from analyzer import extract_row_numbers, update_product_statistics, finalize_product_statistics
+from report_generator import clean_report_row, format_report_lines
+
+
+def sales_rule(row: Dict[str, Any], logger) -> Optional[Dict[str, Any]]:
+    """
+    Validate a row as data_cleaner does (see clean_sales_row).
+    
+    Args:
+        row: Raw data row
+        logger: Logger instance; the rejection reason is logged
+    
+    Returns:
+        The cleaned row, or None if it is invalid
+    """
+    clean_row, reason = clean_sales_row(row)
+    if clean_row is None:
+        log_info(logger, reason)
+    return clean_row
+
+
+def analysis_rule(row: Dict[str, Any], logger) -> Dict[str, Any]:
+    """
+    Clean a row as the analyzer does (see analyzer.extract_row_numbers).
+    
+    Amount and quantity are cleaned independently, so a row is never
+    rejected: an invalid field is None and only that field is skipped.
+    
+    Args:
+        row: Raw data row
+        logger: Logger instance
+    
+    Returns:
+        Row with the raw product, rounded amount or None and quantity or None
+    """
+    amount, quantity = extract_row_numbers(row, logger)
+    return {'product': row.get('product'), 'amount': amount, 'quantity': quantity}
+
+
+def report_rule(row: Dict[str, Any], logger) -> Optional[Dict[str, Any]]:
+    """
+    Validate a row as the report generator does (see clean_report_row).
+    
+    Args:
+        row: Raw data row (not modified)
+        logger: Logger instance
+    
+    Returns:
+        Row with a product and rounded amount, or None if either is invalid
+    """
+    return clean_report_row(dict(row))
+
+
+# Validation rules by name; consumers select one with their rule attribute
+VALIDATION_RULES = {
+    'sales': sales_rule,
+    'analysis': analysis_rule,
+    'report': report_rule
+}
+
+
+class PipelineConsumer(ABC):
+    """
+    Base class for pipeline consumers.
+    
+    A consumer receives every row accepted by its validation rule through
+    consume() and returns its output from finish(). close() is always
+    called, even if the run fails. Consumers name their rule (a key of
+    VALIDATION_RULES) in rule and list the input columns they need beyond
+    amount, quantity and product in columns; no other column is read.
+    """
+    
+    name = 'consumer'
+    rule = 'sales'
+    columns: List[str] = []
+    
+    @abstractmethod
+    def consume(self, row: Dict[str, Any]) -> None:
+        """
+        Process one validated row.
+        
+        Args:
+            row: Row cleaned by the consumer's validation rule
+        """
+    
+    def finish(self) -> Any:
+        """
+        Complete processing after the last row.
+        
+        Returns:
+            The consumer's output
+        """
+        return None
+    
+    def close(self) -> None:
+        """Release any resources held by the consumer."""
+
+
+class CleanCSVWriter(PipelineConsumer):
+    """
+    Writes cleaned rows to a CSV file.
+    
+    Rows go to a temporary file next to the output, which replaces the
+    output only in finish(); if the run fails, the temporary file is
+    removed and an existing output is left untouched.
+    """
+    
+    name = 'clean_csv'
+    columns = SALES_FIELDS
+    
+    def __init__(self, output_file: str):
+        """
+        Initialize the writer.
+        
+        Args:
+            output_file: Path to the cleaned CSV file (created on the first row)
+        """
+        self.output_file = output_file
+        self.temp_file = output_file + TEMP_SUFFIX
+        self.count = 0
+        self._file = None
+        self._writer = None
+    
+    def consume(self, row: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self._file = open(self.temp_file, 'w', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=SALES_FIELDS)
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self.count += 1
+    
+    def finish(self) -> int:
+        """
+        Flush the temporary file and move it over the output file.
+        
+        Returns:
+            Number of rows written
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.replace(self.temp_file, self.output_file)
+        return self.count
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            remove_file(self.temp_file)
+
+
+class StatisticsConsumer(PipelineConsumer):
+    """Accumulates amount and quantity statistics, as the analyzer does."""
+    
+    name = 'statistics'
+    rule = 'analysis'
+    
+    def __init__(self):
+        self.amounts = RunningStats()
+        self.quantities = RunningStats()
+    
+    def consume(self, row: Dict[str, Any]) -> None:
+        if row['amount'] is not None:
+            self.amounts.add(row['amount'])
+        if row['quantity'] is not None:
+            self.quantities.add(row['quantity'])
+    
+    def finish(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Finalize the statistics.
+        
+        Returns:
+            Dictionary with 'amount' and 'quantity' statistics
+        """
+        return {
+            'amount': self.amounts.to_dict(),
+            'quantity': self.quantities.to_dict()
+        }
+
+
+class ProductAggregator(PipelineConsumer):
+    """Aggregates totals, counts and averages per product, as the analyzer does."""
+    
+    name = 'products'
+    rule = 'analysis'
+    
+    def __init__(self):
+        self.product_stats = {}
+    
+    def consume(self, row: Dict[str, Any]) -> None:
+        update_product_statistics(self.product_stats, row['product'], row['amount'], row['quantity'])
+    
+    def finish(self) -> Dict[str, Dict[str, float]]:
+        """
+        Finalize the per-product statistics.
+        
+        Returns:
+            Dictionary mapping products to their statistics
+        """
+        return finalize_product_statistics(self.product_stats)
+
+
+class ReportBuilder(PipelineConsumer):
+    """Builds the body of the sales report, as the report generator does."""
+    
+    name = 'report'
+    rule = 'report'
+    
+    def __init__(self):
+        self.product_totals = {}
+        self.accumulator = RunningStats()
+    
+    def consume(self, row: Dict[str, Any]) -> None:
+        product = row['product']
+        self.product_totals[product] = self.product_totals.get(product, 0.0) + row['amount']
+        self.accumulator.add(row['amount'])
+    
+    def finish(self) -> List[str]:
+        """
+        Format the report.
+        
+        Returns:
+            Report lines (without header and footer)
+        """
+        return format_report_lines(self.product_totals, self.accumulator.to_dict())
+
+
+class Pipeline:
+    """Reads a CSV file once and fans each row out to every registered consumer."""
+    
+    def __init__(self, logger=None):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            logger: Logger instance (default: a new 'pipeline' logger)
+        """
+        self.logger = logger if logger is not None else setup_logger('pipeline')
+        self.consumers: List[PipelineConsumer] = []
+    
+    def register(self, consumer: PipelineConsumer) -> 'Pipeline':
+        """
+        Register a consumer.
+        
+        Args:
+            consumer: Consumer to receive every row its rule accepts
+        
+        Returns:
+            The pipeline, so registrations can be chained
+        
+        Raises:
+            ValueError: If a consumer with the same name is registered or
+                its validation rule is unknown
+        """
+        if consumer.rule not in VALIDATION_RULES:
+            raise ValueError(f"Unknown validation rule: {consumer.rule}")
+        if any(existing.name == consumer.name for existing in self.consumers):
+            raise ValueError(f"Consumer already registered: {consumer.name}")
+        self.consumers.append(consumer)
+        return self
+    
+    def run(self, input_file: str) -> Optional[Dict[str, Any]]:
+        """
+        Read, validate and dispatch every row of a CSV file in one pass.
+        
+        Args:
+            input_file: Path to the input CSV file
+        
+        Returns:
+            Dictionary with the 'read' row count, the 'invalid' count of rows
+            rejected by the sales rule (as data_cleaner reports it) plus each
+            consumer's output under its name, or None if an error occurs
+        """
+        if not file_exists(input_file):
+            log_error(self.logger, f"Error: File {input_file} not found")
+            return None
+        
+        log_info(self.logger, f"Reading data from {input_file}...")
+        columns = list(SALES_REQUIRED_FIELDS)
+        for consumer in self.consumers:
+            columns += [column for column in consumer.columns if column not in columns]
+        read_count = 0
+        invalid_count = 0
+        
+        try:
+            for row in iter_csv_rows(input_file, columns=columns):
+                read_count += 1
+                clean_rows = {'sales': sales_rule(row, self.logger)}
+                if clean_rows['sales'] is None:
+                    invalid_count += 1
+                for consumer in self.consumers:
+                    if consumer.rule not in clean_rows:
+                        clean_rows[consumer.rule] = VALIDATION_RULES[consumer.rule](row, self.logger)
+                    clean_row = clean_rows[consumer.rule]
+                    if clean_row is not None:
+                        consumer.consume(clean_row)
+            
+            results = {'read': read_count, 'invalid': invalid_count}
+            for consumer in self.consumers:
+                results[consumer.name] = consumer.finish()
+        except Exception as e:
+            log_error(self.logger, "Pipeline failed", e)
+            return None
+        finally:
+            for consumer in self.consumers:
+                consumer.close()
+        
+        log_info(self.logger, f"Loaded {read_count} records, skipped {invalid_count} invalid records")
+        return results
+
+
+def run_sales_pipeline(input_file: str, output_file: str, logger=None) -> Optional[Dict[str, Any]]:
+    """
+    Clean, analyze and report on a sales CSV in a single pass.
+    
+    Args:
+        input_file: Path to the input CSV file
+        output_file: Path to the cleaned CSV file
+        logger: Logger instance (default: a new 'pipeline' logger)
+    
+    Returns:
+        Pipeline results (see Pipeline.run), or None if an error occurs
+    """
+    pipeline = Pipeline(logger)
+    pipeline.register(CleanCSVWriter(output_file))
+    pipeline.register(StatisticsConsumer())
+    pipeline.register(ProductAggregator())
+    pipeline.register(ReportBuilder())
+    
+    results = pipeline.run(input_file)
+    if results is None:
+        return None
+    
+    log_info(pipeline.logger, f"Wrote {results['clean_csv']} cleaned records to {output_file}")
+    format_report_header("SALES REPORT", pipeline.logger)
+    for line in results['report']:
+        log_info(pipeline.logger, line)
+    format_report_footer(pipeline.logger)
+    
+    return results
+
+
+if __name__ == "__main__":
+    run_sales_pipeline("sales_data.csv", "sales_data_clean.csv")
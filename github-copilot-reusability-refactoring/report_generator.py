@@ -3,21 +3,40 @@ Report generator module.
 Creates formatted reports from processed data.
 """
 
-from typing import List, Dict, Any
-from utils.data_utils import file_exists, read_csv_file, clean_numeric_field
-from utils.math_utils import round_to_decimal_places, aggregate_by_key, calculate_statistics
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from utils.data_utils import file_exists, iter_csv_rows, clean_numeric_field
+from utils.date_index import iter_date_range_rows
+from utils.math_utils import (
+    round_to_decimal_places, RunningStats
+)
+from utils.result_cache import ResultCache
 from utils.logging_utils import (
     setup_logger, log_info, log_error, 
     format_report_header, format_report_footer, format_currency
 )
 
 
-def generate_report(data_file: str) -> None:
+# The only columns the report reads; other fields are never materialized
+REPORT_COLUMNS = ['product', 'amount']
+
+
+def generate_report(data_file: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                    cache: Optional[ResultCache] = None) -> Optional[str]:
     """
     Generate a formatted report from CSV data.
     
     Args:
         data_file: Path to the CSV data file
+        date_from: Only report rows dated on or after this ISO date
+        date_to: Only report rows dated on or before this ISO date; with
+            either date the file must be ordered by date and is read
+            through its date index (see utils.date_index)
+        cache: Result cache; while the file and date range are unchanged
+            the stored report is returned without reading the file
+    
+    Returns:
+        Report text (without the timestamped header and footer), or None
+        if an error occurs
     """
     # Set up logger
     logger = setup_logger('report_generator')
@@ -27,63 +46,150 @@ def generate_report(data_file: str) -> None:
     # Check if file exists
     if not file_exists(data_file):
         log_error(logger, f"Error: File {data_file} not found")
-        return
+        return None
     
-    # Read CSV data
-    log_info(logger, f"Reading data from {data_file}...")
-    data = read_csv_file(data_file)
+    cache_key = None
+    report = None
+    if cache is not None:
+        try:
+            cache_key = cache.key(data_file, {'result': 'report', 'date_from': date_from, 'date_to': date_to})
+        except OSError:
+            log_error(logger, "Error reading file")
+            return None
+        report = cache.get(cache_key)
+        if report is not None:
+            log_info(logger, f"Using cached report of {data_file}")
     
-    if data is None:
-        log_error(logger, "Error reading file")
-        return
-    
-    log_info(logger, f"Loaded {len(data)} records")
-    
-    # Clean and process data
-    clean_data = clean_report_data(data)
-    
-    # Calculate product totals
-    product_totals = aggregate_by_key(clean_data, 'product', 'amount')
-    
-    # Calculate overall statistics
-    amounts = [float(row['amount']) for row in clean_data]
-    stats = calculate_statistics(amounts)
+    if report is None:
+        report = build_report(data_file, date_from, date_to, logger)
+        if report is None:
+            return None
+        if cache_key is not None:
+            try:
+                cache.put(cache_key, report)
+            except OSError as e:
+                log_error(logger, "Error writing result cache", e)
     
     # Generate report output
     format_report_header("SALES REPORT", logger)
-    log_info(logger, f"Total Records: {len(clean_data)}")
-    log_info(logger, "")
-    log_info(logger, "Product Breakdown:")
-    for product, amount in sorted(product_totals.items()):
-        log_info(logger, f"  {product}: {format_currency(amount)}")
-    log_info(logger, "")
-    log_info(logger, f"Total Sales: {format_currency(stats['total'])}")
-    log_info(logger, f"Average Sale: {format_currency(stats['average'])}")
+    for line in report.split("\n"):
+        log_info(logger, line)
     format_report_footer(logger)
     
     log_info(logger, "Report generation completed")
+    return report
+
+
+def build_report(data_file: str, date_from: Optional[str], date_to: Optional[str], logger) -> Optional[str]:
+    """
+    Read a CSV file and format the body of the sales report.
+    
+    Args:
+        data_file: Path to the CSV data file
+        date_from: Only report rows dated on or after this ISO date
+        date_to: Only report rows dated on or before this ISO date
+        logger: Logger instance
+    
+    Returns:
+        Report text, or None if the file cannot be read
+    """
+    # Stream CSV data, aggregating product totals and statistics per row
+    log_info(logger, f"Reading data from {data_file}...")
+    product_totals = {}
+    accumulator = RunningStats()
+    record_count = 0
+    
+    if date_from is not None or date_to is not None:
+        rows = iter_date_range_rows(data_file, date_from, date_to, REPORT_COLUMNS)
+    else:
+        rows = iter_csv_rows(data_file, columns=REPORT_COLUMNS)
+    
+    try:
+        for raw_row in rows:
+            record_count += 1
+            row = clean_report_row(raw_row)
+            if row is None:
+                continue
+            product = row['product']
+            product_totals[product] = product_totals.get(product, 0.0) + row['amount']
+            accumulator.add(row['amount'])
+    except Exception:
+        log_error(logger, "Error reading file")
+        return None
+    
+    log_info(logger, f"Loaded {record_count} records")
+    return "\n".join(format_report_lines(product_totals, accumulator.to_dict()))
 
 
-def clean_report_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def format_report_lines(product_totals: Dict[str, float], stats: Dict[str, Any]) -> List[str]:
+    """
+    Format the body of the sales report.
+    
+    Shared by build_report and the pipeline's ReportBuilder so both
+    produce the same text.
+    
+    Args:
+        product_totals: Unrounded sales total per product
+        stats: Amount statistics from RunningStats.to_dict
+    
+    Returns:
+        Report lines (without header and footer)
+    """
+    lines = [f"Total Records: {stats['count']}", "", "Product Breakdown:"]
+    for product, total in sorted(product_totals.items()):
+        lines.append(f"  {product}: {format_currency(round_to_decimal_places(total))}")
+    lines.append("")
+    lines.append(f"Total Sales: {format_currency(stats['total'])}")
+    lines.append(f"Average Sale: {format_currency(stats['average'])}")
+    return lines
+
+
+def clean_report_data(data: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Clean and validate data for report generation.
     
     Args:
-        data: List of raw data rows
-        
+        data: Raw data rows
+    
     Returns:
         List of cleaned data rows
     """
-    clean_data = []
+    return list(iter_report_rows(data))
+
+
+def iter_report_rows(data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily clean and validate rows for report generation.
+    
+    Args:
+        data: Raw data rows, e.g. from iter_csv_rows
+    
+    Returns:
+        Iterator of rows with a product and a rounded numeric amount
+    """
     for row in data:
-        if row.get('amount') and row.get('product'):
-            amount = clean_numeric_field(row['amount'], float)
-            if amount is not None:
-                # Round to 2 decimal places
-                row['amount'] = round_to_decimal_places(amount)
-                clean_data.append(row)
-    
-    return clean_data
+        clean_row = clean_report_row(row)
+        if clean_row is not None:
+            yield clean_row
+
+
+def clean_report_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Clean and validate a single row for report generation.
+    
+    Args:
+        row: Raw data row (its amount is replaced by the rounded number)
+    
+    Returns:
+        The cleaned row, or None if it has no product or valid amount
+    """
+    if row.get('amount') and row.get('product'):
+        amount = clean_numeric_field(row['amount'], float)
+        if amount is not None:
+            # Round to 2 decimal places
+            row['amount'] = round_to_decimal_places(amount)
+            return row
+    return None
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Test package for the sales data processing project."""
@@ -0,0 +1,132 @@
+"""Unit tests for incremental analysis.
+
+This module tests that analyze_sales_data(incremental=True) matches a full
+analysis after appends, a partially written row, truncation and rewrites,
+and that workers, date ranges and incremental analysis are not combined.
+"""
+
+import logging
+import os
+
+import pytest
+
+import analyzer
+from analyzer import CHECKPOINT_SUFFIX, analyze_sales_data, validate_analysis_options
+
+HEADER = 'date,product,amount,quantity\n'
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def _rows(count, offset=0):
+    products = ['Widget', 'Gadget', '"Gizmo,\nDeluxe"', '']
+    amounts = ['{:.3f}', 'n/a', '', '-{:.2f}']
+    lines = []
+    for index in range(offset, offset + count):
+        amount = amounts[index % 4].format(index * 1.37)
+        lines.append(f"2025-01-01,{products[index % 3]},{amount},{index % 7 or 'x'}\n")
+    return ''.join(lines)
+
+
+def _write(path, text, mode='w'):
+    with open(path, mode, newline='') as file:
+        file.write(text)
+
+
+def _assert_incremental_matches_full(path):
+    incremental = analyze_sales_data(path, incremental=True)
+    assert incremental == analyze_sales_data(path)
+    return incremental
+
+
+def test_incremental_parses_only_appended_rows(tmp_path, monkeypatch):
+    """Test appended rows are merged into the saved summary."""
+    path = str(tmp_path / "sales.csv")
+    _write(path, HEADER + _rows(200))
+    _assert_incremental_matches_full(path)
+    assert os.path.exists(path + CHECKPOINT_SUFFIX)
+
+    _write(path, _rows(50, 200), 'a')
+    parsed = []
+    original = analyzer.summarize_rows
+
+    def counting_summarize(rows, logger):
+        rows = list(rows)
+        parsed.append(len(rows))
+        return original(rows, logger)
+
+    monkeypatch.setattr(analyzer, 'summarize_rows', counting_summarize)
+    results = analyze_sales_data(path, incremental=True)
+    monkeypatch.undo()
+
+    assert parsed == [50]
+    assert results == analyze_sales_data(path)
+
+
+def test_incremental_waits_for_a_partial_row(tmp_path):
+    """Test a row still being written is picked up once it is complete."""
+    path = str(tmp_path / "sales.csv")
+    _write(path, HEADER + _rows(20))
+    first = _assert_incremental_matches_full(path)
+
+    _write(path, '2025-01-02,"Half\n', 'a')
+    assert analyze_sales_data(path, incremental=True) == first
+
+    _write(path, 'written",12.50,2\n', 'a')
+    results = _assert_incremental_matches_full(path)
+    assert results['product_stats']['Half\nwritten']['total_amount'] == 12.5
+
+
+def test_incremental_restarts_after_truncate_or_rewrite(tmp_path):
+    """Test a truncated or rewritten file is analyzed from the start."""
+    path = str(tmp_path / "sales.csv")
+    _write(path, HEADER + _rows(300))
+    _assert_incremental_matches_full(path)
+
+    _write(path, HEADER + _rows(120))
+    truncated = _assert_incremental_matches_full(path)
+
+    # Same size, different contents
+    _write(path, (HEADER + _rows(120)).replace('Widget', 'Wodget'))
+    rewritten = _assert_incremental_matches_full(path)
+
+    assert 'Widget' in truncated['product_stats']
+    assert 'Wodget' in rewritten['product_stats'] and 'Widget' not in rewritten['product_stats']
+
+
+def test_incremental_rejects_workers(tmp_path):
+    """Test incremental analysis cannot be combined with parallel workers."""
+    path = str(tmp_path / "sales.csv")
+    _write(path, HEADER + _rows(10))
+
+    assert analyze_sales_data(path, workers=2, incremental=True) is None
+    assert not os.path.exists(path + CHECKPOINT_SUFFIX)
+
+
+@pytest.mark.parametrize("options", [
+    {'workers': 2, 'date_from': '2025-01-01'},
+    {'incremental': True, 'date_to': '2025-01-05'},
+    {'workers': 2, 'incremental': True, 'date_from': '2025-01-01'},
+])
+def test_date_range_rejects_workers_and_incremental(tmp_path, options):
+    """Test a date range cannot be combined with parallel workers or incremental analysis."""
+    path = str(tmp_path / "sales.csv")
+    _write(path, HEADER + _rows(10))
+
+    assert analyze_sales_data(path, **options) is None
+    assert not os.path.exists(path + '.dateidx')
+    assert not os.path.exists(path + CHECKPOINT_SUFFIX)
+
+
+def test_validate_analysis_options():
+    """Test each option is accepted alone and conflicts are named."""
+    assert validate_analysis_options(4, None, None, False) is None
+    assert validate_analysis_options(1, '2025-01-01', None, False) is None
+    assert validate_analysis_options(1, None, None, True) is None
+    assert validate_analysis_options(1, None, '2025-01-05', True) == \
+        "Cannot combine a date range and incremental; use only one of them"
@@ -0,0 +1,90 @@
+"""Unit tests for the columnar loader and vectorized statistics.
+
+This module tests that column statistics equal analyze_sales_data on files
+whose rows have invalid, missing or out-of-range amounts and quantities,
+with and without NumPy.
+"""
+
+import logging
+
+import pytest
+
+from analyzer import analyze_sales_data
+from utils import columnar
+from utils.columnar import column_product_statistics, column_statistics, load_sales_columns
+
+MIXED_CSV = (
+    'date,product,amount,quantity\n'
+    '2025-01-01,Widget,10.005,3\n'
+    '2025-01-02,Gadget,n/a,2\n'
+    '2025-01-03,Widget,7.25,x\n'
+    '2025-01-04,,4.00,1\n'
+    '2025-01-05,Gizmo,,\n'
+    '2025-01-06,Gadget\n'
+    '2025-01-07,Gizmo,1e2,-4\n'
+    '2025-01-08,Widget,3.10,2.5\n'
+)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(params=[False, True], ids=['array', 'numpy'])
+def use_numpy(request):
+    if request.param and columnar._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def test_invalid_values_are_masked_per_column(tmp_path, use_numpy):
+    """Test a bad quantity does not drop the row's amount, and vice versa."""
+    path = tmp_path / "sales.csv"
+    path.write_text(MIXED_CSV)
+
+    columns = load_sales_columns(str(path), use_numpy=use_numpy)
+
+    assert len(columns) == 8
+    assert [bool(ok) for ok in columns.amount_valid] == [True, False, True, True, False, False, True, True]
+    assert [bool(ok) for ok in columns.quantity_valid] == [True, True, False, True, False, False, True, False]
+    assert columns.invalid_rows == 5
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 3, 1000])
+def test_column_statistics_match_analyzer(tmp_path, use_numpy, chunk_rows):
+    """Test column statistics equal the analyzer's on a file with invalid rows."""
+    path = tmp_path / "sales.csv"
+    path.write_text(MIXED_CSV)
+    expected = analyze_sales_data(str(path))
+
+    columns = load_sales_columns(str(path), use_numpy=use_numpy, chunk_rows=chunk_rows)
+
+    assert column_statistics(columns.amount, columns.amount_valid) == expected['amount_stats']
+    assert column_statistics(columns.quantity, columns.quantity_valid) == expected['quantity_stats']
+    assert column_product_statistics(columns) == expected['product_stats']
+
+
+def test_totals_are_exact(tmp_path, use_numpy):
+    """Test totals equal the analyzer's where float64 sums lose precision."""
+    path = tmp_path / "sales.csv"
+    path.write_text(
+        'date,product,amount,quantity\n'
+        '2025-01-01,Widget,1e15,9007199254740992\n'
+        '2025-01-02,Widget,0.01,1\n'
+        '2025-01-03,Widget,0.01,1\n'
+        '2025-01-04,Widget,-1e15,1\n'
+        '2025-01-05,Gadget,0.01,1\n'
+    )
+    expected = analyze_sales_data(str(path))
+
+    columns = load_sales_columns(str(path), use_numpy=use_numpy)
+    products = column_product_statistics(columns)
+
+    assert products == expected['product_stats']
+    assert products['Widget']['total_amount'] == 0.02
+    assert products['Widget']['total_quantity'] == 2 ** 53 + 3
+    assert column_statistics(columns.amount, columns.amount_valid) == expected['amount_stats']
+    assert column_statistics(columns.quantity, columns.quantity_valid) == expected['quantity_stats']
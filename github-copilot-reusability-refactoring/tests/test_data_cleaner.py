@@ -0,0 +1,102 @@
+"""Unit tests for the data cleaner.
+
+This module tests that cleaning replaces the output file only on success,
+whether the input fails to read part way through or the output cannot be
+written, and that parallel cleaning matches the serial output.
+"""
+
+import logging
+import os
+
+import pytest
+
+from data_cleaner import clean_csv_data
+from utils.data_utils import write_csv_rows
+
+HEADER = b'date,product,amount,quantity\n'
+ROWS = b''.join(b'2025-01-01,Widget,%d.50,%d\n' % (index, index % 5 + 1) for index in range(100000))
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_read_error_keeps_existing_output(tmp_path):
+    """Test a decode error after the first row leaves the previous output intact."""
+    source = tmp_path / "sales.csv"
+    source.write_bytes(HEADER + ROWS + b'2025-01-02,\xff\xfe,1.00,1\n')
+    output = tmp_path / "clean.csv"
+    output.write_text("previous output\n")
+
+    assert clean_csv_data(str(source), str(output)) is False
+
+    assert output.read_text() == "previous output\n"
+    assert set(os.listdir(tmp_path)) == {"sales.csv", "clean.csv"}
+
+
+def test_clean_replaces_output_on_success(tmp_path):
+    """Test a successful run replaces the output and leaves no temporary file."""
+    source = tmp_path / "sales.csv"
+    source.write_bytes(HEADER + ROWS + b'2025-01-02,Gadget,n/a,1\n')
+    output = tmp_path / "clean.csv"
+    output.write_text("previous output\n")
+
+    assert clean_csv_data(str(source), str(output)) is True
+
+    lines = output.read_text().splitlines()
+    assert lines[0] == "date,product,amount,quantity" and len(lines) == 100001
+    assert set(os.listdir(tmp_path)) == {"sales.csv", "clean.csv"}
+
+
+def test_write_csv_rows_separates_read_and_write_errors(tmp_path):
+    """Test write failures return None while errors from the rows propagate."""
+    def failing_rows():
+        yield {'a': 1}
+        raise OSError("read failed")
+
+    target = tmp_path / "out.csv"
+    target.write_text("keep\n")
+
+    with pytest.raises(OSError, match="read failed"):
+        write_csv_rows(str(target), failing_rows(), ['a'])
+    assert write_csv_rows(str(tmp_path / "missing" / "out.csv"), [{'a': 1}], ['a']) is None
+    assert write_csv_rows(str(target), [{'b': 1}], ['a']) is None
+
+    assert target.read_text() == "keep\n"
+    assert write_csv_rows(str(target), [{'a': 1}, {'a': 2}], ['a']) == 2
+    assert target.read_text().splitlines() == ['a', '1', '2']
+
+
+def test_parallel_clean_leaves_unrelated_files(tmp_path):
+    """Test parallel cleaning matches the serial output and removes only its own parts."""
+    source = tmp_path / "sales.csv"
+    source.write_bytes(HEADER + ROWS + b'2025-01-02,Gadget,n/a,1\n')
+    output = tmp_path / "clean.csv"
+    (tmp_path / "clean.csv.partial").write_text("keep\n")
+    (tmp_path / "clean.csv.part0").write_text("keep\n")
+
+    assert clean_csv_data(str(source), str(tmp_path / "serial.csv")) is True
+    assert clean_csv_data(str(source), str(output), workers=3) is True
+
+    assert output.read_bytes() == (tmp_path / "serial.csv").read_bytes()
+    assert (tmp_path / "clean.csv.partial").read_text() == "keep\n"
+    assert (tmp_path / "clean.csv.part0").read_text() == "keep\n"
+    assert set(os.listdir(tmp_path)) == {
+        "sales.csv", "serial.csv", "clean.csv", "clean.csv.partial", "clean.csv.part0"
+    }
+
+
+def test_parallel_read_error_keeps_existing_output(tmp_path):
+    """Test a failing worker leaves the previous output and no part files."""
+    source = tmp_path / "sales.csv"
+    source.write_bytes(HEADER + ROWS + b'2025-01-02,\xff\xfe,1.00,1\n')
+    output = tmp_path / "clean.csv"
+    output.write_text("previous output\n")
+
+    assert clean_csv_data(str(source), str(output), workers=3) is False
+
+    assert output.read_text() == "previous output\n"
+    assert set(os.listdir(tmp_path)) == {"sales.csv", "clean.csv"}
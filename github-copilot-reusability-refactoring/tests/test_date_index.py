@@ -0,0 +1,126 @@
+"""Unit tests for the sparse date index.
+
+This module tests that date range reads through the index return exactly
+the rows a filtered full scan returns, and that the index is extended on
+append, rebuilt on rewrite and bypassed for unordered files.
+"""
+
+import csv
+import datetime
+import os
+
+import pytest
+
+from utils import date_index
+from utils.data_utils import iter_csv_rows
+from utils.date_index import index_path, iter_date_range_rows, update_date_index
+
+FIRST_DAY = datetime.date(2025, 1, 1)
+ROWS_PER_DAY = 100
+RANGES = [
+    ('2025-01-10', '2025-01-12'),
+    (None, '2025-01-03'),
+    ('2025-02-15', None),
+    ('2025-01-20', '2025-01-20'),
+    ('2024-01-01', '2024-02-01'),
+    (None, None),
+]
+
+
+def _write(path, rows, start=0, mode='w'):
+    with open(path, mode, newline='') as file:
+        writer = csv.writer(file)
+        if mode == 'w':
+            writer.writerow(['date', 'product', 'amount', 'quantity'])
+        for index in range(start, start + rows):
+            day = FIRST_DAY + datetime.timedelta(days=index // ROWS_PER_DAY)
+            product = ['Widget', 'Gadget, "XL"', 'Gizmo\nDeluxe'][index % 3]
+            # A few rows have no date; bounded range reads skip them
+            date = day.isoformat() if index % 53 else ''
+            writer.writerow([date, product, f"{index * 0.37:.2f}", index % 9 + 1])
+
+
+def _filtered_scan(path, date_from, date_to):
+    # Undated rows only match when the range is unbounded
+    return [row for row in iter_csv_rows(path, reader='csv')
+            if (date_from is None or (row['date'] and row['date'] >= date_from))
+            and (date_to is None or (row['date'] and row['date'] <= date_to))]
+
+
+@pytest.fixture
+def dated_file(tmp_path):
+    path = str(tmp_path / "sales.csv")
+    _write(path, 6000)
+    return path
+
+
+@pytest.mark.parametrize("date_from,date_to", RANGES)
+def test_date_range_matches_filtered_scan(dated_file, date_from, date_to):
+    """Test indexed range reads return the same rows as a filtered full scan."""
+    assert list(iter_date_range_rows(dated_file, date_from, date_to)) == \
+        _filtered_scan(dated_file, date_from, date_to)
+
+
+def test_date_range_projects_columns(dated_file):
+    """Test requested columns are kept and the date column is always included."""
+    rows = list(iter_date_range_rows(dated_file, '2025-01-05', '2025-01-05', ['amount']))
+
+    assert rows == [{'amount': row['amount'], 'date': row['date']}
+                    for row in _filtered_scan(dated_file, '2025-01-05', '2025-01-05')]
+
+
+def test_index_is_extended_after_append(dated_file, monkeypatch):
+    """Test appended rows extend the saved index instead of rebuilding it."""
+    before = update_date_index(dated_file)
+    assert len(before['checkpoints']) > 1 and before['ordered']
+
+    _write(dated_file, 500, start=6000, mode='a')
+    starts = []
+    original = date_index.complete_row_ranges
+
+    def recording_ranges(filepath, start=None, chunk_bytes=None):
+        starts.append(start)
+        return original(filepath, start, chunk_bytes)
+
+    monkeypatch.setattr(date_index, 'complete_row_ranges', recording_ranges)
+    after = update_date_index(dated_file)
+    monkeypatch.undo()
+
+    assert starts == [before['region']['offset']]
+    assert after['checkpoints'][:len(before['checkpoints'])] == before['checkpoints']
+    assert after['region']['offset'] == os.path.getsize(dated_file)
+    assert list(iter_date_range_rows(dated_file, '2025-03-01')) == _filtered_scan(dated_file, '2025-03-01', None)
+
+
+def test_index_is_rebuilt_after_rewrite(dated_file):
+    """Test a rewritten file gets a new index rather than stale offsets."""
+    update_date_index(dated_file)
+    _write(dated_file, 700, start=3000)
+
+    assert list(iter_date_range_rows(dated_file, '2025-01-31', '2025-02-01')) == \
+        _filtered_scan(dated_file, '2025-01-31', '2025-02-01')
+    assert update_date_index(dated_file)['region']['offset'] == os.path.getsize(dated_file)
+
+
+def test_unordered_file_falls_back_to_full_scan(dated_file):
+    """Test a row dated before its predecessors disables index seeking."""
+    with open(dated_file, 'a', newline='') as file:
+        file.write('2024-12-31,Late,1.00,1\r\n')
+
+    assert update_date_index(dated_file)['ordered'] is False
+    for date_from, date_to in [('2024-12-31', '2024-12-31'), ('2025-01-10', '2025-01-11')]:
+        assert list(iter_date_range_rows(dated_file, date_from, date_to)) == \
+            _filtered_scan(dated_file, date_from, date_to)
+    assert os.path.exists(index_path(dated_file))
+
+
+def test_unwritable_index_falls_back_to_memory(dated_file, monkeypatch):
+    """Test range queries still work when the sidecar cannot be saved."""
+    def read_only(path, state):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(date_index, 'save_checkpoint', read_only)
+
+    assert list(iter_date_range_rows(dated_file, '2025-01-05', '2025-01-06')) == \
+        _filtered_scan(dated_file, '2025-01-05', '2025-01-06')
+    assert not os.path.exists(index_path(dated_file))
@@ -0,0 +1,57 @@
+"""Unit tests for the math utilities.
+
+This module tests that RunningStats gives the same statistics whether
+values are added one at a time, in chunks or merged from parts.
+"""
+
+import math
+import random
+import statistics
+
+from utils.math_utils import CHUNK_SIZE, RunningStats, calculate_statistics
+
+
+def _values(count, seed=1):
+    rng = random.Random(seed)
+    return [round(rng.uniform(-500, 500), 2) for _ in range(count)]
+
+
+def test_update_matches_add_and_builtins():
+    """Test chunked update equals per-value add and the exact builtins."""
+    values = _values(3 * CHUNK_SIZE + 17)
+    chunked = RunningStats(values)
+    single = RunningStats()
+    for value in values:
+        single.add(value)
+
+    for stats in (chunked, single):
+        assert stats.count == len(values)
+        assert stats.total == math.fsum(values)
+        assert stats.min == min(values)
+        assert stats.max == max(values)
+        assert math.isclose(stats.variance, statistics.variance(values), rel_tol=1e-12)
+    assert chunked.to_dict() == single.to_dict() == calculate_statistics(values)
+
+
+def test_merged_and_restored_totals_stay_exact():
+    """Test totals over parts and saved states equal one exact sum."""
+    values = [1e16, 1.0, -1e16, 0.1] * CHUNK_SIZE + _values(1000)
+    merged = RunningStats()
+    for start in range(0, len(values), 999):
+        part = RunningStats()
+        for value in values[start:start + 999]:
+            part.add(value)
+        merged.merge(RunningStats.from_state(part.get_state()))
+
+    assert merged.count == len(values)
+    assert merged.total == math.fsum(values)
+
+
+def test_non_finite_values():
+    """Test a chunk with infinities falls back to per-value adds."""
+    stats = RunningStats([1.0, math.inf, 2.0])
+
+    assert stats.count == 3
+    assert stats.total == math.inf
+    assert stats.max == math.inf
+    assert stats.min == 1.0
@@ -0,0 +1,91 @@
+"""Unit tests for row-aligned byte ranges.
+
+This module tests that find_row_ranges never splits a row, whatever the
+chunk size, for quoted newlines, CRLF endings, a missing final newline and
+header-only or empty files.
+"""
+
+import pytest
+
+from utils.data_utils import iter_csv_rows
+from utils.parallel import find_row_ranges, iter_range_rows
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1 << 20]
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "sales.csv"
+    path.write_bytes(text.encode())
+    return str(path)
+
+
+def _rows_from_ranges(path, chunk_bytes):
+    header, ranges = find_row_ranges(path, chunk_bytes)
+    return [row for start, end in ranges for row in iter_range_rows(path, header, start, end)]
+
+
+def _assert_ranges_cover_rows(path):
+    expected = list(iter_csv_rows(path, reader='csv'))
+    for chunk_bytes in CHUNK_SIZES:
+        header, ranges = find_row_ranges(path, chunk_bytes)
+        assert all(end > start for start, end in ranges)
+        assert all(ranges[i][1] == ranges[i + 1][0] for i in range(len(ranges) - 1))
+        assert _rows_from_ranges(path, chunk_bytes) == expected, chunk_bytes
+    return expected
+
+
+def test_ranges_keep_quoted_newlines_in_one_row(tmp_path):
+    """Test newlines and doubled quotes inside quoted fields never end a range."""
+    path = _write(tmp_path, 'date,product,amount\n'
+                            '2025-01-01,"Widget\nDeluxe",10.50\n'
+                            '2025-01-02,"Say ""hi""\n\nagain",3\n'
+                            '2025-01-03,Gadget,4\n')
+
+    rows = _assert_ranges_cover_rows(path)
+
+    assert [row['product'] for row in rows] == ['Widget\nDeluxe', 'Say "hi"\n\nagain', 'Gadget']
+
+
+def test_ranges_with_crlf_line_endings(tmp_path):
+    """Test CRLF files split on row boundaries and keep no stray carriage returns."""
+    path = _write(tmp_path, 'date,product,amount\r\n2025-01-01,A,1\r\n2025-01-02,"B\r\nC",2\r\n')
+
+    rows = _assert_ranges_cover_rows(path)
+
+    assert [row['amount'] for row in rows] == ['1', '2']
+    assert rows[1]['product'] == 'B\r\nC'
+
+
+def test_ranges_without_trailing_newline(tmp_path):
+    """Test the last row is included when the file does not end in a newline."""
+    text = 'date,product,amount\n2025-01-01,A,1\n2025-01-02,B,2'
+    path = _write(tmp_path, text)
+
+    rows = _assert_ranges_cover_rows(path)
+
+    assert find_row_ranges(path, 1 << 20)[1][-1][1] == len(text)
+    assert rows[-1] == {'date': '2025-01-02', 'product': 'B', 'amount': '2'}
+
+
+@pytest.mark.parametrize("text", ['date,product,amount\n', 'date,product,amount', ''])
+def test_ranges_for_header_only_and_empty_files(tmp_path, text):
+    """Test files without data rows have no ranges."""
+    path = _write(tmp_path, text)
+
+    header, ranges = find_row_ranges(path, 4)
+
+    assert ranges == []
+    assert header == (['date', 'product', 'amount'] if text else [])
+
+
+def test_ranges_from_offset_and_invalid_chunk_size(tmp_path):
+    """Test ranges can resume from a saved row boundary and reject a zero chunk size."""
+    path = _write(tmp_path, 'date,amount\n2025-01-01,1\n2025-01-02,2\n')
+    header, ranges = find_row_ranges(path, 1 << 20)
+    second_row = len('date,amount\n2025-01-01,1\n')
+
+    _, resumed = find_row_ranges(path, 1 << 20, start=second_row)
+
+    assert resumed == [(second_row, ranges[-1][1])]
+    with pytest.raises(ValueError):
+        find_row_ranges(path, 0)
@@ -0,0 +1,106 @@
+"""Unit tests for the single-pass pipeline.
+
+This module tests that each consumer's output equals the standalone module
+it replaces on a file with invalid rows, and consumer registration.
+"""
+
+import csv
+import logging
+
+import pytest
+
+from analyzer import analyze_sales_data
+from data_cleaner import clean_csv_data
+from pipeline import Pipeline, PipelineConsumer, CleanCSVWriter, run_sales_pipeline
+from report_generator import generate_report
+
+MIXED_CSV = (
+    'date,product,amount,quantity\n'
+    '2025-01-01,Widget,10.005,3\n'
+    '2025-01-02,Gadget,n/a,2\n'
+    '2025-01-03, Widget ,7.25,x\n'
+    '2025-01-04,,4.00,1\n'
+    '2025-01-05,Gizmo,-2.00,1\n'
+    '2025-01-06,Gadget,5.50,\n'
+    '2025-01-07,Gizmo,1e2,4\n'
+)
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text(MIXED_CSV)
+    return str(path)
+
+
+def _read(path):
+    with open(path, newline='') as file:
+        return list(csv.DictReader(file))
+
+
+def test_consumers_match_standalone_modules(tmp_path, data_file):
+    """Test pipeline outputs equal the cleaner, analyzer and report generator."""
+    results = run_sales_pipeline(data_file, str(tmp_path / "clean.csv"))
+    analysis = analyze_sales_data(data_file)
+
+    assert results['read'] == 7
+    assert results['statistics']['amount'] == analysis['amount_stats']
+    assert results['statistics']['quantity'] == analysis['quantity_stats']
+    assert results['products'] == analysis['product_stats']
+    assert "\n".join(results['report']) == generate_report(data_file)
+
+    assert clean_csv_data(data_file, str(tmp_path / "cleaner.csv"))
+    assert _read(tmp_path / "clean.csv") == _read(tmp_path / "cleaner.csv")
+    assert results['clean_csv'] == 7 - results['invalid']
+
+
+def test_register_rejects_duplicates_and_unknown_rules():
+    """Test consumer names are unique and rules must exist."""
+    class Counter(PipelineConsumer):
+        name = 'counter'
+
+        def consume(self, row):
+            pass
+
+    class Unknown(Counter):
+        name = 'unknown'
+        rule = 'strict'
+
+    pipeline = Pipeline(logging.getLogger('test')).register(Counter())
+
+    with pytest.raises(ValueError, match="already registered"):
+        pipeline.register(Counter())
+    with pytest.raises(ValueError, match="Unknown validation rule"):
+        pipeline.register(Unknown())
+
+
+def test_consumers_must_implement_consume():
+    """Test PipelineConsumer is abstract."""
+    with pytest.raises(TypeError):
+        PipelineConsumer()
+
+
+def test_failed_run_keeps_existing_output(tmp_path, data_file):
+    """Test a consumer failure leaves no partial cleaned file behind."""
+    class Failing(PipelineConsumer):
+        name = 'failing'
+
+        def consume(self, row):
+            if row['product'] == 'Gizmo':
+                raise RuntimeError("boom")
+
+    output = tmp_path / "clean.csv"
+    output.write_text("previous\n")
+    pipeline = Pipeline(logging.getLogger('test'))
+    pipeline.register(CleanCSVWriter(str(output))).register(Failing())
+
+    assert pipeline.run(data_file) is None
+    assert output.read_text() == "previous\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["clean.csv", "sales.csv"]
@@ -0,0 +1,129 @@
+"""Unit tests for the on-disk result cache.
+
+This module tests cache hits, invalidation when the input file or options
+change, content hashing, least-recently-used eviction and the cached paths
+of analyze_sales_data and generate_report.
+"""
+
+import logging
+import os
+
+import pytest
+
+import analyzer
+import report_generator
+from analyzer import analyze_sales_data
+from report_generator import generate_report
+from utils.result_cache import ResultCache
+
+CSV_TEXT = 'date,product,amount,quantity\n2025-01-01,Widget,10.00,2\n2025-01-02,Gadget,5.50,1\n'
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text(CSV_TEXT)
+    return str(path)
+
+
+def _touch(path, step):
+    """Move a file's modification time forward by whole seconds."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step * 1_000_000_000))
+
+
+def test_cache_hit_returns_stored_result(tmp_path, data_file):
+    """Test a stored result is returned for the same file and options."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key(data_file, {'result': 'analysis'})
+
+    assert cache.get(key) is None
+    cache.put(key, {'total': 15.5})
+
+    assert cache.get(cache.key(data_file, {'result': 'analysis'})) == {'total': 15.5}
+    assert cache.key(data_file, {'result': 'report'}) != key
+
+
+def test_cache_key_changes_with_file(tmp_path, data_file):
+    """Test appending to or touching the file invalidates its entries."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache.key(data_file)
+
+    with open(data_file, 'a') as file:
+        file.write('2025-01-03,Widget,1.00,1\n')
+    appended = cache.key(data_file)
+    _touch(data_file, 1)
+
+    assert len({key, appended, cache.key(data_file)}) == 3
+
+
+def test_content_hash_detects_same_size_rewrite(tmp_path, data_file):
+    """Test hash_contents tells apart rewrites that keep size and mtime."""
+    plain = ResultCache(str(tmp_path / "cache"))
+    hashed = ResultCache(str(tmp_path / "cache"), hash_contents=True)
+    stat = os.stat(data_file)
+    keys = (plain.key(data_file), hashed.key(data_file))
+
+    with open(data_file, 'w') as file:
+        file.write(CSV_TEXT.replace('Widget', 'Wodget'))
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert plain.key(data_file) == keys[0]
+    assert hashed.key(data_file) != keys[1]
+
+
+def test_evict_removes_least_recently_used(tmp_path, data_file):
+    """Test entries over the size cap are evicted oldest use first."""
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=10 ** 6)
+    keys = [cache.key(data_file, {'n': n}) for n in range(3)]
+    for step, key in enumerate(keys):
+        cache.put(key, 'x' * 100)
+        _touch(cache._entry_path(key), step - 10)
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(keys[0]) == 'x' * 100
+    entry_size = os.path.getsize(cache._entry_path(keys[0]))
+
+    cache.max_bytes = 2 * entry_size
+    assert cache.evict() == 1
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == cache.get(keys[2]) == 'x' * 100
+
+
+def test_put_evicts_over_cap(tmp_path, data_file):
+    """Test writing an entry enforces the size cap."""
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=0)
+    key = cache.key(data_file)
+
+    cache.put(key, [1, 2, 3])
+
+    assert cache.get(key) is None
+    assert ResultCache(str(tmp_path / "missing")).evict() == 0
+
+
+def test_analysis_and_report_use_cache(tmp_path, data_file, monkeypatch):
+    """Test cached analysis and report results skip reading the file until it changes."""
+    cache = ResultCache(str(tmp_path / "cache"))
+    analysis = analyze_sales_data(data_file, cache=cache)
+    report = generate_report(data_file, cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was read")
+
+    monkeypatch.setattr(analyzer, 'summarize_rows', fail)
+    monkeypatch.setattr(report_generator, 'build_report', fail)
+    assert analyze_sales_data(data_file, cache=cache) == analysis
+    assert generate_report(data_file, cache=cache) == report
+    monkeypatch.undo()
+
+    with open(data_file, 'a') as file:
+        file.write('2025-01-03,Widget,4.50,1\n')
+    assert analyze_sales_data(data_file, cache=cache)['amount_stats']['count'] == 3
+    assert 'Total Records: 3' in generate_report(data_file, cache=cache)
@@ -6,5 +6,6 @@ Exports utility modules for data operations, math calculations, and logging.
 from . import data_utils
 from . import math_utils
 from . import logging_utils
+from . import columnar
 
-__all__ = ['data_utils', 'math_utils', 'logging_utils']
+__all__ = ['data_utils', 'math_utils', 'logging_utils', 'columnar']
@@ -0,0 +1,145 @@
+"""
+Checkpoint utilities module.
+Persists progress through append-only CSV files and detects when the processed region changed.
+"""
+
+import json
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+from .data_utils import file_fingerprint
+from .parallel import DEFAULT_CHUNK_BYTES, find_row_ranges
+
+
+# Bytes hashed at the start of the file and just before the saved offset
+FINGERPRINT_BYTES = 4096
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a JSON checkpoint file.
+    
+    Args:
+        path: Path to the checkpoint file
+    
+    Returns:
+        The saved dictionary, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, 'r') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """
+    Atomically replace a JSON checkpoint file.
+    
+    Args:
+        path: Path to the checkpoint file
+        state: JSON-serializable dictionary
+    
+    Raises:
+        OSError: If the file cannot be written
+    """
+    with open(path + '.tmp', 'w') as file:
+        json.dump(state, file)
+    os.replace(path + '.tmp', path)
+
+
+def fingerprint_region(filepath: str, offset: int) -> Dict[str, Any]:
+    """
+    Describe the processed region of a file, from its start up to an offset.
+    
+    Args:
+        filepath: Path to the file
+        offset: End of the processed region
+    
+    Returns:
+        Dictionary with the offset and hashes of the region's first and
+        last bytes
+    """
+    return {
+        'offset': offset,
+        'head': file_fingerprint(filepath, min(offset, FINGERPRINT_BYTES), FINGERPRINT_BYTES),
+        'tail': file_fingerprint(filepath, offset, FINGERPRINT_BYTES)
+    }
+
+
+def region_unchanged(filepath: str, region: Dict[str, Any]) -> bool:
+    """
+    Check that a region saved by fingerprint_region is still intact.
+    
+    A file that was truncated below the offset, or rewritten so that the
+    bytes at either end of the region differ, fails the check.
+    
+    Args:
+        filepath: Path to the file
+        region: Dictionary from fingerprint_region
+    
+    Returns:
+        True if the file still starts with the processed region
+    """
+    try:
+        offset = region['offset']
+        if offset > os.path.getsize(filepath):
+            return False
+        return fingerprint_region(filepath, offset) == region
+    except (KeyError, TypeError):
+        return False
+
+
+def complete_row_ranges(filepath: str, start: Optional[int] = None,
+                        chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split the rows after an offset into byte ranges, leaving out a final
+    row that is not yet complete.
+    
+    A row is incomplete while it lacks its newline or leaves a quoted
+    field open; it may still be being appended and is picked up by a
+    later call.
+    
+    Args:
+        filepath: Path to the CSV file
+        start: Row boundary to start from (default: just after the header)
+        chunk_bytes: Approximate size of each range
+    
+    Returns:
+        Tuple of (header field names, list of (start, end) byte offsets)
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    header, ranges = find_row_ranges(filepath, chunk_bytes, start=start)
+    if not ranges:
+        return header, ranges
+    
+    last_start, last_end = ranges[-1]
+    with open(filepath, 'rb') as file:
+        file.seek(last_start)
+        block = file.read(last_end - last_start)
+    if not block.endswith(b'\n') or block.count(b'"') % 2:
+        ranges.pop()
+        row_end = _last_row_end(block)
+        if row_end:
+            ranges.append((last_start, last_start + row_end))
+    return header, ranges
+
+
+def _last_row_end(block: bytes) -> int:
+    """Return the offset just past the last row boundary in a block that starts on one, or 0."""
+    if b'"' not in block:
+        return block.rfind(b'\n') + 1
+    row_end = 0
+    quotes = 0
+    position = 0
+    while True:
+        newline = block.find(b'\n', position)
+        if newline == -1:
+            return row_end
+        quotes += block.count(b'"', position, newline)
+        position = newline + 1
+        if quotes % 2 == 0:
+            row_end = position
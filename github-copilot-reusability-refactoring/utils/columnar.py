@@ -0,0 +1,347 @@
+"""
+Columnar utilities module.
+Provides a typed column loader for sales CSV files and vectorized statistics on its columns.
+"""
+
+import csv
+import gc
+import math
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
+
+from .math_utils import round_to_decimal_places
+
+
+# Rows parsed per batch; large enough to amortize per-batch overhead,
+# small enough to keep the temporary string lists modest
+CHUNK_ROWS = 65536
+
+
+def _numpy():
+    """Return the numpy module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector.
+    
+    Parsing allocates millions of short-lived row lists that never form
+    cycles; without this the collector repeatedly scans them and parsing
+    takes about twice as long.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class SalesColumns(NamedTuple):
+    """
+    Sales data stored column-wise, one entry per data row.
+    
+    amount and quantity are array('d') / array('q'), or NumPy float64 /
+    int64 arrays. product_codes index into products. amount_valid and
+    quantity_valid are array('B') / NumPy bool masks marking the rows whose
+    value parsed; invalid values are stored as 0 and must be masked out
+    (see column_statistics).
+    """
+    amount: Any
+    quantity: Any
+    product_codes: Any
+    products: List[str]
+    amount_valid: Any
+    quantity_valid: Any
+    
+    def __len__(self) -> int:
+        return len(self.amount)
+    
+    @property
+    def invalid_rows(self) -> int:
+        """Number of rows with an invalid amount or quantity."""
+        np = _numpy()
+        if np is not None and isinstance(self.amount_valid, np.ndarray):
+            return len(self) - int(np.count_nonzero(self.amount_valid & self.quantity_valid))
+        return sum(1 for amount_ok, quantity_ok in zip(self.amount_valid, self.quantity_valid)
+                   if not (amount_ok and quantity_ok))
+
+
+def load_sales_columns(filepath: str, use_numpy: Optional[bool] = None,
+                       chunk_rows: int = CHUNK_ROWS) -> SalesColumns:
+    """
+    Load the amount, quantity and product columns of a sales CSV file.
+    
+    Every data row is kept. As in analyze_sales_data, amount and quantity
+    are validated independently: an amount that is not a float or a
+    quantity that is not an int64 integer is marked invalid in its own
+    mask without affecting the other column. Amounts are rounded to 2
+    decimal places as analyze_sales_data does; product names are
+    dictionary-encoded to integer codes in order of first appearance.
+    
+    Args:
+        filepath: Path to the CSV file
+        use_numpy: Return NumPy arrays (default: if NumPy is installed)
+        chunk_rows: Rows parsed per batch
+    
+    Returns:
+        SalesColumns with row-aligned columns
+    
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If a required column is missing from the header
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+    np = _numpy() if use_numpy is not False else None
+    if use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+    
+    amounts = array('d')
+    quantities = array('q')
+    codes = array('i')
+    amount_valid = array('B')
+    quantity_valid = array('B')
+    product_index: Dict[str, int] = {}
+    
+    with open(filepath, 'r', newline='') as file, _gc_paused():
+        reader = csv.reader(file)
+        header = next(reader, None) or []
+        try:
+            amount_col, quantity_col, product_col = (
+                header.index(name) for name in ('amount', 'quantity', 'product')
+            )
+        except ValueError:
+            raise ValueError(f"{filepath}: header must include amount, quantity and product") from None
+        
+        while True:
+            chunk = list(islice(reader, chunk_rows))
+            if not chunk:
+                break
+            _parse_chunk(chunk, (amount_col, quantity_col, product_col),
+                         (amounts, quantities, codes, amount_valid, quantity_valid), product_index)
+    
+    products = list(product_index)
+    if np is not None:
+        amount = np.frombuffer(amounts, dtype=np.float64)
+        # Same result as round_to_decimal_places: both round half to even
+        amount = np.round(amount * 100) / 100
+        return SalesColumns(amount, np.frombuffer(quantities, dtype=np.int64),
+                            np.frombuffer(codes, dtype=np.intc), products,
+                            np.frombuffer(amount_valid, dtype=np.bool_),
+                            np.frombuffer(quantity_valid, dtype=np.bool_))
+    
+    amounts = array('d', [round(value * 100) / 100 for value in amounts])
+    return SalesColumns(amounts, quantities, codes, products, amount_valid, quantity_valid)
+
+
+def _parse_chunk(chunk: List[List[str]], positions: Tuple[int, int, int],
+                 columns: Tuple[array, ...], product_index: Dict[str, int]) -> None:
+    """
+    Append one batch of raw rows to the columns.
+    
+    Converts each column of the batch at once and falls back to
+    value-by-value parsing only for a column that contains an invalid
+    value, or to row-by-row parsing when the batch contains a short row.
+    
+    Args:
+        chunk: Raw rows
+        positions: Header positions of amount, quantity and product
+        columns: amount, quantity, product code, amount mask and quantity
+            mask arrays to append to
+        product_index: Product codes by name, extended with new names
+    """
+    amount_col, quantity_col, product_col = positions
+    amounts, quantities, codes, amount_valid, quantity_valid = columns
+    # zip(*chunk) stops at the shortest row, so a short row drops the columns
+    transposed = list(zip(*chunk))
+    if len(transposed) <= max(positions):
+        for row in chunk:
+            _parse_row(row, positions, columns, product_index)
+        return
+    
+    _append_column(transposed[amount_col], float, amounts, amount_valid)
+    _append_column(transposed[quantity_col], int, quantities, quantity_valid)
+    chunk_products = transposed[product_col]
+    # Assign codes to new names in order of first appearance, then map in C
+    for product in dict.fromkeys(chunk_products):
+        if product not in product_index:
+            product_index[product] = len(product_index)
+    codes.extend(map(product_index.__getitem__, chunk_products))
+
+
+def _append_column(raw: Sequence[str], field_type: type, column: array, valid: array) -> None:
+    """Convert raw values and append them, masking out the ones that do not parse."""
+    try:
+        converted = array(column.typecode, map(field_type, raw))
+    except (ValueError, OverflowError):
+        for value in raw:
+            _append_value(_convert(value, field_type), column, valid)
+        return
+    column.extend(converted)
+    valid.frombytes(b'\x01' * len(raw))
+
+
+def _parse_row(row: List[str], positions: Tuple[int, int, int],
+               columns: Tuple[array, ...], product_index: Dict[str, int]) -> None:
+    """Append one row that may be missing fields; missing values are invalid."""
+    amount_col, quantity_col, product_col = positions
+    amounts, quantities, codes, amount_valid, quantity_valid = columns
+    fields = len(row)
+    _append_value(_convert(row[amount_col], float) if amount_col < fields else None, amounts, amount_valid)
+    _append_value(_convert(row[quantity_col], int) if quantity_col < fields else None, quantities, quantity_valid)
+    codes.append(_encode(product_index, row[product_col] if product_col < fields else ''))
+
+
+def _convert(value: str, field_type: type) -> Optional[Any]:
+    """Convert one raw value, or return None if it is invalid."""
+    try:
+        return field_type(value)
+    except ValueError:
+        return None
+
+
+def _append_value(value: Optional[Any], column: array, valid: array) -> None:
+    """Append one value and its mask entry; invalid values are stored as 0."""
+    try:
+        column.append(0 if value is None else value)
+    except OverflowError:
+        # Integers beyond int64 cannot be stored and count as invalid
+        value = None
+        column.append(0)
+    valid.append(value is not None)
+
+
+def _encode(product_index: Dict[str, int], product: str) -> int:
+    """Return the code for a product name, assigning the next code to new names."""
+    code = product_index.get(product)
+    if code is None:
+        code = product_index[product] = len(product_index)
+    return code
+
+
+def column_statistics(values: Any, valid: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Calculate statistics for a numeric column in vectorized form.
+    
+    Equivalent to math_utils.calculate_statistics over the valid values,
+    but runs on an array or NumPy array without creating a Python object
+    per value. Float totals are exact (math.fsum) and integer totals are
+    summed as integers, so with the masks from load_sales_columns the
+    result equals the amount and quantity statistics of analyze_sales_data.
+    
+    Args:
+        values: array('d'), array('q') or NumPy array
+        valid: Mask of the values to include, e.g. SalesColumns.amount_valid
+            (default: all values)
+    
+    Returns:
+        Dictionary containing total, average, min, max, and count
+    """
+    if valid is not None:
+        values = _compress(values, valid)
+    count = len(values)
+    if count == 0:
+        return {
+            'total': 0.0,
+            'average': 0.0,
+            'min': None,
+            'max': None,
+            'count': 0
+        }
+    
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        floating = values.dtype.kind == 'f'
+        total = float(math.fsum(values.tolist()) if floating else values.sum())
+        minimum = float(values.min())
+        maximum = float(values.max())
+    else:
+        total = float(math.fsum(values) if values.typecode == 'd' else sum(values))
+        minimum = float(min(values))
+        maximum = float(max(values))
+    
+    return {
+        'total': round_to_decimal_places(total),
+        'average': round_to_decimal_places(total / count),
+        'min': round_to_decimal_places(minimum),
+        'max': round_to_decimal_places(maximum),
+        'count': count
+    }
+
+
+def column_product_statistics(columns: SalesColumns) -> Dict[str, Dict[str, float]]:
+    """
+    Calculate statistics grouped by product in vectorized form.
+    
+    Equivalent to analyzer.calculate_product_statistics: only rows with a
+    product name and a valid amount and quantity are included. Amount
+    totals are exact (math.fsum per product) and quantities are summed as
+    integers, so the totals equal analyze_sales_data's.
+    
+    Args:
+        columns: Loaded sales columns
+    
+    Returns:
+        Dictionary mapping products to their statistics
+    """
+    product_count = len(columns.products)
+    np = _numpy()
+    if np is not None and isinstance(columns.amount, np.ndarray):
+        valid = columns.amount_valid & columns.quantity_valid
+        codes, amounts, quantities = (_compress(column, valid) for column in
+                                      (columns.product_codes, columns.amount, columns.quantity))
+        row_counts = np.bincount(codes, minlength=product_count)
+        # Group the amounts by product, then sum each group exactly
+        grouped = amounts[np.argsort(codes, kind='stable')].tolist()
+        ends = np.cumsum(row_counts).tolist()
+        amount_totals = [math.fsum(grouped[end - count:end])
+                         for end, count in zip(ends, row_counts.tolist())]
+        quantity_totals = np.zeros(product_count, dtype=np.int64)
+        np.add.at(quantity_totals, codes, quantities)
+        quantity_totals = quantity_totals.tolist()
+        row_counts = row_counts.tolist()
+    else:
+        product_amounts = [array('d') for _ in range(product_count)]
+        quantity_totals = [0] * product_count
+        for code, amount, quantity, amount_ok, quantity_ok in zip(
+                columns.product_codes, columns.amount, columns.quantity,
+                columns.amount_valid, columns.quantity_valid):
+            if amount_ok and quantity_ok:
+                product_amounts[code].append(amount)
+                quantity_totals[code] += quantity
+        amount_totals = [math.fsum(amounts) for amounts in product_amounts]
+        row_counts = [len(amounts) for amounts in product_amounts]
+    
+    product_stats = {}
+    for code, product in enumerate(columns.products):
+        if not product or row_counts[code] == 0:
+            continue
+        total = amount_totals[code]
+        product_stats[product] = {
+            'total_amount': round_to_decimal_places(total),
+            'total_quantity': int(quantity_totals[code]),
+            'count': row_counts[code],
+            'average_amount': round_to_decimal_places(total / row_counts[code])
+        }
+    
+    return product_stats
+
+
+def _compress(values: Any, valid: Any) -> Any:
+    """Select the values whose mask entry is true, without copying when all are."""
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        valid = np.asarray(valid, dtype=np.bool_)
+        return values if valid.all() else values[valid]
+    if b'\x00' not in valid.tobytes():
+        return values
+    return array(values.typecode, [value for value, ok in zip(values, valid) if ok])
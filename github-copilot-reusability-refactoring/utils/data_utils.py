@@ -4,8 +4,26 @@ Provides reusable functions for CSV file operations, data reading, and cleaning.
 """
 
 import csv
+import hashlib
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from .fast_csv import RowProjector, scan_csv_rows
+from .math_utils import round_to_decimal_places, validate_positive_number
+
+
+# Suffix of the temporary file an output is written to before it replaces the target
+TEMP_SUFFIX = '.tmp'
+
+# Columns of a cleaned sales row, in output order
+SALES_FIELDS = ['date', 'product', 'amount', 'quantity']
+
+# Columns clean_sales_row requires in every valid row
+SALES_REQUIRED_FIELDS = ['amount', 'quantity', 'product']
+
+# Files at least this large are read with the bulk scanner by reader='auto';
+# below it the scanner's setup costs more than it saves
+AUTO_MMAP_BYTES = 64 * 1024
 
 
 def file_exists(filepath: str) -> bool:
@@ -21,12 +39,34 @@ def file_exists(filepath: str) -> bool:
     return os.path.exists(filepath)
 
 
-def read_csv_file(filepath: str) -> Optional[List[Dict[str, Any]]]:
+def file_fingerprint(filepath: str, end: int, length: int = 4096) -> str:
+    """
+    Hash the bytes of a file just before an offset.
+    
+    Used to check that an already processed region is still unchanged
+    before resuming from that offset.
+    
+    Args:
+        filepath: Path to the file
+        end: Offset the hashed region ends at
+        length: Number of bytes hashed (fewer at the start of the file)
+        
+    Returns:
+        Hex SHA-256 digest of the region
+    """
+    start = max(0, end - length)
+    with open(filepath, 'rb') as file:
+        file.seek(start)
+        return hashlib.sha256(file.read(end - start)).hexdigest()
+
+
+def read_csv_file(filepath: str, columns: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
     """
     Read data from a CSV file and return as list of dictionaries.
     
     Args:
         filepath: Path to the CSV file to read
+        columns: Columns to keep in each row (default: all)
         
     Returns:
         List of dictionaries containing row data, or None if error occurs
@@ -35,36 +75,133 @@ def read_csv_file(filepath: str) -> Optional[List[Dict[str, Any]]]:
         return None
     
     try:
-        data = []
-        with open(filepath, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                data.append(row)
-        return data
+        return list(iter_csv_rows(filepath, columns=columns))
     except Exception:
         return None
 
 
-def write_csv_file(filepath: str, data: List[Dict[str, Any]], fieldnames: List[str]) -> bool:
+def iter_csv_rows(filepath: str, reader: str = 'csv',
+                  columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a CSV file one dictionary at a time.
+    
+    Only the current row is held in memory, so files of any size can be
+    processed. The file stays open until the iterator is exhausted or closed.
+    
+    Args:
+        filepath: Path to the CSV file to read
+        reader: 'csv' for the csv module, 'mmap' for the bulk scanner in
+            fast_csv (see scan_csv_rows; it scans the whole file for row
+            boundaries before the first row), or 'auto' for the scanner on
+            files of at least AUTO_MMAP_BYTES (all produce the same rows)
+        columns: Columns to keep in each row (default: all); other fields
+            are never stored, and columns missing from the file are None
+        
+    Returns:
+        Iterator of dictionaries containing row data
+        
+    Raises:
+        OSError: If the file cannot be opened
+        csv.Error: If the file is not valid CSV
+        ValueError: If the reader is unknown
+    """
+    if reader == 'auto':
+        reader = 'mmap' if os.path.getsize(filepath) >= AUTO_MMAP_BYTES else 'csv'
+    
+    if reader == 'mmap':
+        yield from scan_csv_rows(filepath, columns)
+        return
+    if reader != 'csv':
+        raise ValueError(f"Unknown reader: {reader}")
+    
+    with open(filepath, 'r', newline='') as file:
+        if columns is None:
+            yield from csv.DictReader(file)
+            return
+        
+        rows = csv.reader(file)
+        header = next(rows, None)
+        if header is None:
+            return
+        projector = RowProjector(header, columns)
+        for values in rows:
+            if values:
+                yield projector.project(values)
+
+
+def write_csv_file(filepath: str, data: Iterable[Dict[str, Any]], fieldnames: List[str]) -> bool:
     """
     Write data to a CSV file.
     
     Args:
         filepath: Path to the output CSV file
-        data: List of dictionaries to write
+        data: Dictionaries to write (a list or any iterable, e.g. a generator)
         fieldnames: List of field names for the CSV header
         
     Returns:
         True if successful, False otherwise
     """
+    return write_csv_rows(filepath, data, fieldnames) is not None
+
+
+def write_csv_rows(filepath: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Optional[int]:
+    """
+    Stream rows to a CSV file as they are produced.
+    
+    Rows go to a temporary file next to the output, which replaces it only
+    after the last row, so an existing output file is never left partial.
+    
+    Args:
+        filepath: Path to the output CSV file
+        rows: Iterable of dictionaries to write
+        fieldnames: List of field names for the CSV header
+        
+    Returns:
+        Number of rows written, or None if writing fails
+        
+    Raises:
+        Any exception raised while producing rows (e.g. reading the input),
+        after the temporary file is removed
+    """
+    temp_file = filepath + TEMP_SUFFIX
+    iterator = iter(rows)
+    reading = False
+    count = 0
     try:
-        with open(filepath, 'w', newline='') as file:
+        with open(temp_file, 'w', newline='') as file:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
-            writer.writerows(data)
-        return True
-    except Exception:
-        return False
+            while True:
+                reading = True
+                row = next(iterator, None)
+                reading = False
+                if row is None:
+                    break
+                writer.writerow(row)
+                count += 1
+        os.replace(temp_file, filepath)
+    except (OSError, csv.Error, ValueError):
+        remove_file(temp_file)
+        if reading:
+            raise
+        return None
+    except BaseException:
+        remove_file(temp_file)
+        raise
+    return count
+
+
+def remove_file(filepath: str) -> None:
+    """
+    Remove a file if it exists, ignoring errors.
+    
+    Args:
+        filepath: Path to the file
+    """
+    try:
+        os.remove(filepath)
+    except OSError:
+        pass
 
 
 def create_sample_csv(filepath: str, data: List[Dict[str, Any]]) -> bool:
@@ -129,6 +266,42 @@ def validate_required_fields(row: Dict[str, Any], required_fields: List[str]) ->
     return all(row.get(field) for field in required_fields)
 
 
+def clean_sales_row(row: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], str]:
+    """
+    Validate and normalize one raw sales row.
+    
+    This is the single definition of a valid sales row shared by the
+    cleaner and the pipeline's CleanCSVWriter: product, amount and quantity
+    must be present, amount and quantity must be numeric and non-negative.
+    
+    Args:
+        row: Raw data row with string values
+        
+    Returns:
+        Tuple of (cleaned row with a rounded float amount, int quantity and
+        normalized product, or None if invalid; reason the row was rejected,
+        or an empty string)
+    """
+    if not validate_required_fields(row, SALES_REQUIRED_FIELDS):
+        return None, "Skipping row with missing fields"
+    
+    amount = clean_numeric_field(row['amount'], float)
+    quantity = clean_numeric_field(row['quantity'], int)
+    if amount is None or quantity is None:
+        return None, "Skipping row with invalid data"
+    
+    amount = round_to_decimal_places(amount)
+    if not validate_positive_number(amount) or not validate_positive_number(quantity):
+        return None, "Skipping row with negative values"
+    
+    return {
+        'date': row.get('date') or '',
+        'product': clean_text_field(row['product']),
+        'amount': amount,
+        'quantity': quantity
+    }, ''
+
+
 def validate_csv_structure(filepath: str, required_fields: List[str]) -> bool:
     """
     Validate that a CSV file has the required structure.
@@ -144,14 +317,14 @@ def validate_csv_structure(filepath: str, required_fields: List[str]) -> bool:
         return False
     
     try:
-        with open(filepath, 'r') as file:
+        with open(filepath, 'r', newline='') as file:
             reader = csv.DictReader(file)
-            rows = list(reader)
+            first_row = next(reader, None)
             
-            if not rows:
+            if first_row is None:
                 return True  # Empty file is valid
             
             # Check if all required fields are present
-            return all(field in rows[0] for field in required_fields)
+            return all(field in first_row for field in required_fields)
     except Exception:
         return False
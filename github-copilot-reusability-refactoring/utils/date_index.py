@@ -0,0 +1,174 @@
+"""
+Date index utilities module.
+Maintains a sparse (date -> byte offset) sidecar index for date-ordered CSV files.
+"""
+
+import os
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Iterator, Optional
+
+from .checkpoint import (
+    load_checkpoint, save_checkpoint, fingerprint_region, region_unchanged, complete_row_ranges
+)
+from .fast_csv import RowProjector
+from .parallel import find_row_ranges
+
+
+# Suffix of the sidecar file written next to the CSV file
+INDEX_SUFFIX = '.dateidx'
+
+# Approximate bytes between checkpoints; a query reads at most about this
+# much before and after the requested range
+DEFAULT_INTERVAL_BYTES = 64 * 1024
+
+INDEX_VERSION = 2
+
+
+def index_path(filepath: str) -> str:
+    """
+    Return the sidecar index path for a CSV file.
+    
+    Args:
+        filepath: Path to the CSV file
+    
+    Returns:
+        Path of the index file
+    """
+    return filepath + INDEX_SUFFIX
+
+
+def update_date_index(filepath: str, date_column: str = 'date',
+                      interval_bytes: int = DEFAULT_INTERVAL_BYTES) -> Dict[str, Any]:
+    """
+    Build the date index, or extend it over rows appended since the last update.
+    
+    The saved index records how far it reaches and fingerprints of the
+    file's first bytes and of the bytes before that point. If the file
+    shrank or either fingerprint changed, the index is rebuilt from
+    scratch; otherwise only the new bytes are read. An incomplete trailing
+    row is left for the next update, as it may still be being written. If
+    the sidecar cannot be written (e.g. a read-only data directory), the
+    index is still returned and is rebuilt by the next update.
+    
+    Args:
+        filepath: Path to a CSV file ordered by date
+        date_column: Column holding ISO dates (YYYY-MM-DD)
+        interval_bytes: Approximate bytes between checkpoints
+    
+    Returns:
+        The index dictionary (also saved to the sidecar file when possible)
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    index = load_checkpoint(index_path(filepath))
+    if index is None or not _index_matches(index, filepath, date_column, interval_bytes):
+        index = {
+            'version': INDEX_VERSION,
+            'date_column': date_column,
+            'interval_bytes': interval_bytes,
+            'region': fingerprint_region(filepath, 0),
+            'ordered': True,
+            'last_date': '',
+            'checkpoints': []
+        }
+    elif index['region']['offset'] == os.path.getsize(filepath):
+        return index
+    
+    header, ranges = complete_row_ranges(filepath, index['region']['offset'] or None, interval_bytes)
+    if not ranges:
+        return index
+    
+    if date_column not in header:
+        index['ordered'] = False
+    else:
+        projector = RowProjector(header, [date_column])
+        checkpoints = index['checkpoints']
+        with open(filepath, 'rb') as file:
+            for start, end in ranges:
+                file.seek(start)
+                dates = [row[date_column] for row in projector.parse_block(file.read(end - start))]
+                dates = [date for date in dates if date]
+                if not dates:
+                    continue
+                # Every row is checked, since queries stop at the first later date
+                if dates[0] < index['last_date'] or any(map(str.__gt__, dates, dates[1:])):
+                    index['ordered'] = False
+                index['last_date'] = dates[-1]
+                checkpoints.append([dates[0], start])
+    
+    index['region'] = fingerprint_region(filepath, ranges[-1][1])
+    try:
+        save_checkpoint(index_path(filepath), index)
+    except OSError:
+        # Queries only need the in-memory index; it is rebuilt next time
+        pass
+    return index
+
+
+def iter_date_range_rows(filepath: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                         columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a date-ordered CSV file within a date range.
+    
+    The index is updated first, then reading starts at the last checkpoint
+    before date_from and stops at the first row after date_to. If the
+    index found the file out of order, the whole file is scanned and
+    filtered instead.
+    
+    Args:
+        filepath: Path to a CSV file ordered by date
+        date_from: First date to include, e.g. '2025-01-01' (default: no limit)
+        date_to: Last date to include (default: no limit)
+        columns: Columns to keep in each row (default: all); the date
+            column is always included
+    
+    Returns:
+        Iterator of dictionaries containing row data
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    index = update_date_index(filepath)
+    date_column = index['date_column']
+    if columns is not None and date_column not in columns:
+        columns = list(columns) + [date_column]
+    
+    checkpoints = index['checkpoints']
+    dates = [date for date, _ in checkpoints]
+    start = None
+    end = None
+    if index['ordered']:
+        # Rows before the last checkpoint dated before date_from are all earlier
+        if date_from is not None:
+            position = bisect_left(dates, date_from)
+            if position > 0:
+                start = checkpoints[position - 1][1]
+        # Rows from the first checkpoint dated after date_to on are all later
+        if date_to is not None:
+            position = bisect_right(dates, date_to)
+            if position < len(checkpoints):
+                end = checkpoints[position][1]
+    
+    header, ranges = find_row_ranges(filepath, index['interval_bytes'], start=start, end=end)
+    if not header:
+        return
+    projector = RowProjector(header, columns)
+    with open(filepath, 'rb') as file:
+        for range_start, range_end in ranges:
+            file.seek(range_start)
+            for row in projector.parse_block(file.read(range_end - range_start)):
+                date = row[date_column]
+                if date_from is not None and (not date or date < date_from):
+                    continue
+                if date_to is not None and (not date or date > date_to):
+                    if date and index['ordered']:
+                        return
+                    continue
+                yield row
+
+
+def _index_matches(index: Dict[str, Any], filepath: str, date_column: str, interval_bytes: int) -> bool:
+    """Check that a saved index was built with these options over bytes that are unchanged."""
+    return (index.get('version') == INDEX_VERSION and index.get('date_column') == date_column
+            and index.get('interval_bytes') == interval_bytes and region_unchanged(filepath, index.get('region')))
@@ -0,0 +1,184 @@
+"""
+Fast CSV utilities module.
+Provides a block-based CSV scanner that splits rows and fields in bulk.
+"""
+
+import csv
+import io
+from operator import itemgetter
+from typing import List, Dict, Any, Iterator, Optional
+
+from .parallel import find_row_ranges
+
+
+# Bytes scanned per block; each block ends on a row boundary
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+
+
+def scan_csv_rows(filepath: str, fields: Optional[List[str]] = None,
+                  block_bytes: int = DEFAULT_BLOCK_BYTES) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a CSV file using bulk splitting.
+    
+    Row boundaries are first found for the whole file in one pass over a
+    memory map (see find_row_ranges), so the first row is only produced
+    after that pass. Each row-aligned block is then read with a single
+    read() call and parsed by RowProjector.parse_block. Rows are the same
+    as those csv.DictReader produces, restricted to the requested fields.
+    
+    Args:
+        filepath: Path to the CSV file
+        fields: Fields to include in each row (default: all header fields);
+            fields missing from the header are None
+        block_bytes: Approximate size of each block
+        
+    Returns:
+        Iterator of dictionaries containing row data
+        
+    Raises:
+        OSError: If the file cannot be read
+    """
+    header, ranges = find_row_ranges(filepath, block_bytes)
+    if not header:
+        return
+    
+    projector = RowProjector(header, fields)
+    with open(filepath, 'rb') as file:
+        for start, end in ranges:
+            file.seek(start)
+            yield from projector.parse_block(file.read(end - start))
+
+
+class RowProjector:
+    """
+    Builds row dictionaries holding only the requested fields.
+    
+    Values of other fields are never stored; when the requested fields
+    come first in the header, the rest of each line is not even split.
+    """
+    
+    def __init__(self, header: List[str], fields: Optional[List[str]] = None):
+        """
+        Initialize the projector.
+        
+        Args:
+            header: Header field names
+            fields: Fields to keep (default: all); fields missing from the
+                header are None
+        """
+        self.header = list(header)
+        self.fields = self.header if fields is None else list(fields)
+        self.all_fields = self.fields == self.header
+        positions = [self.header.index(field) if field in self.header else None for field in self.fields]
+        present = [position for position in positions if position is not None]
+        
+        self._build_row = _row_builder(self.fields, positions)
+        # Values needed before a row can be built from a partial split
+        self._width = len(self.header) if self.all_fields else (max(present) + 1 if present else 0)
+        self._max_split = -1 if self.all_fields else self._width
+    
+    def project(self, values: List[str]) -> Dict[str, Any]:
+        """
+        Build the row dictionary for one line's values.
+        
+        Args:
+            values: Field values, possibly split only up to the last
+                requested field
+            
+        Returns:
+            Dictionary of the requested fields
+        """
+        if len(values) == self._width or (not self.all_fields and len(values) > self._width):
+            return self._build_row(values)
+        row = _dict_row(self.header, values)
+        return row if self.all_fields else {field: row.get(field) for field in self.fields}
+    
+    def parse_block(self, block: bytes) -> Iterator[Dict[str, Any]]:
+        """
+        Parse a block of complete rows.
+        
+        Blocks without quotes and with consistent line endings are decoded
+        in one call and split with str.split; other blocks are parsed with
+        the csv module.
+        
+        Args:
+            block: Encoded rows ending on a row boundary
+            
+        Returns:
+            Iterator of dictionaries of the requested fields
+        """
+        line_end = _line_terminator(block)
+        if line_end is None or b'"' in block:
+            for values in csv.reader(io.StringIO(block.decode(), newline='')):
+                if values:
+                    yield self.project(values)
+            return
+        
+        max_split = self._max_split
+        for line in block.decode().split(line_end):
+            if line:
+                yield self.project(line.split(',', max_split))
+
+
+def _line_terminator(block: bytes) -> Optional[str]:
+    """
+    Return the line terminator used throughout a block.
+    
+    Returns:
+        '\\n' or '\\r\\n', or None if carriage returns appear elsewhere or
+        the endings are mixed
+    """
+    carriage_returns = block.count(b'\r')
+    if carriage_returns == 0:
+        return '\n'
+    if carriage_returns == block.count(b'\r\n') == block.count(b'\n'):
+        return '\r\n'
+    return None
+
+
+def _row_builder(fields: List[str], positions: List[Optional[int]]):
+    """
+    Return a function that turns a list of split values into a row dict.
+    
+    An operator.itemgetter picks the wanted values in one call, which
+    matters because building rows dominates the scan.
+    
+    Args:
+        fields: Row keys
+        positions: Index of each field in the split values, or None for
+            fields that are always None
+        
+    Returns:
+        Function mapping a list of values to a dictionary
+    """
+    present = [(field, position) for field, position in zip(fields, positions) if position is not None]
+    names = [field for field, _ in present]
+    if not present:
+        return lambda values: dict.fromkeys(fields)
+    if len(present) == 1:
+        # itemgetter with one index returns the value itself, not a tuple
+        position = present[0][1]
+        pick = lambda values: (values[position],)
+    else:
+        pick = itemgetter(*(position for _, position in present))
+    
+    if len(present) == len(fields):
+        return lambda values: dict(zip(names, pick(values)))
+    
+    def build_row(values: List[str]) -> Dict[str, Any]:
+        # Start from all fields so missing ones are None and keep their order
+        row = dict.fromkeys(fields)
+        row.update(zip(names, pick(values)))
+        return row
+    return build_row
+
+
+def _dict_row(header: List[str], values: List[str]) -> Dict[str, Any]:
+    """Build a row like csv.DictReader does for rows of the wrong length."""
+    row = dict(zip(header, values))
+    if len(values) > len(header):
+        row[None] = values[len(header):]
+    else:
+        for field in header[len(values):]:
+            row[field] = None
+    return row
@@ -3,7 +3,10 @@ Math utilities module.
 Provides reusable functions for mathematical operations and calculations.
 """
 
-from typing import List, Optional, Dict, Any
+import math
+from itertools import chain, islice
+from operator import mul
+from typing import List, Optional, Dict, Any, Iterable
 
 
 def round_to_decimal_places(value: float, decimal_places: int = 2) -> float:
@@ -75,45 +78,305 @@ def calculate_maximum(values: List[float]) -> Optional[float]:
     return max(values) if values else None
 
 
-def calculate_statistics(values: List[float]) -> Dict[str, Any]:
+def calculate_statistics(values: Iterable[float]) -> Dict[str, Any]:
     """
     Calculate comprehensive statistics for a list of numbers.
     
     Args:
-        values: List of numbers
+        values: List (or any iterable) of numbers
         
     Returns:
         Dictionary containing total, average, min, max, and count
     """
-    if not values:
+    return RunningStats().update(values).to_dict()
+
+
+def _add_partial(partials: List[float], value: float) -> None:
+    """
+    Add a finite value to a list of non-overlapping partial sums.
+    
+    The partials always sum exactly to the true total (Shewchuk's
+    algorithm, as used by math.fsum), so totals can be merged without
+    accumulating rounding error.
+    
+    Args:
+        partials: Partial sums, updated in place
+        value: Finite number to add
+    """
+    i = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[i] = low
+            i += 1
+        value = high
+    partials[i:] = [value]
+
+
+def _chunk_partials(values: List[float], total: Optional[float] = None) -> List[float]:
+    """
+    Return a few non-overlapping partial sums of a chunk of finite values.
+    
+    Each partial is the correctly rounded remainder of the exact chunk
+    total after the previous ones (computed with math.fsum), so together
+    they sum exactly to the chunk total; usually one or two are needed.
+    
+    Args:
+        values: Finite numbers
+        total: math.fsum(values), if already known
+        
+    Returns:
+        Partial sums, largest first
+    """
+    partials = []
+    remainder = math.fsum(values) if total is None else total
+    while remainder:
+        partials.append(remainder)
+        remainder = math.fsum(chain(values, [-partial for partial in partials]))
+    return partials
+
+
+# Values summed at a time by RunningStats.update and buffered by add
+CHUNK_SIZE = 4096
+
+
+class RunningStats:
+    """
+    Mergeable single-pass statistics accumulator.
+    
+    Tracks count, mean and variance (Welford's algorithm), min, max and an
+    exact total. Accumulators built over separate chunks, files or worker
+    processes can be combined with merge(); the merged total is the same
+    as summing every value in one place.
+    
+    update() processes values a chunk at a time with the math builtins;
+    add() updates count, mean, min and max at once but buffers values for
+    the exact total and sums them a chunk at a time.
+    """
+    
+    def __init__(self, values: Optional[Iterable[float]] = None):
+        """
+        Initialize an empty accumulator.
+        
+        Args:
+            values: Optional values to add immediately
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._m2 = 0.0
+        self._partials: List[float] = []
+        self._pending: List[float] = []
+        self._nonfinite = 0.0
+        if values is not None:
+            self.update(values)
+    
+    def add(self, value: float) -> None:
+        """
+        Add one value.
+        
+        Args:
+            value: Number to add
+        """
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if math.isfinite(value):
+            self._pending.append(value)
+            if len(self._pending) >= CHUNK_SIZE:
+                self._flush()
+        else:
+            self._nonfinite += value
+    
+    def update(self, values: Iterable[float]) -> 'RunningStats':
+        """
+        Add many values, CHUNK_SIZE at a time.
+        
+        Each chunk is summed with math.fsum and folded in with the same
+        pairwise update as merge(); a chunk with non-finite values falls
+        back to add().
+        
+        Args:
+            values: Iterable of numbers
+            
+        Returns:
+            This accumulator, for chaining
+        """
+        iterator = iter(values)
+        while True:
+            chunk = list(map(float, islice(iterator, CHUNK_SIZE)))
+            if not chunk:
+                return self
+            try:
+                total = math.fsum(chunk)
+            except (OverflowError, ValueError):
+                total = math.inf
+            if not math.isfinite(total):
+                for value in chunk:
+                    self.add(value)
+                continue
+            
+            count = len(chunk)
+            mean = total / count
+            deviations = [value - mean for value in chunk]
+            m2 = sum(map(mul, deviations, deviations))
+            self._combine(count, mean, m2, min(chunk), max(chunk))
+            for partial in _chunk_partials(chunk, total):
+                _add_partial(self._partials, partial)
+    
+    def _flush(self) -> None:
+        """Fold the values buffered by add() into the exact total."""
+        if self._pending:
+            for partial in _chunk_partials(self._pending):
+                _add_partial(self._partials, partial)
+            self._pending = []
+    
+    def _combine(self, count: int, mean: float, m2: float,
+                 minimum: float, maximum: float) -> None:
+        """
+        Fold the moments of a disjoint set of values into this accumulator.
+        
+        Uses the pairwise update of Chan et al.; the total is not changed.
+        
+        Args:
+            count: Number of values (at least one)
+            mean: Mean of the values
+            m2: Sum of squared deviations from the mean
+            minimum: Smallest value
+            maximum: Largest value
+        """
+        if self.count == 0:
+            self.count, self.mean, self._m2 = count, mean, m2
+            self.min, self.max = minimum, maximum
+            return
+        
+        total_count = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total_count
+        self._m2 += m2 + delta * delta * self.count * count / total_count
+        self.count = total_count
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+    
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Combine another accumulator into this one.
+        
+        Uses the pairwise update of Chan et al. for mean and variance; the
+        total stays exact.
+        
+        Args:
+            other: Accumulator over a disjoint set of values
+            
+        Returns:
+            This accumulator, for chaining
+        """
+        if other.count == 0:
+            return self
+        other._flush()
+        self._combine(other.count, other.mean, other._m2, other.min, other.max)
+        for partial in other._partials:
+            _add_partial(self._partials, partial)
+        self._nonfinite += other._nonfinite
+        return self
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Return the full internal state as JSON-serializable values.
+        
+        Returns:
+            Dictionary accepted by from_state
+        """
+        self._flush()
         return {
-            'total': 0.0,
-            'average': 0.0,
-            'min': None,
-            'max': None,
-            'count': 0
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'm2': self._m2,
+            'partials': list(self._partials),
+            'nonfinite': self._nonfinite
         }
     
-    total = calculate_sum(values)
-    average = calculate_average(values)
-    minimum = calculate_minimum(values)
-    maximum = calculate_maximum(values)
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'RunningStats':
+        """
+        Restore an accumulator saved with get_state.
+        
+        Args:
+            state: Dictionary from get_state
+            
+        Returns:
+            Accumulator that continues exactly where the saved one stopped
+        """
+        stats = cls()
+        stats.count = state['count']
+        stats.mean = state['mean']
+        stats.min = state['min']
+        stats.max = state['max']
+        stats._m2 = state['m2']
+        stats._partials = list(state['partials'])
+        stats._nonfinite = state['nonfinite']
+        return stats
+    
+    @property
+    def total(self) -> float:
+        """Correctly rounded sum of all values."""
+        self._flush()
+        return math.fsum(self._partials) + self._nonfinite
     
-    return {
-        'total': round_to_decimal_places(total),
-        'average': round_to_decimal_places(average) if average is not None else 0.0,
-        'min': round_to_decimal_places(minimum) if minimum is not None else None,
-        'max': round_to_decimal_places(maximum) if maximum is not None else None,
-        'count': len(values)
-    }
+    @property
+    def variance(self) -> float:
+        """Sample variance, or 0.0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+    
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return rounded statistics in the calculate_statistics format.
+        
+        Returns:
+            Dictionary containing total, average, min, max, and count
+        """
+        if self.count == 0:
+            return {
+                'total': 0.0,
+                'average': 0.0,
+                'min': None,
+                'max': None,
+                'count': 0
+            }
+        
+        total = self.total
+        return {
+            'total': round_to_decimal_places(total),
+            'average': round_to_decimal_places(total / self.count),
+            'min': round_to_decimal_places(self.min),
+            'max': round_to_decimal_places(self.max),
+            'count': self.count
+        }
 
 
-def aggregate_by_key(data: List[Dict[str, Any]], key_field: str, value_field: str) -> Dict[str, float]:
+def aggregate_by_key(data: Iterable[Dict[str, Any]], key_field: str, value_field: str) -> Dict[str, float]:
     """
     Aggregate numeric values grouped by a key field.
     
     Args:
-        data: List of dictionaries containing data
+        data: Dictionaries containing data (a list or any iterable)
         key_field: Field name to group by
         value_field: Field name containing numeric values to sum
         
@@ -0,0 +1,171 @@
+"""
+Parallel utilities module.
+Splits one CSV file into row-aligned byte ranges and processes them across worker processes.
+"""
+
+import csv
+import io
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+
+
+# Target size of one byte range; many ranges per worker keep the pool busy
+# and bound the memory each worker needs for its range
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Size of the blocks scanned when counting quotes
+SCAN_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Workers process rows silently; the parent logs merged counts instead
+WORKER_LOGGER = logging.getLogger('parallel_worker')
+WORKER_LOGGER.addHandler(logging.NullHandler())
+WORKER_LOGGER.propagate = False
+
+
+def find_row_ranges(filepath: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                    start: Optional[int] = None, end: Optional[int] = None) -> tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges that start and end on row boundaries.
+    
+    A newline only ends a row when it is outside a quoted field, i.e. when
+    an even number of quote characters precedes it, so quoted newlines
+    never split a row. The header row is excluded from every range.
+    
+    Args:
+        filepath: Path to the CSV file
+        chunk_bytes: Approximate size of each range
+        start: Row boundary to start from, e.g. a saved offset (default:
+            just after the header)
+        end: Offset to stop at; the last range ends at the first row
+            boundary at or after it (default: end of file)
+        
+    Returns:
+        Tuple of (header field names, list of (start, end) byte offsets)
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If chunk_bytes is not positive
+    """
+    if chunk_bytes <= 0:
+        raise ValueError("Chunk size must be positive")
+    
+    size = os.path.getsize(filepath)
+    if size == 0:
+        return [], []
+    
+    with open(filepath, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header_end = _next_row_boundary(data, 0, 0, size)
+        header = next(csv.reader(io.StringIO(data[:header_end].decode(), newline='')), [])
+        
+        ranges = []
+        start = header_end if start is None else max(start, header_end)
+        stop = size if end is None else min(end, size)
+        # Row boundaries are outside quotes, so the quote count from here is even
+        quotes = 0
+        while start < stop:
+            target = min(start + chunk_bytes, stop)
+            quotes += _count_quotes(data, start, target)
+            range_end = _next_row_boundary(data, target, quotes, size)
+            quotes += _count_quotes(data, target, range_end)
+            ranges.append((start, range_end))
+            start = range_end
+    
+    return header, ranges
+
+
+def _count_quotes(data: mmap.mmap, start: int, end: int) -> int:
+    """Count quote bytes in data[start:end] without copying it all at once."""
+    count = 0
+    for block_start in range(start, end, SCAN_BLOCK_BYTES):
+        count += data[block_start:min(block_start + SCAN_BLOCK_BYTES, end)].count(b'"')
+    return count
+
+
+def _next_row_boundary(data: mmap.mmap, position: int, quotes: int, size: int) -> int:
+    """
+    Find the first row boundary at or after position.
+    
+    Args:
+        data: Mapped file
+        position: Offset to search from
+        quotes: Number of quote bytes before position
+        size: File size
+    
+    Returns:
+        Offset just past the first newline outside quotes, or size
+    """
+    if position > 0 and data[position - 1:position] == b'\n' and quotes % 2 == 0:
+        return position
+    while True:
+        newline = data.find(b'\n', position)
+        if newline == -1:
+            return size
+        quotes += data[position:newline].count(b'"')
+        position = newline + 1
+        if quotes % 2 == 0:
+            return position
+
+
+def iter_range_rows(filepath: str, fieldnames: List[str], start: int, end: int,
+                    columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows in one byte range of a CSV file.
+    
+    Args:
+        filepath: Path to the CSV file
+        fieldnames: Header field names from find_row_ranges
+        start: First byte of the range
+        end: Byte after the range
+        columns: Columns to keep in each row (default: all)
+        
+    Returns:
+        Iterator of dictionaries containing row data
+    """
+    # Imported here: fast_csv itself builds on find_row_ranges
+    from .fast_csv import RowProjector
+    
+    with open(filepath, 'rb') as file:
+        file.seek(start)
+        block = file.read(end - start)
+    yield from RowProjector(fieldnames, columns).parse_block(block)
+
+
+def map_row_ranges(
+    worker: Callable[..., Any],
+    filepath: str,
+    workers: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    extra_args: tuple = ()
+) -> List[Any]:
+    """
+    Run a worker function over every byte range of a CSV file in parallel.
+    
+    The worker is called as worker(filepath, fieldnames, start, end, index,
+    *extra_args) in a separate process, so it must be a module-level
+    function and its result must be picklable.
+    
+    Args:
+        worker: Function processing one range
+        filepath: Path to the CSV file
+        workers: Number of processes (default: CPU count)
+        chunk_bytes: Approximate size of each range
+        extra_args: Extra arguments passed to every call
+    
+    Returns:
+        Worker results in file order
+    """
+    fieldnames, ranges = find_row_ranges(filepath, chunk_bytes)
+    calls = [(filepath, fieldnames, start, end, index) + tuple(extra_args)
+             for index, (start, end) in enumerate(ranges)]
+    if not calls:
+        return []
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_call_worker, [worker] * len(calls), calls))
+
+
+def _call_worker(worker: Callable[..., Any], call: tuple) -> Any:
+    return worker(*call)
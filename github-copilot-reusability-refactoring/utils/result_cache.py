@@ -0,0 +1,152 @@
+"""
+Result cache utilities module.
+Stores analysis and report results on disk, keyed by a fingerprint of the input file and options.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+
+# Default location of cached results, relative to the working directory
+DEFAULT_CACHE_DIR = '.result_cache'
+
+# Total size of cached results kept before the least recently used are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bytes read at a time when hashing file contents
+HASH_BLOCK_BYTES = 1024 * 1024
+
+ENTRY_SUFFIX = '.json'
+
+
+class ResultCache:
+    """
+    On-disk cache of JSON-serializable results with least-recently-used eviction.
+    
+    Entries are keyed by the input file's absolute path, size and
+    modification time in nanoseconds, optionally a hash of its contents,
+    and the options that shape the result; any change to the file or the
+    options yields a different key. Each entry is one file whose
+    modification time records its last use.
+    """
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 hash_contents: bool = False):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Directory holding cached entries (created on first write)
+            max_bytes: Total entry size kept before evicting
+            hash_contents: Also key entries by a SHA-256 of the file's
+                contents, for files rewritten without a size or mtime change
+                (reads the whole file on every lookup)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hash_contents = hash_contents
+    
+    def key(self, filepath: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a file and the options applied to it.
+        
+        Args:
+            filepath: Path to the input file
+            options: JSON-serializable options that affect the result
+        
+        Returns:
+            Hex key identifying the file version and options
+        
+        Raises:
+            OSError: If the file cannot be read
+        """
+        stat = os.stat(filepath)
+        content_hash = _content_hash(filepath) if self.hash_contents else None
+        identity = [os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns, content_hash, options or {}]
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return a cached result and mark it as recently used.
+        
+        Args:
+            key: Key from key()
+        
+        Returns:
+            The stored result, or None if there is no usable entry
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as file:
+                entry = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry.get('result') if isinstance(entry, dict) else None
+    
+    def put(self, key: str, result: Any) -> None:
+        """
+        Store a result, then evict least recently used entries over the size cap.
+        
+        Args:
+            key: Key from key()
+            result: JSON-serializable result
+        
+        Raises:
+            OSError: If the entry cannot be written
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._entry_path(key)
+        with open(path + '.tmp', 'w') as file:
+            json.dump({'result': result}, file)
+        os.replace(path + '.tmp', path)
+        self.evict()
+    
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the total size fits the cap.
+        
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+
+def _content_hash(filepath: str) -> str:
+    """Return the SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()